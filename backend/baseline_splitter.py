@@ -8,125 +8,441 @@ The baseline uses regular expressions to identify sentence boundaries based on:
 - Periods, exclamation marks, question marks
 - Handling of abbreviations and decimal numbers
 - Basic whitespace normalization
+
+The splitter scans the text in a single pass: candidate boundaries are found
+with one compiled regex, abbreviations are checked in a small bounded window
+before the punctuation, and sentences are emitted as slice offsets into the
+original text. The cost per character is therefore constant, regardless of
+how long the document or its sentences are.
+
+Abbreviations come from one lexicon per language (backend/lexicons/*.txt),
+compiled once into a trie of reversed words. The trie is walked backwards
+from the punctuation and the walk stops at the first character no
+abbreviation ends with, so most words cost one or two dictionary lookups and
+multi-dot forms like "U.S.A." or "z.B." are matched in the same single walk.
 """
 
+import os
 import re
-from typing import List
+import time
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Tuple
+
+from backend.spans import SentenceSpans
+
+
+# Collapses any run of whitespace into a single space
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Directory with one abbreviation lexicon per language
+LEXICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons")
+
+# Languages with a lexicon
+SUPPORTED_LANGUAGES = ("en", "fr", "de", "es")
+
+
+# Trie key marking the end of an abbreviation (a full word has been read)
+_WORD_END = ""
+
+
+class _Lexicon(NamedTuple):
+    """Abbreviations of one language and their reversed-character trie."""
+    abbreviations: FrozenSet[str]
+    trie: Dict[str, dict]
+
+
+def _build_trie(words: Iterable[str]) -> Dict[str, dict]:
+    """
+    Build a trie of the words read from right to left.
+
+    Args:
+        words: Lowercase abbreviations
+
+    Returns:
+        Nested dictionaries keyed by character; _WORD_END marks a full word
+    """
+    root: Dict[str, dict] = {}
+    for word in words:
+        node = root
+        for char in reversed(word):
+            node = node.setdefault(char, {})
+        node[_WORD_END] = {}
+    return root
+
+
+def load_lexicon(language: str) -> FrozenSet[str]:
+    """
+    Read the abbreviation lexicon of a language.
+
+    The file has one lowercase abbreviation per line, without its final
+    period; blank lines and lines starting with "#" are ignored.
+
+    Args:
+        language: Language code (en, fr, de, es)
+
+    Returns:
+        Set of abbreviations
+
+    Raises:
+        ValueError: If there is no lexicon for the language
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        raise ValueError(
+            f"No abbreviation lexicon for language '{language}'. Supported: {list(SUPPORTED_LANGUAGES)}"
+        )
+    path = os.path.join(LEXICON_DIR, f"{language}.txt")
+    with open(path, "r", encoding="utf-8") as f:
+        return frozenset(
+            line.strip().lower() for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        )
 
 
 class BaselineSentenceSplitter:
     """
     Rule-based sentence splitter using regular expressions.
-    
+
     This is a simple baseline implementation that splits sentences based on
-    punctuation marks (., !, ?) followed by whitespace or end of string.
+    punctuation marks (., !, ?) followed by whitespace and a capital letter.
     It attempts to handle common abbreviations and decimal numbers.
     """
-    
-    def __init__(self):
-        """Initialize the baseline splitter with compiled regex patterns."""
-        # Common abbreviations that should not end sentences
-        self.abbreviations = {
-            'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'vs', 'etc',
-            'e.g', 'i.e', 'a.m', 'p.m', 'am', 'pm', 'inc', 'ltd', 'corp',
-            'st', 'ave', 'blvd', 'rd', 'no', 'vol', 'pp', 'fig', 'ed'
-        }
-        
-        # Pattern to match sentence endings
-        # Matches: . ! ? followed by space or end of string
-        # Excludes: decimal numbers, abbreviations, URLs
-        self.sentence_end_pattern = re.compile(
-            r'(?<!\d)(?<!\.)(?<![A-Za-z]\.)([.!?]+)(?:\s+|$)',
-            re.MULTILINE
-        )
-    
-    def split(self, text: str) -> List[str]:
+
+    # Bumped whenever the rules change, so cached results are invalidated
+    version = "2"
+
+    def __init__(self, abbreviations: Dict[str, Iterable[str]] = None):
+        """
+        Initialize the baseline splitter with compiled regex patterns.
+
+        Args:
+            abbreviations: Optional language -> abbreviations mapping that
+                replaces the lexicon files for those languages
+        """
+        abbreviations = abbreviations or {}
+        self._lexicons: Dict[str, _Lexicon] = {}
+        for language in SUPPORTED_LANGUAGES:
+            if language in abbreviations:
+                words = frozenset(word.lower() for word in abbreviations[language])
+            else:
+                words = load_lexicon(language)
+            self._lexicons[language] = _Lexicon(words, _build_trie(words))
+
+        # English abbreviations that should not end sentences
+        self.abbreviations = self._lexicons["en"].abbreviations
+
+        # Pattern to match candidate sentence endings
+        # Matches: a run of . ! ? followed by whitespace. Group 1 is the
+        # punctuation run; the match ends where the next sentence would start.
+        # Decimal numbers never match because the period is not followed by
+        # whitespace.
+        self.sentence_end_pattern = re.compile(r'([.!?]+)\s+')
+
+    def split(self, text: str, language: str = "en") -> List[str]:
         """
         Split text into sentences using rule-based approach.
-        
+
         Args:
             text: Input text to segment
-            
+            language: Language code selecting the abbreviation lexicon
+
         Returns:
-            List of sentences (strings)
+            List of sentences (strings) with whitespace normalized
         """
+        lexicon = self._get_lexicon(language)
         if not text or not text.strip():
             return []
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Simple approach: split on sentence-ending punctuation
-        # Look for . ! ? followed by space and capital letter, or end of string
-        sentences = []
-        current_sentence = ""
-        
-        i = 0
-        while i < len(text):
-            char = text[i]
-            current_sentence += char
-            
-            # Check for sentence-ending punctuation
-            if char in '.!?':
-                # Look ahead to see what comes next
-                if i + 1 >= len(text):
-                    # End of text - this is definitely a sentence end
-                    sentences.append(current_sentence.strip())
-                    break
-                elif text[i + 1] == ' ':
-                    # Space after punctuation - check what follows
-                    # Look for capital letter (likely new sentence start)
-                    j = i + 2
-                    while j < len(text) and text[j] == ' ':
-                        j += 1
-                    
-                    if j < len(text) and text[j].isupper():
-                        # Capital letter follows - likely sentence boundary
-                        # But check if it's an abbreviation
-                        words = current_sentence.strip().split()
-                        if words:
-                            last_word = words[-1].rstrip('.!?').lower()
-                            # If not an abbreviation, split here
-                            if last_word not in self.abbreviations or len(last_word) > 3:
-                                sentences.append(current_sentence.strip())
-                                current_sentence = ""
-                                i = j - 1  # Continue from the capital letter
-                                continue
-            
-            i += 1
-        
-        # Add remaining text as last sentence
-        if current_sentence.strip():
-            sentences.append(current_sentence.strip())
-        
-        # Fallback: if no sentences found, use simple regex split
-        if not sentences:
-            # Simple split on punctuation followed by space
-            parts = re.split(r'([.!?]+)\s+', text)
-            sentences = []
-            for i in range(0, len(parts), 2):
-                if i < len(parts):
-                    sentence = parts[i]
-                    if i + 1 < len(parts):
-                        sentence += parts[i + 1]
-                    sentence = sentence.strip()
-                    if sentence:
-                        sentences.append(sentence)
-            if not sentences:
-                sentences = [text]
-        
-        # Final cleanup
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        return sentences
-    
+
+        return [
+            _WHITESPACE_PATTERN.sub(' ', text[start:end])
+            for start, end in self._iter_spans(text, lexicon)
+        ]
+
+    def split_spans(self, text: str, language: str = "en") -> SentenceSpans:
+        """
+        Split text into sentences and return character offsets only.
+
+        No sentence strings are created, so this is the cheapest way to
+        segment large documents when the caller already holds the text.
+
+        Args:
+            text: Input text to segment
+            language: Language code selecting the abbreviation lexicon
+
+        Returns:
+            SentenceSpans with (start, end) offsets into the original text
+        """
+        lexicon = self._get_lexicon(language)
+        spans = SentenceSpans()
+        if not text:
+            return spans
+
+        for start, end in self._iter_spans(text, lexicon):
+            spans.append(start, end)
+        return spans
+
+    def span_texts(self, text: str, spans: SentenceSpans) -> List[str]:
+        """
+        Build the sentence strings split() would return for given spans.
+
+        Args:
+            text: Text the spans refer to
+            spans: Result of split_spans() or profile_spans()
+
+        Returns:
+            List of sentences with whitespace normalized
+        """
+        return [_WHITESPACE_PATTERN.sub(' ', text[start:end]) for start, end in spans]
+
+    def profile_spans(self, text: str, language: str = "en") -> Tuple[SentenceSpans, Dict]:
+        """
+        Split text like split_spans() and report where the time went.
+
+        Phases:
+            candidates  regex scan for punctuation runs followed by whitespace
+            rules       capital-letter and abbreviation checks on the candidates
+            spans       storing the accepted offsets
+
+        The candidate scan is timed in a separate pass and subtracted from
+        the full scan, so profiling costs roughly one extra regex pass. Only
+        used for diagnostics; split() and split_spans() are not instrumented.
+
+        Args:
+            text: Input text to segment
+            language: Language code selecting the abbreviation lexicon
+
+        Returns:
+            (spans, breakdown) where breakdown has "phases" (seconds) and
+            "counts"
+        """
+        lexicon = self._get_lexicon(language)
+        if not text:
+            return SentenceSpans(), {"phases": {}, "counts": {}}
+
+        start = time.perf_counter()
+        candidates = sum(1 for _ in self.sentence_end_pattern.finditer(text))
+        candidates_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        offsets = list(self._iter_spans(text, lexicon))
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        spans = SentenceSpans()
+        for sentence_start, sentence_end in offsets:
+            spans.append(sentence_start, sentence_end)
+        spans_seconds = time.perf_counter() - start
+
+        return spans, {
+            "phases": {
+                "candidates": candidates_seconds,
+                "rules": max(scan_seconds - candidates_seconds, 0.0),
+                "spans": spans_seconds,
+            },
+            "counts": {"chars": len(text), "candidates": candidates, "sentences": len(spans)},
+        }
+
+    def split_many(self, texts: Iterable[str], language: str = "en") -> List[Dict]:
+        """
+        Split many documents, mirroring SpacySentenceSplitter.split_many.
+
+        Args:
+            texts: Documents to segment
+            language: Language code selecting the abbreviation lexicon
+
+        Returns:
+            One dictionary per input document, in input order, with
+            "sentences" (list of strings) and "error" (None or a message)
+        """
+        results = []
+        for text in texts:
+            if isinstance(text, str):
+                results.append({"sentences": self.split(text, language), "error": None})
+            else:
+                results.append({"sentences": [], "error": "Text must be a string"})
+        return results
+
+    def iter_sentences(self, chunks: Iterable[str], language: str = "en") -> Iterator[str]:
+        """
+        Segment a stream of text chunks, yielding sentences as they become final.
+
+        Only the unfinished tail of the text is carried over between chunks,
+        so memory stays bounded by the chunk size plus the longest sentence.
+        The output is identical to split() on the concatenated chunks.
+
+        Args:
+            chunks: Iterable of text pieces, in order
+            language: Language code selecting the abbreviation lexicon
+
+        Yields:
+            Sentences (strings) with whitespace normalized
+        """
+        lexicon = self._get_lexicon(language)
+        buffer = ""
+        resume = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Leading whitespace of the document is never part of a sentence
+            buffer = buffer + chunk if buffer else chunk.lstrip()
+
+            start = 0
+            for sentence_end, next_start in self._iter_boundaries(buffer, lexicon, 0, resume, len(buffer)):
+                yield _WHITESPACE_PATTERN.sub(' ', buffer[start:sentence_end])
+                start = next_start
+
+            # A trailing run of punctuation and whitespace may still turn into
+            # a boundary once the next chunk arrives, so rescan it next time
+            tail = len(buffer)
+            while tail > start and (buffer[tail - 1] in '.!?' or buffer[tail - 1].isspace()):
+                tail -= 1
+
+            buffer = buffer[start:]
+            resume = tail - start
+
+        for start, end in self._iter_spans(buffer, lexicon):
+            yield _WHITESPACE_PATTERN.sub(' ', buffer[start:end])
+
+    def ends_with_abbreviation(self, text: str, sentence_start: int, punct_start: int,
+                               language: str = "en") -> bool:
+        """
+        Check whether the word right before a punctuation run is an abbreviation.
+
+        The same check split() applies to every candidate boundary, for
+        callers that find candidates themselves (see HybridSentenceSplitter).
+
+        Args:
+            text: Text being scanned
+            sentence_start: Offset the word may not start before
+            punct_start: Offset of the first character of the punctuation run
+            language: Language code selecting the abbreviation lexicon
+
+        Returns:
+            True if the preceding word is in the language's lexicon
+        """
+        return self._ends_with_abbreviation(
+            text, sentence_start, punct_start, self._get_lexicon(language).trie
+        )
+
+    def _get_lexicon(self, language: str) -> _Lexicon:
+        """
+        Return the compiled lexicon of a language.
+
+        Raises:
+            ValueError: If the language is not supported
+        """
+        try:
+            return self._lexicons[language]
+        except KeyError:
+            raise ValueError(
+                f"Language '{language}' not supported. Supported: {list(SUPPORTED_LANGUAGES)}"
+            ) from None
+
+    def _iter_spans(self, text: str, lexicon: _Lexicon) -> Iterator[Tuple[int, int]]:
+        """
+        Scan text once and yield the (start, end) offsets of each sentence.
+
+        A candidate boundary is a run of sentence-ending punctuation followed by
+        whitespace. It becomes a real boundary when the next character is
+        uppercase and the word before the punctuation is not an abbreviation.
+
+        Args:
+            text: Input text to scan
+            lexicon: Abbreviations of the text's language
+
+        Yields:
+            (start, end) character offsets into text, with surrounding
+            whitespace excluded
+        """
+        length = len(text)
+
+        # Skip leading whitespace
+        start = 0
+        while start < length and text[start].isspace():
+            start += 1
+        if start == length:
+            return
+
+        # Exclude trailing whitespace
+        end = length
+        while text[end - 1].isspace():
+            end -= 1
+
+        for sentence_end, next_start in self._iter_boundaries(text, lexicon, start, start, end):
+            yield start, sentence_end
+            start = next_start
+
+        yield start, end
+
+    def _iter_boundaries(self, text: str, lexicon: _Lexicon, sentence_start: int,
+                         pos: int, endpos: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yield accepted sentence boundaries found in text[pos:endpos].
+
+        A candidate whose whitespace runs up to endpos is undecided, because
+        the character that follows is not known yet. Scanning stops there;
+        streaming callers resume once more text has arrived.
+
+        Args:
+            text: Text being scanned
+            lexicon: Abbreviations of the text's language
+            sentence_start: Offset where the current sentence starts
+            pos: Offset to start looking for candidates
+            endpos: Offset where the known text ends
+
+        Yields:
+            (sentence_end, next_sentence_start) offsets for each boundary
+        """
+        trie = lexicon.trie
+        for match in self.sentence_end_pattern.finditer(text, pos, endpos):
+            next_start = match.end()
+            if next_start >= endpos:
+                return
+
+            if not text[next_start].isupper():
+                continue
+
+            if self._ends_with_abbreviation(text, sentence_start, match.start(1), trie):
+                continue
+
+            yield match.end(1), next_start
+            sentence_start = next_start
+
+    def _ends_with_abbreviation(self, text: str, sentence_start: int, punct_start: int,
+                                trie: Dict[str, dict]) -> bool:
+        """
+        Check whether the word right before a punctuation run is an abbreviation.
+
+        The word is read backwards through the lexicon trie, so the check
+        stops after at most as many characters as the longest abbreviation,
+        no matter how long the sentence is.
+
+        Args:
+            text: Text being scanned
+            sentence_start: Offset where the current sentence starts
+            punct_start: Offset of the first character of the punctuation run
+            trie: Reversed-character trie of the text's language
+
+        Returns:
+            True if the preceding word is a known abbreviation
+        """
+        node = trie
+        pos = punct_start
+        while pos > sentence_start:
+            pos -= 1
+            node = node.get(text[pos].lower())
+            if node is None:
+                return False
+            # A whole abbreviation has been read and the word starts here
+            if _WORD_END in node and (pos == sentence_start or text[pos - 1].isspace()):
+                return True
+        return False
+
     def _is_abbreviation(self, word: str) -> bool:
         """
         Check if a word is a common abbreviation.
-        
+
         Args:
             word: Word to check
-            
+
         Returns:
             True if word is an abbreviation
         """
@@ -0,0 +1,231 @@
+"""
+Batching - Coalescing Concurrent /segment Requests into Model Batches
+
+Every /segment call used to run the spaCy model on its own document. Under
+high concurrency that leaves nlp.pipe unused, although one pipe over many
+small documents is much cheaper than as many separate model calls: the
+per-call overhead is paid once and the process pool hops once per batch.
+
+RequestCoalescer collects small spaCy and hybrid requests per (method,
+language, pipeline) and segments each group as one nlp.pipe batch in the
+spaCy pool, then resolves every caller's future with its own spans. A group
+is sent when it reaches SEGMENT_BATCH_MAX_SIZE requests or when its wait
+window ends. The window adapts to load:
+- While no other coalesced batch is running, or requests arrive further
+  apart than SEGMENT_BATCH_WAIT_MS (tracked as a moving average of the
+  gaps), the window is zero: a single request at low traffic, or one
+  client sending requests back to back, goes out on the next event loop
+  iteration
+- Otherwise the group waits up to SEGMENT_BATCH_WAIT_MS to fill up
+- At most one batch per spaCy worker is in flight; while all of them are
+  busy, new requests keep collecting and go out together as soon as one
+  batch finishes, so batches grow with the load on their own
+
+Documents longer than SEGMENT_BATCH_MAX_CHARS, sampled cProfile requests
+and profiled requests bypass the coalescer. Requests waiting here count
+against SEGMENT_MAX_PENDING like queued executor tasks do: beyond it the
+caller gets ExecutorSaturated (503). If a batch fails, its documents are
+retried one at a time so only the failing request gets the error.
+
+Configuration (environment variables):
+    SEGMENT_BATCH_MAX_SIZE   Requests per batch, 1 disables coalescing
+                             (default: 32)
+    SEGMENT_BATCH_WAIT_MS    Longest a request waits for others (default: 2)
+    SEGMENT_BATCH_MAX_CHARS  Largest document that is coalesced (default: 10000)
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from backend import metrics
+from backend.executor import (
+    ExecutorSaturated, SegmentationExecutor, hybrid_split_spans_many, spacy_split_spans_many
+)
+from backend.spans import SentenceSpans
+
+# Weight of the newest gap in the moving average of inter-arrival gaps
+GAP_SMOOTHING = 0.2
+
+
+class _Group:
+    """Requests waiting for one (method, language, pipeline) batch."""
+
+    __slots__ = ("pending", "timer", "ready", "gap", "last_arrival")
+
+    def __init__(self):
+        self.pending: List[Tuple[str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.ready = False
+        self.gap = float("inf")
+        self.last_arrival: Optional[float] = None
+
+    def arrive(self, now: float):
+        """Update the moving average of inter-arrival gaps."""
+        if self.last_arrival is not None:
+            gap = now - self.last_arrival
+            if self.gap == float("inf"):
+                self.gap = gap
+            else:
+                self.gap += GAP_SMOOTHING * (gap - self.gap)
+        self.last_arrival = now
+
+
+class RequestCoalescer:
+    """
+    Groups concurrent single-document requests into nlp.pipe batches.
+
+    Only used from the event loop thread, so it needs no lock.
+    """
+
+    def __init__(self, executor: SegmentationExecutor, max_batch: int = None,
+                 max_wait_ms: float = None, max_chars: int = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            executor: Executor layer whose spaCy pool runs the batches
+            max_batch: Most requests per batch, 1 disables coalescing
+            max_wait_ms: Longest a request waits for others to join it
+            max_chars: Largest document that is coalesced
+        """
+        if max_batch is None:
+            max_batch = int(os.environ.get("SEGMENT_BATCH_MAX_SIZE", 32))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.environ.get("SEGMENT_BATCH_WAIT_MS", 2))
+        if max_chars is None:
+            max_chars = int(os.environ.get("SEGMENT_BATCH_MAX_CHARS", 10000))
+
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_chars = max_chars
+
+        self._groups: Dict[Tuple[str, str, Optional[str]], _Group] = {}
+        self._ready: Deque[Tuple[str, str, Optional[str]]] = deque()
+        self._waiting = 0
+        self._in_flight = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    def accepts(self, text: str) -> bool:
+        """Whether a document is small enough to be coalesced."""
+        return self.max_batch > 1 and len(text) <= self.max_chars
+
+    async def split_spans(self, method: str, text: str, language: str,
+                          profile: Optional[str]) -> Tuple[SentenceSpans, Optional[float]]:
+        """
+        Segment one document as part of a batch.
+
+        Args:
+            method: "spacy" or "hybrid"
+            text: Document to segment
+            language: Language code (en, fr, de, es)
+            profile: Resolved spaCy pipeline profile
+
+        Returns:
+            (spans, spacy_fraction), with spacy_fraction None for "spacy"
+
+        Raises:
+            ExecutorSaturated: If too many requests are waiting already
+        """
+        pool = self.executor.spacy_pool
+        if self._waiting >= pool.max_pending:
+            raise ExecutorSaturated(pool.name, pool.retry_after)
+
+        loop = asyncio.get_running_loop()
+        key = (method, language, profile)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+        group.arrive(loop.time())
+
+        future = loop.create_future()
+        group.pending.append((text, future))
+        self._waiting += 1
+        if len(group.pending) >= self.max_batch:
+            self._mark_ready(key)
+        elif group.timer is None and not group.ready:
+            busy = self._in_flight > 0 and group.gap < self.max_wait
+            window = self.max_wait if busy else 0.0
+            group.timer = loop.call_later(window, self._mark_ready, key)
+        return await future
+
+    def _mark_ready(self, key: Tuple[str, str, Optional[str]]):
+        """Queue a group for the next free spaCy worker."""
+        group = self._groups[key]
+        if group.timer is not None:
+            group.timer.cancel()
+            group.timer = None
+        if not group.ready:
+            group.ready = True
+            self._ready.append(key)
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start batches for ready groups while spaCy workers are free."""
+        while self._ready and self._in_flight < self.executor.spacy_workers:
+            key = self._ready.popleft()
+            group = self._groups[key]
+            group.ready = False
+            batch = group.pending[:self.max_batch]
+            del group.pending[:self.max_batch]
+            self._waiting -= len(batch)
+            if group.pending:
+                # The rest has waited as long; it goes out next
+                group.ready = True
+                self._ready.append(key)
+
+            # Callers that went away need no result
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            self._in_flight += 1
+            task = asyncio.ensure_future(self._run(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Tuple[str, str, Optional[str]],
+                   batch: List[Tuple[str, asyncio.Future]]):
+        """Segment one batch and resolve its futures."""
+        method, language, profile = key
+        func = hybrid_split_spans_many if method == "hybrid" else spacy_split_spans_many
+        try:
+            try:
+                results = await self.executor.run_spacy(
+                    func, [text for text, _ in batch], language, profile, len(batch)
+                )
+            except ExecutorSaturated:
+                raise
+            except Exception as e:
+                if len(batch) == 1:
+                    raise
+                print(f"⚠ Warning: batch of {len(batch)} {method} requests failed ({e}), "
+                      f"retrying them one by one")
+                await self._run_singly(func, batch, method, language, profile)
+                return
+
+            metrics.observe_batch(method, len(batch))
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result if method == "hybrid" else (result, None))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+
+    async def _run_singly(self, func, batch: List[Tuple[str, asyncio.Future]],
+                          method: str, language: str, profile: Optional[str]):
+        """Segment the documents of a failed batch one at a time."""
+        for text, future in batch:
+            try:
+                result = (await self.executor.run_spacy(func, [text], language, profile, 1))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(result if method == "hybrid" else (result, None))
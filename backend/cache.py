@@ -0,0 +1,269 @@
+"""
+Result Cache - Content-Addressed Cache for Segmentation Responses
+
+Traffic often repeats the same documents (templated emails, boilerplate
+disclaimers). This module caches serialized /segment responses keyed by a
+hash of everything that determines the result:
+
+    (text, language, method, pipeline profile, model version, output mode)
+
+Because the model version is part of the key, upgrading a spaCy model makes
+all old entries unreachable; they are then evicted by normal LRU pressure.
+
+Two tiers are supported:
+- Memory: an LRU dictionary bounded by the total size of the stored bytes
+- Disk (optional): a SQLite database that survives restarts, also bounded
+  by size and evicted by least recent access
+
+Disk hits do not write on their own: their access times are collected and
+written in one transaction with the next store, or once ACCESS_FLUSH of them
+are pending. Every store still commits, so callers on an event loop should
+run get() and put() in a worker thread while the disk tier is enabled.
+
+Configuration (environment variables):
+    SEGMENT_CACHE_MAX_BYTES       Memory tier size, 0 disables (default: 64 MB)
+    SEGMENT_CACHE_DB              Path of the SQLite tier (default: disabled)
+    SEGMENT_CACHE_DB_MAX_BYTES    Disk tier size (default: 1 GB)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Disk hits whose access times are written together
+ACCESS_FLUSH = 256
+
+
+class ResultCache:
+    """
+    Two-tier, size-bounded LRU cache of serialized responses.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = None, db_path: str = None,
+                 db_max_bytes: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of values kept in memory
+            db_path: Path of the SQLite database for the disk tier, or None
+            db_max_bytes: Maximum total size of values kept on disk
+        """
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SEGMENT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        if db_path is None:
+            db_path = os.environ.get("SEGMENT_CACHE_DB") or None
+        if db_max_bytes is None:
+            db_max_bytes = int(os.environ.get("SEGMENT_CACHE_DB_MAX_BYTES", 1024 * 1024 * 1024))
+
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.db_max_bytes = db_max_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        # Access times of disk hits not written yet, by key
+        self._accessed: Dict[str, float] = {}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._db.commit()
+            self._db_size = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+            # SQLite connections must not be used across fork(); forked
+            # server workers get their own
+            os.register_at_fork(after_in_child=self._reconnect)
+
+    def _reconnect(self):
+        """Replace the inherited connection to the disk tier with a new one."""
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+
+    @property
+    def enabled(self) -> bool:
+        """True if at least one tier can store entries."""
+        return self.max_bytes > 0 or self._db is not None
+
+    @property
+    def disk_enabled(self) -> bool:
+        """True if the SQLite tier is used, so lookups may block on disk I/O."""
+        return self._db is not None
+
+    @staticmethod
+    def make_key(text: str, *parts: str) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            text: Input text
+            *parts: Everything else that affects the result, e.g. language,
+                method, pipeline profile, model version and output mode
+
+        Returns:
+            Hex digest identifying the result
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a cached value, checking memory first and then disk.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The cached bytes, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._accessed[key] = time.time()
+                    if len(self._accessed) >= ACCESS_FLUSH:
+                        self._flush_accessed()
+                        self._db.commit()
+                    value = bytes(row[0])
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    self._store_in_memory(key, value)
+                    return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: bytes):
+        """
+        Store a value in both tiers.
+
+        Values larger than a tier's whole budget are not stored in that tier.
+
+        Args:
+            key: Key from make_key()
+            value: Serialized response
+        """
+        with self._lock:
+            self._counters["stores"] += 1
+            self._store_in_memory(key, value)
+
+            if self._db is not None and len(value) <= self.db_max_bytes:
+                self._flush_accessed()
+                previous = self._db.execute(
+                    "SELECT size FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+                self._db_size += len(value) - (previous[0] if previous else 0)
+                self._evict_from_disk()
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        """
+        Return cache counters and current sizes.
+
+        Returns:
+            Dictionary of hit/miss/eviction counters and tier sizes
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            stats = dict(self._counters)
+            stats.update({
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": self._db is not None,
+            })
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                stats["disk_bytes"] = self._db_size
+                stats["disk_max_bytes"] = self.db_max_bytes
+            return stats
+
+    def clear(self):
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self._db is not None:
+                self._accessed.clear()
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+                self._db_size = 0
+
+    def _store_in_memory(self, key: str, value: bytes):
+        """Insert into the memory tier and evict LRU entries. Caller holds the lock."""
+        if len(value) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = value
+        self._size += len(value)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._counters["evictions"] += 1
+
+    def _flush_accessed(self):
+        """Write pending access times of disk hits. Caller holds the lock and commits."""
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict_from_disk(self):
+        """Delete least recently accessed disk entries over budget. Caller holds the lock."""
+        while self._db_size > self.db_max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM results ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._db_size = 0
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (row[0],))
+            self._db_size -= row[1]
+            self._counters["disk_evictions"] += 1
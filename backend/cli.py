@@ -0,0 +1,330 @@
+"""
+Command-Line Interface - Offline Bulk Segmentation
+
+Segments whole corpora with the splitters directly, without the HTTP layer:
+
+    python -m backend.cli segment corpus/ -o sentences.jsonl --method spacy --workers 4
+    python -m backend.cli segment docs.jsonl -o sentences.jsonl --resume
+
+Inputs can be plain text files (one document per file), JSONL files (one
+document per line, text in the "text" field) or directories, which are
+walked recursively for *.txt and *.jsonl files in sorted order.
+
+Output is JSONL, one record per document in input order:
+
+    {"id": "corpus/a.txt", "spans": [[0, 15], [16, 31]], "count": 2}
+
+Documents are segmented in batches by a process pool. After every batch the
+output is flushed and a checkpoint (documents done, output size) is written
+next to it, so an interrupted run continues where it stopped with --resume.
+Throughput in MB/s and docs/s is reported on stderr.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.spacy_splitter import PIPELINE_PROFILES, SpacySentenceSplitter
+
+# Input formats accepted by --format
+INPUT_FORMATS = ("auto", "text", "jsonl")
+
+# File extensions picked up when walking a directory
+_DIRECTORY_EXTENSIONS = (".txt", ".jsonl")
+
+# Seconds between progress lines on stderr
+_PROGRESS_INTERVAL = 5.0
+
+# Splitter of the current process; set by _init_worker
+_worker_splitter = None
+_worker_options: Dict = {}
+
+
+def iter_documents(paths: Iterable[str], input_format: str = "auto",
+                   text_field: str = "text", id_field: str = "id") -> Iterator[Tuple[str, str]]:
+    """
+    Read documents from files and directories, in a deterministic order.
+
+    Args:
+        paths: Files or directories
+        input_format: "text", "jsonl", or "auto" to decide by file extension
+        text_field: JSONL field holding the document text
+        id_field: JSONL field holding the document id; "<file>:<line>" is
+            used when it is missing
+
+    Yields:
+        (document id, text) tuples
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(_DIRECTORY_EXTENSIONS):
+                        yield from _iter_file(os.path.join(root, name), input_format,
+                                              text_field, id_field)
+        else:
+            yield from _iter_file(path, input_format, text_field, id_field)
+
+
+def _iter_file(path: str, input_format: str, text_field: str,
+               id_field: str) -> Iterator[Tuple[str, str]]:
+    """Yield the documents of a single file."""
+    if input_format == "auto":
+        input_format = "jsonl" if path.endswith(".jsonl") else "text"
+
+    if input_format == "text":
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            yield path, f.read()
+        return
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            doc_id = record.get(id_field, f"{path}:{line_number}")
+            yield str(doc_id), record.get(text_field, "")
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _init_worker(method: str, language: str, profile: Optional[str], with_text: bool):
+    """Create the splitter used by this process."""
+    global _worker_splitter, _worker_options
+    if method == "spacy":
+        # The pool already spreads documents over processes; do not fan out
+        # again for single large documents
+        _worker_splitter = SpacySentenceSplitter(preload=[language], parallel_threshold=0)
+    else:
+        _worker_splitter = BaselineSentenceSplitter()
+    _worker_options = {"method": method, "language": language,
+                       "profile": profile, "with_text": with_text}
+
+
+def _segment_batch(batch: List[Tuple[str, str]]) -> Tuple[str, int]:
+    """
+    Segment a batch of documents in a worker process.
+
+    Args:
+        batch: (document id, text) tuples
+
+    Returns:
+        (JSONL output for the batch, number of UTF-8 input bytes)
+    """
+    lines = []
+    input_bytes = 0
+    for doc_id, text in batch:
+        record = {"id": doc_id}
+        try:
+            if not isinstance(text, str):
+                raise ValueError("Text must be a string")
+            input_bytes += len(text.encode("utf-8", "surrogatepass"))
+            if _worker_options["method"] == "spacy":
+                spans = _worker_splitter.split_spans(
+                    text, _worker_options["language"], _worker_options["profile"]
+                )
+            else:
+                spans = _worker_splitter.split_spans(text, _worker_options["language"])
+            record["spans"] = spans.to_list()
+            if _worker_options["with_text"]:
+                if _worker_options["method"] == "spacy":
+                    record["sentences"] = spans.texts(text)
+                else:
+                    # Whitespace-normalized, as /segment and split() return them
+                    record["sentences"] = _worker_splitter.span_texts(text, spans)
+            record["count"] = len(spans)
+        except Exception as e:
+            record.update({"spans": [], "count": 0, "error": str(e)})
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    return "".join(lines), input_bytes
+
+
+class _Checkpoint:
+    """
+    Progress of a run: documents written and the output size at that point.
+
+    Saved atomically (write + rename) after every batch.
+    """
+
+    def __init__(self, path: str, settings: Dict):
+        self.path = path
+        self.settings = settings
+        self.documents = 0
+        self.output_bytes = 0
+
+    def load(self):
+        """Restore progress, refusing checkpoints written with other settings."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("settings") != self.settings:
+            raise ValueError(
+                f"Checkpoint {self.path} was written with different settings: {state.get('settings')}"
+            )
+        self.documents = state["documents"]
+        self.output_bytes = state["output_bytes"]
+
+    def save(self):
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"settings": self.settings, "documents": self.documents,
+                       "output_bytes": self.output_bytes}, f)
+        os.replace(temporary, self.path)
+
+
+class _Throughput:
+    """Counts documents and bytes and prints rates to stderr."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.documents = 0
+        self.input_bytes = 0
+
+    def add(self, documents: int, input_bytes: int):
+        self.documents += documents
+        self.input_bytes += input_bytes
+        now = time.perf_counter()
+        if now - self.last_report >= _PROGRESS_INTERVAL:
+            self.last_report = now
+            self.report("progress")
+
+    def report(self, label: str):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        megabytes = self.input_bytes / (1024 * 1024)
+        print(f"[{label}] {self.documents} docs, {megabytes:.1f} MB in {elapsed:.1f}s "
+              f"({megabytes / elapsed:.2f} MB/s, {self.documents / elapsed:.1f} docs/s)",
+              file=sys.stderr)
+
+
+def segment_corpus(args: argparse.Namespace) -> int:
+    """
+    Run the segment command.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    documents = iter_documents(args.inputs, args.format, args.text_field, args.id_field)
+    to_stdout = args.output == "-"
+
+    checkpoint = None
+    if not to_stdout:
+        checkpoint = _Checkpoint(args.checkpoint or args.output + ".checkpoint", {
+            "inputs": list(args.inputs), "format": args.format, "method": args.method,
+            "language": args.language, "pipeline": args.pipeline,
+            "with_text": args.with_text,
+        })
+        if args.resume and os.path.exists(checkpoint.path):
+            checkpoint.load()
+            print(f"Resuming after {checkpoint.documents} documents", file=sys.stderr)
+
+    if checkpoint is not None and checkpoint.documents:
+        # Drop any output written after the last checkpoint
+        output = open(args.output, "r+b")
+        output.truncate(checkpoint.output_bytes)
+        output.seek(checkpoint.output_bytes)
+        documents = islice(documents, checkpoint.documents, None)
+    elif to_stdout:
+        output = sys.stdout.buffer
+    else:
+        output = open(args.output, "wb")
+
+    worker_args = (args.method, args.language, args.pipeline, args.with_text)
+    throughput = _Throughput()
+
+    def write(chunk: str, size: int, count: int):
+        data = chunk.encode("utf-8")
+        output.write(data)
+        output.flush()
+        if checkpoint is not None:
+            checkpoint.documents += count
+            checkpoint.output_bytes += len(data)
+            checkpoint.save()
+        throughput.add(count, size)
+
+    try:
+        batches = _batched(documents, args.batch_size)
+        if args.workers <= 1:
+            _init_worker(*worker_args)
+            for batch in batches:
+                write(*_segment_batch(batch), len(batch))
+        else:
+            with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                                     initargs=worker_args) as pool:
+                # Keep a bounded number of batches in flight and write them
+                # back in input order
+                in_flight = deque()
+                for batch in batches:
+                    in_flight.append((pool.submit(_segment_batch, batch), len(batch)))
+                    if len(in_flight) >= args.workers * 2:
+                        future, count = in_flight.popleft()
+                        write(*future.result(), count)
+                while in_flight:
+                    future, count = in_flight.popleft()
+                    write(*future.result(), count)
+    finally:
+        if not to_stdout:
+            output.close()
+
+    throughput.report("done")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(prog="python -m backend.cli",
+                                     description="Offline sentence segmentation tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    segment = commands.add_parser("segment", help="Segment text/JSONL files or directories")
+    segment.add_argument("inputs", nargs="+", help="Input files or directories")
+    segment.add_argument("-o", "--output", default="-",
+                         help="Output JSONL file, '-' for stdout (default)")
+    segment.add_argument("--format", choices=INPUT_FORMATS, default="auto",
+                         help="Input format; auto decides by file extension")
+    segment.add_argument("--method", choices=("baseline", "spacy"), default="baseline")
+    segment.add_argument("--language", default="en", choices=("en", "fr", "de", "es"))
+    segment.add_argument("--pipeline", choices=PIPELINE_PROFILES, default=None,
+                         help="spaCy pipeline profile")
+    segment.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                         help="Worker processes (1 runs in this process)")
+    segment.add_argument("--batch-size", type=int, default=64,
+                         help="Documents sent to a worker at a time")
+    segment.add_argument("--text-field", default="text", help="JSONL text field")
+    segment.add_argument("--id-field", default="id", help="JSONL id field")
+    segment.add_argument("--with-text", action="store_true",
+                         help="Also write sentence strings, not only offsets")
+    segment.add_argument("--checkpoint", default=None,
+                         help="Checkpoint file (default: <output>.checkpoint)")
+    segment.add_argument("--resume", action="store_true",
+                         help="Continue from the checkpoint of an interrupted run")
+    segment.set_defaults(handler=segment_corpus)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point for `python -m backend.cli`."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Compression - Compressed Request Bodies and Responses
+
+Large documents are mostly plain prose, which compresses 3-4x. Clients may
+send request bodies with "Content-Encoding: gzip" or "Content-Encoding: zstd"
+(zstd needs the optional zstandard package). RequestDecompressionMiddleware
+inflates such bodies while they are received: every chunk is decompressed
+as it arrives and dropped, and the output is handed on in pieces of at most
+OUTPUT_CHUNK bytes. The full compressed body is never buffered, so endpoints
+that read the body incrementally (/segment/stream) stay bounded in memory
+and the others hold only the decompressed text.
+
+Decompressed bodies are limited to SEGMENT_MAX_DECOMPRESSED_BYTES (413
+beyond it), so a small compressed upload cannot expand into gigabytes.
+Corrupt or truncated bodies get 400, unknown encodings 415.
+
+Responses are compressed by Starlette's GZipMiddleware, for clients that
+send "Accept-Encoding: gzip", once they reach SEGMENT_GZIP_MIN_SIZE bytes.
+
+Configuration (environment variables):
+    SEGMENT_MAX_DECOMPRESSED_BYTES  Limit on a decompressed request body in
+                                    bytes, 0 for none (default: 256 MB)
+    SEGMENT_GZIP_MIN_SIZE           Smallest response that is compressed, in
+                                    bytes, 0 disables (default: 1024)
+    SEGMENT_GZIP_LEVEL              gzip level 1-9 (default: 1)
+"""
+
+import os
+import zlib
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+# Largest decompressed piece passed on per receive() call
+OUTPUT_CHUNK = 1024 * 1024
+
+max_decompressed_bytes = int(os.environ.get("SEGMENT_MAX_DECOMPRESSED_BYTES", 256 * 1024 * 1024))
+gzip_min_size = int(os.environ.get("SEGMENT_GZIP_MIN_SIZE", 1024))
+gzip_level = int(os.environ.get("SEGMENT_GZIP_LEVEL", 1))
+
+
+class BodyTooLarge(ValueError):
+    """A request body decompresses to more than the configured limit."""
+
+
+class _Decoder(ABC):
+    """Incremental decompressor for one request body."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total = 0
+
+    @abstractmethod
+    def decompress(self, data: bytes, final: bool) -> Iterator[bytes]:
+        """
+        Decompress the next chunk of the body.
+
+        Args:
+            data: Compressed chunk
+            final: True for the last chunk of the body
+
+        Yields:
+            Decompressed pieces of at most OUTPUT_CHUNK bytes
+
+        Raises:
+            BodyTooLarge: If the output exceeds max_bytes
+            ValueError, zlib.error, zstandard.ZstdError: If the data is corrupt
+        """
+
+    def _count(self, size: int):
+        self.total += size
+        if self.max_bytes and self.total > self.max_bytes:
+            raise BodyTooLarge(f"Decompressed request body exceeds {self.max_bytes} bytes")
+
+
+class _GzipDecoder(_Decoder):
+    def __init__(self, max_bytes: int):
+        super().__init__(max_bytes)
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, final: bool) -> Iterator[bytes]:
+        while True:
+            # max_length bounds the output; the rest of the input waits in
+            # unconsumed_tail, so a small chunk cannot expand all at once
+            piece = self._decompressor.decompress(data, OUTPUT_CHUNK)
+            data = self._decompressor.unconsumed_tail
+            if self._decompressor.eof and self._decompressor.unused_data:
+                # Concatenated gzip members, as written by `cat a.gz b.gz`
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if piece:
+                self._count(len(piece))
+                yield piece
+            if not data and len(piece) < OUTPUT_CHUNK:
+                break
+        if final and not self._decompressor.eof:
+            raise ValueError("truncated gzip stream")
+
+
+# Frame magic numbers (little-endian) from RFC 8878
+_ZSTD_MAGIC = 0xFD2FB528
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+class _ZstdFrames:
+    """
+    Follows the frame and block headers of a zstd stream without
+    decompressing it, to tell whether the stream ends after a whole frame.
+
+    zstandard's stream writer, which bounds the output of every write,
+    silently waits for more input at the end of a truncated frame.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self._state = "magic"
+        self._header = b""
+        self._need = 4
+        self._skip = 0
+        self._checksum = False
+
+    @property
+    def complete(self) -> bool:
+        """True if at least one frame was read and no frame is half-read."""
+        return self.frames > 0 and self._state == "magic" and not self._header and not self._skip
+
+    def feed(self, data: bytes):
+        """
+        Read the next chunk of the compressed stream.
+
+        Raises:
+            ValueError: If the headers are not those of a zstd stream
+        """
+        position = 0
+        while position < len(data):
+            if self._skip:
+                step = min(self._skip, len(data) - position)
+                self._skip -= step
+                position += step
+                continue
+            take = min(self._need - len(self._header), len(data) - position)
+            self._header += data[position:position + take]
+            position += take
+            if len(self._header) == self._need:
+                header, self._header = self._header, b""
+                self._parse(int.from_bytes(header, "little"))
+
+    def _expect(self, state: str, size: int):
+        self._state = state
+        self._need = size
+
+    def _parse(self, value: int):
+        """Handle a complete header field and decide what to read next."""
+        if self._state == "magic":
+            if value == _ZSTD_MAGIC:
+                self._expect("descriptor", 1)
+            elif value & 0xFFFFFFF0 == _ZSTD_SKIPPABLE_MAGIC:
+                self._expect("skippable", 4)
+            else:
+                raise ValueError("not a zstd frame")
+        elif self._state == "descriptor":
+            content_size_flag, single_segment = value >> 6, (value >> 5) & 1
+            self._checksum = bool(value & 0x04)
+            size = (0 if single_segment else 1) + (0, 1, 2, 4)[value & 0x03]
+            size += (1 if single_segment else 0, 2, 4, 8)[content_size_flag]
+            self._expect("header", size)
+        elif self._state == "header":
+            self._expect("block", 3)
+        elif self._state == "block":
+            block_type, block_size = (value >> 1) & 0x03, value >> 3
+            if block_type == 3:
+                raise ValueError("reserved zstd block type")
+            # An RLE block stores its byte once
+            self._skip = 1 if block_type == 1 else block_size
+            if not value & 0x01:
+                self._expect("block", 3)
+            elif self._checksum:
+                self._expect("checksum", 4)
+            else:
+                self._end_frame()
+        elif self._state == "checksum":
+            self._end_frame()
+        elif self._state == "skippable":
+            self._skip = value
+            self._end_frame()
+
+    def _end_frame(self):
+        self.frames += 1
+        self._expect("magic", 4)
+
+
+class _ZstdDecoder(_Decoder):
+    def __init__(self, max_bytes: int):
+        super().__init__(max_bytes)
+        self._pieces: List[bytes] = []
+        self._frames = _ZstdFrames()
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self, write_size=OUTPUT_CHUNK)
+
+    def write(self, data) -> int:
+        """Collect output from the stream writer, stopping at the size limit."""
+        self._count(len(data))
+        self._pieces.append(bytes(data))
+        return len(data)
+
+    def decompress(self, data: bytes, final: bool) -> Iterator[bytes]:
+        self._frames.feed(data)
+        self._writer.write(data)
+        pieces, self._pieces = self._pieces, []
+        yield from pieces
+        if final and not self._frames.complete:
+            raise ValueError("truncated zstd stream")
+
+
+def supported_encodings() -> List[str]:
+    """Content-Encoding values accepted for request bodies."""
+    encodings = ["gzip"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def _make_decoder(content_encoding: str, max_bytes: int) -> Optional[_Decoder]:
+    """Decoder for a Content-Encoding value, or None if it is not supported."""
+    if content_encoding in ("gzip", "x-gzip"):
+        return _GzipDecoder(max_bytes)
+    if content_encoding == "zstd" and zstandard is not None:
+        return _ZstdDecoder(max_bytes)
+    return None
+
+
+class RequestDecompressionMiddleware:
+    """
+    ASGI middleware that inflates gzip/zstd request bodies while they stream in.
+
+    The app sees the decompressed body without the Content-Encoding and
+    Content-Length headers. Errors found while reading the body are raised
+    as HTTPException from receive(), so the handler reading it answers 400
+    or 413.
+    """
+
+    def __init__(self, app, max_bytes: int = None):
+        self.app = app
+        self.max_bytes = max_decompressed_bytes if max_bytes is None else max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_encoding = None
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                content_encoding = value.decode("latin-1").strip().lower()
+            elif name != b"content-length":
+                headers.append((name, value))
+        if not content_encoding or content_encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        decoder = _make_decoder(content_encoding, self.max_bytes)
+        if decoder is None:
+            available = ", ".join(supported_encodings())
+            response = JSONResponse(
+                status_code=415,
+                content={"detail": f"Content-Encoding '{content_encoding}' not supported. "
+                                   f"Use one of: {available}"},
+                headers={"Accept-Encoding": available},
+            )
+            await response(scope, receive, send)
+            return
+
+        pieces = iter(())
+        finished = False
+
+        async def receive_decompressed():
+            nonlocal pieces, finished
+            if pieces is None:
+                return await receive()
+            while True:
+                try:
+                    piece = next(pieces, None)
+                except BodyTooLarge as e:
+                    raise HTTPException(status_code=413, detail=str(e))
+                except Exception as e:
+                    raise HTTPException(status_code=400,
+                                        detail=f"Invalid {content_encoding} request body: {e}")
+                if piece is not None:
+                    return {"type": "http.request", "body": piece, "more_body": True}
+                if finished:
+                    # Later calls get the server's own messages (disconnect)
+                    pieces = None
+                    return {"type": "http.request", "body": b"", "more_body": False}
+
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                finished = not message.get("more_body", False)
+                pieces = decoder.decompress(message.get("body", b""), finished)
+
+        await self.app(dict(scope, headers=headers), receive_decompressed, send)
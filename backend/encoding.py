@@ -0,0 +1,206 @@
+"""
+Response Encodings - Content Negotiation for /segment
+
+A /segment response for a large document is dominated by its sentence list.
+Building a pydantic SegmentationResponse validates every sentence string,
+and the JSON repeats the text the client already sent. This module
+serializes the response dictionary directly and lets clients choose a more
+compact encoding with the Accept header:
+
+    application/json             Default. Same document as before, written
+                                 with orjson if installed, else json.dumps
+    application/msgpack          The same fields as MessagePack (needs the
+                                 optional msgpack package)
+    application/x-sentence-offsets
+                                 Offsets only, binary: the magic bytes b"SO1",
+                                 then the sentence count, then for each
+                                 sentence the gap since the previous sentence
+                                 end and the sentence length. All numbers are
+                                 unsigned LEB128 varints and offsets are in
+                                 characters (code points) of the request text.
+
+In the offsets format a typical sentence costs 2-3 bytes, against a JSON
+string of the whole sentence or a [start, end] pair of full offsets.
+"""
+
+import json
+from typing import List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from backend.spans import SentenceSpans
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+OFFSETS = "application/x-sentence-offsets"
+
+OFFSETS_MAGIC = b"SO1"
+
+# Aliases clients use for MessagePack
+_MSGPACK_ALIASES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def available_media_types() -> List[str]:
+    """Media types this server can produce, in order of preference."""
+    types = [JSON, OFFSETS]
+    if msgpack is not None:
+        types.insert(1, MSGPACK)
+    return types
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type for an Accept header.
+
+    Args:
+        accept: Accept header value, or None
+
+    Returns:
+        One of JSON, MSGPACK or OFFSETS; JSON if the header is missing or
+        accepts anything
+
+    Raises:
+        ValueError: If the header only lists types this server cannot produce
+    """
+    if not accept:
+        return JSON
+
+    available = available_media_types()
+    candidates: List[Tuple[float, int, str]] = []
+    for position, item in enumerate(accept.split(",")):
+        parts = [part.strip() for part in item.split(";")]
+        media_type = parts[0].lower()
+        quality = 1.0
+        for parameter in parts[1:]:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality <= 0:
+            continue
+
+        if media_type in ("*/*", "application/*"):
+            media_type = JSON
+        elif media_type in _MSGPACK_ALIASES:
+            media_type = MSGPACK
+        if media_type in available:
+            # Highest quality first, then the order the client listed them in
+            candidates.append((-quality, position, media_type))
+
+    if not candidates:
+        raise ValueError(f"Cannot produce any of '{accept}'. Available: {', '.join(available)}")
+    return min(candidates)[2]
+
+
+def encode_response(media_type: str, fields: dict) -> bytes:
+    """
+    Serialize a /segment response.
+
+    Args:
+        media_type: Result of negotiate()
+        fields: Response fields as in SegmentationResponse, with "spans" as
+            SentenceSpans; None values are left out
+
+    Returns:
+        Response body
+    """
+    if media_type == OFFSETS:
+        return encode_offsets(fields["spans"])
+
+    fields = {name: value for name, value in fields.items() if value is not None}
+    if "spans" in fields:
+        fields["spans"] = fields["spans"].to_list()
+    if media_type == MSGPACK:
+        return msgpack.packb(fields, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(fields)
+    return json.dumps(fields, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_offsets(spans: SentenceSpans) -> bytes:
+    """
+    Encode spans in the binary offsets format.
+
+    Args:
+        spans: Sentence spans in text order
+
+    Returns:
+        OFFSETS_MAGIC, the count, then (gap, length) varints per sentence
+    """
+    out = bytearray(OFFSETS_MAGIC)
+    _append_varint(out, len(spans))
+    previous_end = 0
+    for start, end in spans:
+        # Most gaps and lengths fit in one or two varint bytes
+        for value in (start - previous_end, end - start):
+            if value < 0x80:
+                out.append(value)
+            else:
+                _append_varint(out, value)
+        previous_end = end
+    return bytes(out)
+
+
+def decode_offsets(data: bytes) -> SentenceSpans:
+    """
+    Decode a body in the binary offsets format.
+
+    Args:
+        data: Response body
+
+    Returns:
+        The sentence spans
+
+    Raises:
+        ValueError: If the data is not in the offsets format
+    """
+    if data[:len(OFFSETS_MAGIC)] != OFFSETS_MAGIC:
+        raise ValueError("Not a sentence offsets body")
+    values = _read_varints(data, len(OFFSETS_MAGIC))
+    count = next(values, 0)
+
+    spans = SentenceSpans()
+    previous_end = 0
+    for _ in range(count):
+        try:
+            start = previous_end + next(values)
+            end = start + next(values)
+        except StopIteration:
+            raise ValueError("Truncated sentence offsets body")
+        spans.append(start, end)
+        previous_end = end
+    return spans
+
+
+def _append_varint(out: bytearray, value: int):
+    """Append an unsigned LEB128 varint."""
+    if value < 0:
+        raise ValueError(f"Cannot encode negative offset delta {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data: bytes, position: int):
+    """Yield unsigned LEB128 varints from data, starting at position."""
+    value = shift = 0
+    for byte in data[position:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+    if shift:
+        raise ValueError("Truncated sentence offsets body")
@@ -0,0 +1,335 @@
+"""
+Executor Layer - Keeps Segmentation Off the Event Loop
+
+The API endpoints are async, but both splitters are CPU-bound and blocking.
+Running them directly inside a request handler freezes every other
+connection on the worker (including /health) until segmentation finishes.
+
+This module dispatches segmentation work to executors instead:
+- Baseline splitter: thread pool (cheap, pure Python, short critical sections)
+- spaCy and hybrid splitters: process pool (true parallelism, each process
+  holds models)
+
+Both pools have a bounded number of pending tasks. When a pool is full the
+caller gets ExecutorSaturated, which the API turns into 503 + Retry-After.
+If a worker process dies (OOM kill, crash inside a model), the process pool
+is broken for good; it is shut down and rebuilt on the next call, and the
+requests it was running get PoolRestarting, a 503 as well.
+
+Streaming requests run their splitter generator for as long as the upload
+lasts, so they get a third pool with one thread per stream and no queue: at
+most SEGMENT_STREAM_WORKERS streams run at a time and the next one is
+refused with ExecutorSaturated right away.
+
+Configuration (environment variables):
+    SEGMENT_THREAD_WORKERS   Threads for the baseline pool (default: 4)
+    SEGMENT_PROCESS_WORKERS  Processes for the spaCy pool (default: 2)
+    SEGMENT_SPACY_EXECUTOR   "process" or "thread" (default: process)
+    SEGMENT_MAX_PENDING      Max queued + running tasks per pool (default: 64)
+    SEGMENT_RETRY_AFTER      Seconds suggested to saturated clients (default: 1)
+    SEGMENT_STREAM_WORKERS   Concurrent /segment/stream requests (default: 4)
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.hybrid_splitter import HybridSentenceSplitter
+from backend.profiling import call_with_profile
+from backend.spacy_splitter import SpacySentenceSplitter
+from backend.spans import SentenceSpans
+
+
+# Splitter used by spaCy tasks. In thread mode it is the API's own instance;
+# process workers inherit it when forked, or build their own when spawned.
+_shared_spacy_splitter: Optional[SpacySentenceSplitter] = None
+_shared_hybrid_splitter: Optional[HybridSentenceSplitter] = None
+
+
+def _init_process_worker():
+    """Make sure a process pool worker has a spaCy and a hybrid splitter."""
+    global _shared_spacy_splitter, _shared_hybrid_splitter
+    if _shared_spacy_splitter is None:
+        _shared_spacy_splitter = SpacySentenceSplitter()
+    if _shared_hybrid_splitter is None:
+        _shared_hybrid_splitter = HybridSentenceSplitter(_shared_spacy_splitter)
+
+
+def spacy_split_spans(text: str, language: str, profile: str = None) -> SentenceSpans:
+    """Run SpacySentenceSplitter.split_spans inside an executor."""
+    return _shared_spacy_splitter.split_spans(text, language, profile)
+
+
+def spacy_split_spans_profiled(text: str, language: str, profile: str,
+                              dump_path: Optional[str]) -> SentenceSpans:
+    """Run spacy_split_spans under cProfile, writing stats to dump_path."""
+    return call_with_profile(
+        _shared_spacy_splitter.split_spans, (text, language, profile), dump_path
+    )
+
+
+def spacy_profile_spans(text: str, language: str, profile: str,
+                        dump_path: Optional[str]) -> Tuple[SentenceSpans, Dict]:
+    """Run SpacySentenceSplitter.profile_spans inside an executor."""
+    return call_with_profile(
+        _shared_spacy_splitter.profile_spans, (text, language, profile), dump_path
+    )
+
+
+def spacy_split_many(texts: List[str], language: str, batch_size: int,
+                     profile: str = None) -> List[Dict]:
+    """Run SpacySentenceSplitter.split_many inside an executor."""
+    return _shared_spacy_splitter.split_many(
+        texts, language, batch_size=batch_size, profile=profile
+    )
+
+
+def spacy_split_spans_many(texts: List[str], language: str, profile: str = None,
+                           batch_size: int = 64) -> List[SentenceSpans]:
+    """Run SpacySentenceSplitter.split_spans_many inside an executor."""
+    return _shared_spacy_splitter.split_spans_many(texts, language, profile, batch_size)
+
+
+def hybrid_split_spans(text: str, language: str, profile: str = None,
+                       dump_path: Optional[str] = None) -> Tuple[SentenceSpans, float]:
+    """Run HybridSentenceSplitter.split_spans_with_fraction inside an executor."""
+    return call_with_profile(
+        _shared_hybrid_splitter.split_spans_with_fraction, (text, language, profile), dump_path
+    )
+
+
+def hybrid_profile_spans(text: str, language: str, profile: str,
+                         dump_path: Optional[str]) -> Tuple[SentenceSpans, Dict]:
+    """Run HybridSentenceSplitter.profile_spans inside an executor."""
+    return call_with_profile(
+        _shared_hybrid_splitter.profile_spans, (text, language, profile), dump_path
+    )
+
+
+def hybrid_split_spans_many(texts: List[str], language: str, profile: str = None,
+                            batch_size: int = 64) -> List[Tuple[SentenceSpans, float]]:
+    """Run HybridSentenceSplitter.split_spans_many_with_fraction inside an executor."""
+    return _shared_hybrid_splitter.split_spans_many_with_fraction(
+        texts, language, profile, batch_size
+    )
+
+
+def hybrid_split_many(texts: List[str], language: str, batch_size: int,
+                      profile: str = None) -> List[Dict]:
+    """Run HybridSentenceSplitter.split_many inside an executor."""
+    return _shared_hybrid_splitter.split_many(
+        texts, language, batch_size=batch_size, profile=profile
+    )
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a pool already has the maximum number of pending tasks."""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"{pool_name} pool is saturated, retry in {retry_after}s")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+class PoolRestarting(ExecutorSaturated):
+    """Raised when a worker process died; the pool is rebuilt on the next call."""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(pool_name, retry_after)
+        self.args = (f"{pool_name} pool lost a worker process and is restarting, "
+                     f"retry in {retry_after}s",)
+
+
+class _BoundedPool:
+    """
+    An executor plus a count of its pending tasks.
+
+    A task stays pending until the executor has finished it, even when the
+    coroutine awaiting it is cancelled (client disconnect): cancelling the
+    asyncio future cannot stop work that is already running, so the count
+    follows the executor's own future. Its callbacks run on executor
+    threads, hence the lock.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor],
+                 max_pending: int, retry_after: int):
+        self.name = name
+        self.factory = factory
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self.executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    async def run(self, func: Callable, *args):
+        future = self.submit(func, *args)
+        executor = self.executor
+        try:
+            return await future
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise PoolRestarting(self.name, self.retry_after) from None
+
+    def submit(self, func: Callable, *args) -> asyncio.Future:
+        """Start func(*args) and return its future; raises ExecutorSaturated at once."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorSaturated(self.name, self.retry_after)
+            self.pending += 1
+
+        try:
+            # Pools are created on first use so forked server workers never
+            # inherit a half-initialized pool from the parent
+            if self.executor is None:
+                self.executor = self.factory()
+            task = self.executor.submit(func, *args)
+        except BrokenProcessPool:
+            self._task_done(None)
+            self._discard(self.executor)
+            raise PoolRestarting(self.name, self.retry_after) from None
+        except BaseException:
+            self._task_done(None)
+            raise
+        # Tasks that never started are cancelled along with the asyncio
+        # future and finish at once; running ones finish when they return
+        task.add_done_callback(self._task_done)
+        return asyncio.wrap_future(task)
+
+    def _task_done(self, task: Optional[Future]):
+        with self._lock:
+            self.pending -= 1
+
+    def _discard(self, executor: Executor):
+        """Drop a broken executor so the next call starts a new one."""
+        # Every task of a broken pool fails; only the first one replaces it
+        if self.executor is not executor:
+            return
+        print(f"⚠ Warning: a {self.name} worker process died, restarting the pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class SegmentationExecutor:
+    """
+    Dispatches splitter calls to bounded thread and process pools.
+    """
+
+    def __init__(self, spacy_splitter: SpacySentenceSplitter,
+                 thread_workers: int = None, process_workers: int = None,
+                 spacy_mode: str = None, max_pending: int = None,
+                 retry_after: int = None, stream_workers: int = None):
+        """
+        Initialize the executor layer. Pools are started lazily.
+
+        Args:
+            spacy_splitter: Splitter shared with thread-mode spaCy tasks and
+                inherited by forked process workers
+            thread_workers: Threads in the baseline pool
+            process_workers: Processes in the spaCy pool
+            spacy_mode: "process" or "thread" pool for spaCy tasks
+            max_pending: Maximum queued + running tasks per pool
+            retry_after: Seconds to suggest in Retry-After when saturated
+            stream_workers: Streaming requests served at a time
+        """
+        global _shared_spacy_splitter, _shared_hybrid_splitter
+        _shared_spacy_splitter = spacy_splitter
+        _shared_hybrid_splitter = HybridSentenceSplitter(spacy_splitter)
+
+        thread_workers = thread_workers or int(os.environ.get("SEGMENT_THREAD_WORKERS", 4))
+        process_workers = process_workers or int(os.environ.get("SEGMENT_PROCESS_WORKERS", 2))
+        spacy_mode = spacy_mode or os.environ.get("SEGMENT_SPACY_EXECUTOR", "process")
+        max_pending = max_pending or int(os.environ.get("SEGMENT_MAX_PENDING", 64))
+        retry_after = retry_after or int(os.environ.get("SEGMENT_RETRY_AFTER", 1))
+        stream_workers = stream_workers or int(os.environ.get("SEGMENT_STREAM_WORKERS", 4))
+
+        self.spacy_workers = process_workers
+
+        if spacy_mode not in ("process", "thread"):
+            raise ValueError(f"SEGMENT_SPACY_EXECUTOR must be 'process' or 'thread', got '{spacy_mode}'")
+
+        self.baseline_pool = _BoundedPool(
+            "baseline",
+            lambda: ThreadPoolExecutor(thread_workers, thread_name_prefix="baseline"),
+            max_pending, retry_after
+        )
+
+        if spacy_mode == "process":
+            spacy_factory = lambda: ProcessPoolExecutor(
+                process_workers, initializer=_init_process_worker
+            )
+        else:
+            spacy_factory = lambda: ThreadPoolExecutor(
+                process_workers, thread_name_prefix="spacy"
+            )
+        self.spacy_pool = _BoundedPool("spacy", spacy_factory, max_pending, retry_after)
+
+        self.stream_pool = _BoundedPool(
+            "stream",
+            lambda: ThreadPoolExecutor(stream_workers, thread_name_prefix="stream"),
+            stream_workers, retry_after
+        )
+
+    async def run_baseline(self, func: Callable, *args):
+        """
+        Run a baseline splitter call in the thread pool.
+
+        Args:
+            func: Callable to run, e.g. baseline_splitter.split
+            *args: Arguments for func
+
+        Returns:
+            The result of func(*args)
+
+        Raises:
+            ExecutorSaturated: If the pool has too many pending tasks
+        """
+        return await self.baseline_pool.run(func, *args)
+
+    async def run_spacy(self, func: Callable, *args):
+        """
+        Run a spaCy task in the spaCy pool.
+
+        Args:
+            func: Module-level (picklable) callable such as spacy_split_spans
+            *args: Arguments for func
+
+        Returns:
+            The result of func(*args)
+
+        Raises:
+            ExecutorSaturated: If the pool has too many pending tasks
+        """
+        return await self.spacy_pool.run(func, *args)
+
+    def start_stream(self, func: Callable, *args) -> asyncio.Future:
+        """
+        Start a long-running streaming task on a thread of its own.
+
+        The stream pool never queues: the task starts at once or not at all,
+        so a caller can refuse the request before sending any response.
+
+        Args:
+            func: Blocking callable that runs until its stream ends
+            *args: Arguments for func
+
+        Returns:
+            Future of func(*args)
+
+        Raises:
+            ExecutorSaturated: If SEGMENT_STREAM_WORKERS streams are running
+        """
+        return self.stream_pool.submit(func, *args)
+
+    def shutdown(self):
+        """Stop all pools without waiting for queued work."""
+        self.baseline_pool.shutdown()
+        self.spacy_pool.shutdown()
+        self.stream_pool.shutdown()
@@ -0,0 +1,411 @@
+"""
+Hybrid Sentence Splitter - Rules First, spaCy Only Where They Are Unsure
+
+Most boundaries in clean prose are easy: sentence-ending punctuation after an
+ordinary word, whitespace, and a capital letter. The rule-based baseline and
+spaCy agree on those, so running the whole text through spaCy mostly buys
+nothing. The hybrid splitter runs a fast rule pass that classifies every
+candidate boundary as certain or ambiguous and sends only the text around
+ambiguous candidates to the spaCy model.
+
+Ambiguous candidates fall into the error categories tracked by
+SegmentationEvaluator._analyze_errors, plus ellipses:
+    abbreviation  the word before the punctuation is in the language's
+                  abbreviation lexicon, a single capital (an initial) or
+                  contains inner periods ("U.S.")
+    quotation     a closing quote/bracket after the punctuation, or an
+                  opening one before the next word
+    decimal       a digit right before the punctuation (amounts, ordinals,
+                  numbered list items)
+    lowercase     the next word does not start with a capital letter
+    ellipsis      a run of two or more periods
+
+Blank lines count as certain boundaries even without punctuation: treating
+them as ambiguous would hand the last sentence of most paragraphs to spaCy.
+
+Certain boundaries are kept as they are. Every stretch of text between two
+consecutive certain boundaries that contains an ambiguous candidate is
+segmented by spaCy as one small document; it starts and ends at sentence
+boundaries, so spaCy sees whole sentences. All stretches of a request go
+through nlp.pipe together. The share of characters sent to spaCy is reported
+as the spacy_fraction. When that share would exceed a limit, the document
+goes to spaCy whole instead: many small calls cost more than one large one.
+"""
+
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.baseline_splitter import BaselineSentenceSplitter, SUPPORTED_LANGUAGES as BASELINE_LANGUAGES
+from backend.spacy_splitter import SpacySentenceSplitter
+from backend.spans import SentenceSpans
+
+
+# Candidate boundaries: punctuation run (group 1), closing quotes or brackets
+# (group 2) and whitespace; or a blank line (group 3) not preceded by them
+_CANDIDATE = re.compile(r'([.!?]+)(["\'”’»)\]]*)\s+|(\n[ \t]*\n\s*)')
+
+# Characters that open a quotation or parenthesis before the next word
+_OPENING_QUOTES = frozenset('"\'“‘«([')
+
+# Ambiguity categories, in the order they are checked
+CATEGORIES = ("quotation", "lowercase", "ellipsis", "decimal", "abbreviation")
+
+
+class _Plan:
+    """Result of the rule pass over one document."""
+
+    __slots__ = ("segments", "ambiguous", "counts")
+
+    def __init__(self):
+        # (start, end, ambiguous) for every stretch between certain boundaries
+        self.segments: List[Tuple[int, int, bool]] = []
+        # (start, end) of the ambiguous stretches, in order
+        self.ambiguous: List[Tuple[int, int]] = []
+        # Candidates per category, plus "certain"
+        self.counts: Dict[str, int] = dict.fromkeys(CATEGORIES + ("certain",), 0)
+
+
+class HybridSentenceSplitter:
+    """
+    Cascade of the baseline rules and the spaCy model.
+
+    Uses the spaCy splitter's models (and its English fallback) for the
+    ambiguous stretches and the baseline's abbreviation lexicons for the
+    rule pass, so it supports the same languages as both.
+
+    Configuration (environment variables):
+        HYBRID_MAX_SPACY_FRACTION  Above this share of ambiguous text a
+                                   document is sent to spaCy whole
+                                   (default: 0.5)
+    """
+
+    # Bumped whenever the rules change, so cached results are invalidated
+    version = "1"
+
+    def __init__(self, spacy_splitter: SpacySentenceSplitter,
+                 baseline_splitter: BaselineSentenceSplitter = None,
+                 max_spacy_fraction: float = None):
+        """
+        Initialize the hybrid splitter.
+
+        Args:
+            spacy_splitter: Splitter that segments the ambiguous stretches
+            baseline_splitter: Splitter providing the abbreviation lexicons
+            max_spacy_fraction: Share of ambiguous text above which a
+                document is segmented by spaCy in one piece
+        """
+        self.spacy_splitter = spacy_splitter
+        self.baseline_splitter = baseline_splitter or BaselineSentenceSplitter()
+        if max_spacy_fraction is None:
+            max_spacy_fraction = float(os.environ.get("HYBRID_MAX_SPACY_FRACTION", 0.5))
+        self.max_spacy_fraction = max_spacy_fraction
+
+    def split(self, text: str, language: str = "en", profile: str = None) -> List[str]:
+        """
+        Split text into sentences.
+
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+
+        Returns:
+            List of sentences (strings)
+        """
+        return self.split_spans(text, language, profile).texts(text)
+
+    def split_spans(self, text: str, language: str = "en",
+                    profile: str = None) -> SentenceSpans:
+        """
+        Split text into sentences and return character offsets only.
+
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+
+        Returns:
+            SentenceSpans with (start, end) offsets into the original text
+        """
+        return self.split_spans_with_fraction(text, language, profile)[0]
+
+    def split_spans_with_fraction(self, text: str, language: str = "en",
+                                  profile: str = None) -> Tuple[SentenceSpans, float]:
+        """
+        Split text and report how much of it spaCy had to look at.
+
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+
+        Returns:
+            (spans, spacy_fraction) where spacy_fraction is the share of
+            characters sent to the spaCy model, between 0 and 1
+        """
+        plan = self._plan(text, language)
+        spans = self._merge(text, plan, self._segment_ambiguous([(text, plan)], language, profile))
+        return spans, _fraction(plan, len(text))
+
+    def split_many(self, texts: Iterable[str], language: str = "en",
+                   batch_size: int = 64, profile: str = None) -> List[Dict]:
+        """
+        Split many documents, sending the ambiguous stretches of all of them
+        through nlp.pipe together.
+
+        Args:
+            texts: Documents to segment
+            language: Language code (en, fr, de, es)
+            batch_size: Number of stretches spaCy processes per batch
+            profile: spaCy pipeline profile, or None for the default
+
+        Returns:
+            One dictionary per input document, in input order, with
+            "sentences", "error" and "spacy_fraction"
+        """
+        texts = list(texts)
+        results: List[Optional[Dict]] = [None] * len(texts)
+        planned = []
+        for index, text in enumerate(texts):
+            if not isinstance(text, str):
+                results[index] = {"sentences": [], "error": "Text must be a string",
+                                  "spacy_fraction": 0.0}
+            else:
+                planned.append((index, text, self._plan(text, language)))
+
+        segmented = self.split_spans_many_with_fraction(
+            [text for _, text, _ in planned], language, profile, batch_size,
+            plans=[plan for _, _, plan in planned]
+        )
+        for (index, text, _), (spans, fraction) in zip(planned, segmented):
+            results[index] = {"sentences": spans.texts(text), "error": None,
+                              "spacy_fraction": fraction}
+        return results
+
+    def split_spans_many_with_fraction(self, texts: List[str], language: str = "en",
+                                       profile: str = None, batch_size: int = 64,
+                                       plans: List[_Plan] = None) -> List[Tuple[SentenceSpans, float]]:
+        """
+        Split many documents like split_spans_with_fraction(), sending the
+        ambiguous stretches of all of them through nlp.pipe together.
+
+        Args:
+            texts: Documents to segment
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+            batch_size: Number of stretches spaCy processes per batch
+            plans: Results of _plan() for texts, if already computed
+
+        Returns:
+            One (spans, spacy_fraction) pair per input document, in input order
+        """
+        if plans is None:
+            plans = [self._plan(text, language) for text in texts]
+        segmented = iter(self._segment_ambiguous(list(zip(texts, plans)), language, profile, batch_size))
+        return [(self._merge(text, plan, segmented), _fraction(plan, len(text)))
+                for text, plan in zip(texts, plans)]
+
+    def profile_spans(self, text: str, language: str = "en",
+                      profile: str = None) -> Tuple[SentenceSpans, Dict]:
+        """
+        Split text like split_spans() and report where the time went.
+
+        Phases:
+            rules  candidate scan and classification
+            spacy  spaCy on the ambiguous stretches (including model lookup)
+            merge  combining certain boundaries with spaCy's offsets
+
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+
+        Returns:
+            (spans, breakdown) where breakdown has "phases" (seconds),
+            "counts" and the "model" version
+        """
+        phases = {}
+        start = time.perf_counter()
+        plan = self._plan(text, language)
+        phases["rules"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        segmented = self._segment_ambiguous([(text, plan)], language, profile)
+        phases["spacy"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        spans = self._merge(text, plan, segmented)
+        phases["merge"] = time.perf_counter() - start
+
+        counts = {
+            "chars": len(text),
+            "spacy_chars": sum(end - start for start, end in plan.ambiguous),
+            "stretches": len(plan.ambiguous),
+            "candidates": dict(plan.counts),
+            "sentences": len(spans),
+        }
+        return spans, {"phases": phases, "counts": counts,
+                       "model": self.spacy_splitter.model_version(language, profile)}
+
+    def _plan(self, text: str, language: str) -> _Plan:
+        """
+        Run the rule pass: find candidate boundaries and classify them.
+
+        Args:
+            text: Document
+            language: Language code selecting the abbreviation lexicon
+
+        Returns:
+            _Plan with the stretches between certain boundaries
+        """
+        # spaCy falls back to English for unknown languages; so do the rules
+        if language not in BASELINE_LANGUAGES:
+            language = "en"
+        plan = _Plan()
+        counts = plan.counts
+        classify = self._classify
+
+        # Skip leading whitespace
+        segment_start = 0
+        while segment_start < len(text) and text[segment_start].isspace():
+            segment_start += 1
+        ambiguous = False
+        # End of the previous candidate; bounds the abbreviation look-behind
+        floor = segment_start
+
+        for match in _CANDIDATE.finditer(text, segment_start):
+            next_start = match.end()
+            if next_start >= len(text):
+                break
+
+            category = classify(text, match, floor, next_start, language)
+            floor = next_start
+            if category is not None:
+                counts[category] += 1
+                ambiguous = True
+                continue
+
+            counts["certain"] += 1
+            if match.group(3) is None:
+                sentence_end = match.end(1)
+            else:
+                # Blank line: the sentence ends before the line break
+                sentence_end = match.start()
+                while sentence_end > segment_start and text[sentence_end - 1].isspace():
+                    sentence_end -= 1
+            if segment_start < sentence_end:
+                self._add_segment(plan, segment_start, sentence_end, ambiguous)
+            segment_start = next_start
+            ambiguous = False
+
+        end = len(text)
+        while end > segment_start and text[end - 1].isspace():
+            end -= 1
+        if segment_start < end:
+            self._add_segment(plan, segment_start, end, ambiguous)
+
+        # Mostly ambiguous: one spaCy call on the whole document is cheaper
+        if plan.segments and _fraction(plan, len(text)) > self.max_spacy_fraction:
+            start, end = plan.segments[0][0], plan.segments[-1][1]
+            plan.segments = [(start, end, True)]
+            plan.ambiguous = [(start, end)]
+        return plan
+
+    def _classify(self, text: str, match, floor: int, next_start: int,
+                  language: str) -> Optional[str]:
+        """
+        Decide whether a candidate boundary is certain.
+
+        Args:
+            text: Document
+            match: _CANDIDATE match
+            floor: Offset the abbreviation look-behind may not cross
+            next_start: Offset of the first character after the whitespace
+            language: Language code with an abbreviation lexicon
+
+        Returns:
+            The ambiguity category, or None for a certain boundary
+        """
+        if match.group(3) is not None:
+            return None
+
+        following = text[next_start]
+        if match.group(2) or following in _OPENING_QUOTES:
+            return "quotation"
+        if not following.isupper():
+            return "lowercase"
+        if match.group(1).startswith(".."):
+            return "ellipsis"
+
+        punct_start = match.start(1)
+        # Punctuation right at the start of a sentence has no word before it
+        before = text[punct_start - 1] if punct_start > floor else " "
+        if before.isdigit():
+            return "decimal"
+        # Initials ("J. Smith") and dotted forms outside the lexicon ("U.S.")
+        if before.isupper() and (punct_start - 1 == floor or text[punct_start - 2].isspace()):
+            return "abbreviation"
+        if punct_start - 2 >= floor and text[punct_start - 2] == ".":
+            return "abbreviation"
+        if self.baseline_splitter.ends_with_abbreviation(text, floor, punct_start, language):
+            return "abbreviation"
+        return None
+
+    @staticmethod
+    def _add_segment(plan: _Plan, start: int, end: int, ambiguous: bool):
+        """Record a stretch between two certain boundaries."""
+        plan.segments.append((start, end, ambiguous))
+        if ambiguous:
+            plan.ambiguous.append((start, end))
+
+    def _segment_ambiguous(self, documents: List[Tuple[str, _Plan]], language: str,
+                           profile: Optional[str], batch_size: int = 64) -> List[SentenceSpans]:
+        """
+        Segment the ambiguous stretches of several documents with spaCy.
+
+        Args:
+            documents: (text, plan) pairs
+            language: Language code (en, fr, de, es)
+            profile: spaCy pipeline profile, or None for the default
+            batch_size: Number of stretches spaCy processes per batch
+
+        Returns:
+            Spans relative to each stretch, in document and stretch order
+        """
+        stretches = [text[start:end] for text, plan in documents for start, end in plan.ambiguous]
+        if not stretches:
+            return []
+        return self.spacy_splitter.split_spans_many(stretches, language, profile, batch_size)
+
+    @staticmethod
+    def _merge(text: str, plan: _Plan, segmented: Iterable[SentenceSpans]) -> SentenceSpans:
+        """
+        Combine certain stretches with spaCy's spans for the ambiguous ones.
+
+        Args:
+            text: Document
+            plan: Result of _plan() for the document
+            segmented: Spans for the document's ambiguous stretches (consumed
+                in order; may be shared with following documents)
+
+        Returns:
+            SentenceSpans with (start, end) offsets into text
+        """
+        segmented = iter(segmented)
+        spans = SentenceSpans()
+        for start, end, ambiguous in plan.segments:
+            if not ambiguous:
+                spans.append(start, end)
+                continue
+            for sentence_start, sentence_end in next(segmented):
+                spans.append(start + sentence_start, start + sentence_end)
+        return spans
+
+
+def _fraction(plan: _Plan, length: int) -> float:
+    """Share of a document's characters that were sent to spaCy."""
+    if not length:
+        return 0.0
+    return round(sum(end - start for start, end in plan.ambiguous) / length, 4)
@@ -0,0 +1,760 @@
+"""
+Jobs - Asynchronous Segmentation Jobs Backed by SQLite
+
+/segment answers only once the whole document is segmented, which for
+documents of many megabytes takes longer than load balancers wait. Jobs
+decouple the two: POST /jobs stores the documents and returns a job id at
+once, background workers segment them, and clients poll GET /jobs/{id} and
+fetch the results page by page or as one streamed download.
+
+Everything lives in one SQLite database (WAL mode), so jobs survive server
+restarts and every worker process of a pre-fork server shares the queue:
+    jobs           one row per job: settings, status, progress counters and
+                   the owner/heartbeat of the worker running it
+    job_documents  the submitted documents; the text is dropped once the
+                   document is segmented
+    job_results    sentences in chunks of RESULT_CHUNK, numbered across the
+                   whole job, so any page is one or two index lookups
+
+A job is worked on in batches of documents. Each batch is committed in one
+transaction together with the job's progress, so a job interrupted by a
+crash or restart continues after its last committed batch. Running jobs are
+kept alive by a heartbeat; a job whose worker stops sending it for
+SEGMENT_JOB_STALE_AFTER seconds is queued again, at most
+SEGMENT_JOB_MAX_ATTEMPTS times. On a graceful shutdown a worker hands its
+jobs back right away.
+
+Segmentation goes through the same executor pools as /segment, so jobs
+share their capacity limits, and spaCy jobs run in the process pool.
+
+Configuration (environment variables):
+    SEGMENT_JOBS_DB           SQLite file of the job queue (default:
+                              segment-jobs.sqlite3 in the system temporary
+                              directory; set it to persistent storage in
+                              production)
+    SEGMENT_JOB_WORKERS       Jobs processed at a time per server process, 0
+                              to only accept and serve jobs (default: 1)
+    SEGMENT_JOB_MAX_QUEUED    Queued jobs before POST /jobs answers 503
+                              (default: 100)
+    SEGMENT_JOB_STALE_AFTER   Seconds without heartbeat before a running job
+                              is queued again (default: 30)
+    SEGMENT_JOB_MAX_ATTEMPTS  Starts before an interrupted job fails (default: 3)
+    SEGMENT_JOB_RETENTION     Seconds finished jobs and their results are kept
+                              (default: 86400)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from backend import metrics
+from backend.executor import (
+    ExecutorSaturated, SegmentationExecutor, hybrid_split_many, hybrid_split_spans,
+    spacy_split_many, spacy_split_spans
+)
+from backend.spans import SentenceSpans
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+# Database file in the system temporary directory when SEGMENT_JOBS_DB is
+# unset, so a server started from a checkout never writes into it
+DEFAULT_DB_NAME = "segment-jobs.sqlite3"
+
+# Sentences per job_results row
+RESULT_CHUNK = 1000
+
+# Documents are batched up to this many characters; larger ones run alone
+BATCH_CHARS = 1000000
+
+# Seconds between heartbeats, and between polls for new jobs when idle
+HEARTBEAT_INTERVAL = 5.0
+IDLE_POLL = 1.0
+
+# Seconds between deletions of expired jobs
+PURGE_INTERVAL = 60.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id TEXT PRIMARY KEY, status TEXT NOT NULL,"
+    " method TEXT NOT NULL, language TEXT NOT NULL, pipeline TEXT,"
+    " batch_size INTEGER NOT NULL, documents INTEGER NOT NULL, chars INTEGER NOT NULL,"
+    " documents_done INTEGER NOT NULL DEFAULT 0, chars_done INTEGER NOT NULL DEFAULT 0,"
+    " sentences INTEGER NOT NULL DEFAULT 0, errors INTEGER NOT NULL DEFAULT 0,"
+    " attempts INTEGER NOT NULL DEFAULT 0, owner TEXT, heartbeat REAL,"
+    " created REAL NOT NULL, started REAL, finished REAL, error TEXT)",
+    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)",
+    "CREATE TABLE IF NOT EXISTS job_documents ("
+    " job_id TEXT NOT NULL, idx INTEGER NOT NULL, doc_id TEXT NOT NULL,"
+    " chars INTEGER NOT NULL, text TEXT, first_sentence INTEGER, count INTEGER, error TEXT,"
+    " PRIMARY KEY (job_id, idx))",
+    "CREATE TABLE IF NOT EXISTS job_results ("
+    " job_id TEXT NOT NULL, first_sentence INTEGER NOT NULL, idx INTEGER NOT NULL,"
+    " count INTEGER NOT NULL, sentences TEXT NOT NULL,"
+    " PRIMARY KEY (job_id, first_sentence))",
+)
+
+_JOB_FIELDS = ("id", "status", "method", "language", "pipeline", "batch_size",
+               "documents", "documents_done", "chars", "chars_done", "sentences",
+               "errors", "attempts", "created", "started", "finished", "error")
+
+# One document: (index in the job, document id, text)
+Document = Tuple[int, str, str]
+
+
+class QueueFull(Exception):
+    """Raised by JobStore.submit() when SEGMENT_JOB_MAX_QUEUED jobs are waiting."""
+
+
+def documents_from_upload(filename: str, data: bytes) -> List[Tuple[str, str]]:
+    """
+    Split an uploaded file into documents, like the bulk CLI reads files.
+
+    Args:
+        filename: Name of the upload; *.jsonl files hold one
+            {"id": ..., "text": ...} document per line, anything else is one
+            plain-text document
+        data: File contents, UTF-8
+
+    Returns:
+        (document id, text) tuples
+
+    Raises:
+        ValueError: If a JSONL line is not a JSON object with a string text
+    """
+    content = data.decode("utf-8", errors="replace")
+    if not filename.endswith(".jsonl"):
+        return [(filename, content)]
+
+    documents = []
+    for line_number, line in enumerate(content.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{filename}:{line_number}: invalid JSON ({e})")
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            raise ValueError(f"{filename}:{line_number}: expected an object with a \"text\" string")
+        documents.append((str(record.get("id", f"{filename}:{line_number}")), record["text"]))
+    return documents
+
+
+class JobStore:
+    """
+    The SQLite job queue: submitted documents, job state and results.
+
+    Every thread gets its own connection, opened on first use, so the
+    database file is only created once jobs are used. All methods block and
+    are meant to be called through asyncio.to_thread() from the API.
+    """
+
+    def __init__(self, path: str = None, max_queued: int = None, retention: float = None):
+        """
+        Initialize the store. Nothing is opened until first use.
+
+        Args:
+            path: SQLite database file (default: SEGMENT_JOBS_DB, or
+                DEFAULT_DB_NAME in the system temporary directory)
+            max_queued: Queued jobs before submit() raises QueueFull
+            retention: Seconds finished jobs are kept
+        """
+        if path is None:
+            path = (os.environ.get("SEGMENT_JOBS_DB")
+                    or os.path.join(tempfile.gettempdir(), DEFAULT_DB_NAME))
+        if max_queued is None:
+            max_queued = int(os.environ.get("SEGMENT_JOB_MAX_QUEUED", 100))
+        if retention is None:
+            retention = float(os.environ.get("SEGMENT_JOB_RETENTION", 86400))
+
+        self.path = path
+        self.max_queued = max_queued
+        self.retention = retention
+
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        # Connections must not cross fork(); forked server workers open their own
+        os.register_at_fork(after_in_child=self._reset_connections)
+
+    def _reset_connections(self):
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                self._schema_ready = True
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, rolled back on errors."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def submit(self, documents: List[Tuple[str, str]], method: str, language: str,
+               pipeline: Optional[str], batch_size: int) -> Dict:
+        """
+        Queue a new job.
+
+        Args:
+            documents: (document id, text) tuples, in order
+            method: Segmentation method
+            language: Language code
+            pipeline: Resolved spaCy pipeline profile, None for baseline
+            batch_size: Documents per nlp.pipe batch
+
+        Returns:
+            The job, as returned by get()
+
+        Raises:
+            QueueFull: If max_queued jobs are already waiting
+        """
+        job_id = uuid.uuid4().hex
+        with self._transaction() as connection:
+            queued = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+            if queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs are already queued")
+
+            connection.executemany(
+                "INSERT INTO job_documents (job_id, idx, doc_id, chars, text) VALUES (?, ?, ?, ?, ?)",
+                ((job_id, index, doc_id, len(text), text)
+                 for index, (doc_id, text) in enumerate(documents))
+            )
+            connection.execute(
+                "INSERT INTO jobs (id, status, method, language, pipeline, batch_size,"
+                " documents, chars, created) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, method, language, pipeline, batch_size, len(documents),
+                 sum(len(text) for _, text in documents), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Id returned by submit()
+
+        Returns:
+            Job settings, status and progress (0-1, by characters), or None
+            if there is no such job
+        """
+        row = self._connection().execute(
+            f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        if job["status"] == "done":
+            job["progress"] = 1.0
+        else:
+            job["progress"] = round(job["chars_done"] / job["chars"], 4) if job["chars"] else 0.0
+        return job
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Delete a job with its documents and results. A worker running it
+        stops after its current batch.
+
+        Returns:
+            False if there was no such job
+        """
+        with self._transaction() as connection:
+            deleted = connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount
+            connection.execute("DELETE FROM job_documents WHERE job_id = ?", (job_id,))
+            connection.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+        return deleted > 0
+
+    def claim(self, owner: str) -> Optional[Dict]:
+        """
+        Take the oldest queued job and mark it running.
+
+        Args:
+            owner: Id of the claiming worker
+
+        Returns:
+            The job, or None if the queue is empty
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?,"
+                " started = COALESCE(started, ?), attempts = attempts + 1 WHERE id = ?",
+                (owner, now, now, row["id"])
+            )
+        return self.get(row["id"])
+
+    def next_batch(self, job_id: str, start: int, max_documents: int,
+                   max_chars: int = BATCH_CHARS) -> List[Document]:
+        """
+        Read the next documents to segment.
+
+        Args:
+            job_id: Job id
+            start: Index of the first document
+            max_documents: Most documents to return
+            max_chars: Documents are added while their total length stays
+                within this; the first one is always returned
+
+        Returns:
+            (index, document id, text) tuples, empty when the job is complete
+        """
+        cursor = self._connection().execute(
+            "SELECT idx, doc_id, chars, text FROM job_documents"
+            " WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+            (job_id, start, max_documents)
+        )
+        batch = []
+        chars = 0
+        for row in cursor:
+            if batch and chars + row["chars"] > max_chars:
+                break
+            batch.append((row["idx"], row["doc_id"], row["text"] or ""))
+            chars += row["chars"]
+        cursor.close()
+        return batch
+
+    def save_batch(self, job_id: str, owner: str, batch: List[Document],
+                   results: List[Tuple[Union[List[str], SentenceSpans], Optional[str]]]) -> bool:
+        """
+        Store the results of a batch and advance the job's progress.
+
+        Args:
+            job_id: Job id
+            owner: Worker that ran the batch
+            batch: Documents from next_batch()
+            results: (sentences or spans, error) per document
+
+        Returns:
+            False if the job was deleted or taken over by another worker
+            meanwhile; nothing is stored then
+        """
+        # Encode outside the transaction, which blocks other writers
+        encoded = []
+        sentence_count = 0
+        for (index, _, text), (sentences, error) in zip(batch, results):
+            if isinstance(sentences, SentenceSpans):
+                sentences = sentences.texts(text)
+            chunks = [
+                json.dumps(sentences[start:start + RESULT_CHUNK], ensure_ascii=False)
+                for start in range(0, len(sentences), RESULT_CHUNK)
+            ]
+            encoded.append((index, len(sentences), error, chunks))
+            sentence_count += len(sentences)
+
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT sentences FROM jobs WHERE id = ? AND owner = ? AND status = 'running'",
+                (job_id, owner)
+            ).fetchone()
+            if row is None:
+                return False
+
+            first_sentence = row["sentences"]
+            for index, count, error, chunks in encoded:
+                offset = first_sentence
+                for chunk_number, chunk in enumerate(chunks):
+                    size = min(RESULT_CHUNK, count - chunk_number * RESULT_CHUNK)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO job_results"
+                        " (job_id, first_sentence, idx, count, sentences) VALUES (?, ?, ?, ?, ?)",
+                        (job_id, offset, index, size, chunk)
+                    )
+                    offset += size
+                connection.execute(
+                    "UPDATE job_documents SET text = NULL, first_sentence = ?, count = ?, error = ?"
+                    " WHERE job_id = ? AND idx = ?",
+                    (first_sentence, count, error, job_id, index)
+                )
+                first_sentence += count
+
+            connection.execute(
+                "UPDATE jobs SET documents_done = ?, chars_done = chars_done + ?,"
+                " sentences = sentences + ?, errors = errors + ?, heartbeat = ? WHERE id = ?",
+                (batch[-1][0] + 1, sum(len(text) for _, _, text in batch), sentence_count,
+                 sum(1 for _, error in results if error), time.time(), job_id)
+            )
+        return True
+
+    def finish(self, job_id: str, owner: str, status: str, error: str = None) -> bool:
+        """
+        Mark a running job done or failed.
+
+        Returns:
+            False if the job is no longer run by this owner
+        """
+        with self._transaction() as connection:
+            return connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?, owner = NULL"
+                " WHERE id = ? AND owner = ? AND status = 'running'",
+                (status, error, time.time(), job_id, owner)
+            ).rowcount > 0
+
+    def heartbeat(self, owner: str):
+        """Refresh the heartbeat of every job this owner is running."""
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'",
+                (time.time(), owner)
+            )
+
+    def release(self, owner: str) -> int:
+        """
+        Queue the owner's running jobs again, e.g. on shutdown.
+
+        Returns:
+            Number of jobs released
+        """
+        with self._transaction() as connection:
+            return connection.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, attempts = attempts - 1"
+                " WHERE owner = ? AND status = 'running'", (owner,)
+            ).rowcount
+
+    def requeue_stale(self, stale_after: float, max_attempts: int) -> int:
+        """
+        Queue again running jobs whose worker stopped sending heartbeats,
+        or fail them once they have been started max_attempts times.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        cutoff = time.time() - stale_after
+        with self._transaction() as connection:
+            failed = connection.execute(
+                "UPDATE jobs SET status = 'failed', owner = NULL, finished = ?,"
+                " error = 'Interrupted ' || attempts || ' times'"
+                " WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                (time.time(), cutoff, max_attempts)
+            ).rowcount
+            requeued = connection.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL"
+                " WHERE status = 'running' AND heartbeat < ?", (cutoff,)
+            ).rowcount
+        return failed + requeued
+
+    def purge_expired(self) -> int:
+        """
+        Delete finished jobs older than the retention period.
+
+        Returns:
+            Number of jobs deleted
+        """
+        cutoff = time.time() - self.retention
+        expired = [row["id"] for row in self._connection().execute(
+            "SELECT id FROM jobs WHERE status IN ('done', 'failed') AND finished < ?", (cutoff,)
+        )]
+        for job_id in expired:
+            self.delete(job_id)
+        return len(expired)
+
+    def results_page(self, job_id: str, offset: int, limit: int) -> List[Dict]:
+        """
+        Read sentences offset .. offset + limit - 1 of a job.
+
+        Args:
+            job_id: Job id
+            offset: Index of the first sentence, counted across all documents
+            limit: Most sentences to return
+
+        Returns:
+            {"document": index, "sentence": text} per sentence stored so far
+        """
+        rows = self._connection().execute(
+            "SELECT first_sentence, idx, sentences FROM job_results"
+            " WHERE job_id = ? AND first_sentence > ? AND first_sentence < ?"
+            " ORDER BY first_sentence",
+            (job_id, offset - RESULT_CHUNK, offset + limit)
+        ).fetchall()
+        items = []
+        for row in rows:
+            first = row["first_sentence"]
+            for sentence in json.loads(row["sentences"])[max(0, offset - first):offset + limit - first]:
+                items.append({"document": row["idx"], "sentence": sentence})
+        return items
+
+    def iter_download(self, job_id: str) -> Iterator[bytes]:
+        """
+        Stream all results as NDJSON, one line per document:
+        {"document": 0, "id": "...", "count": 2, "sentences": [...]}, plus
+        "error" for documents that failed.
+
+        Uses a connection of its own, as the response may iterate it from
+        different threads. Stored sentence chunks are copied without being
+        decoded.
+
+        Yields:
+            Pieces of the NDJSON body
+        """
+        connection = self._connect()
+        try:
+            documents = connection.execute(
+                "SELECT idx, doc_id, first_sentence, count, error FROM job_documents"
+                " WHERE job_id = ? ORDER BY idx", (job_id,)
+            )
+            for document in documents:
+                head = {"document": document["idx"], "id": document["doc_id"],
+                        "count": document["count"] or 0}
+                if document["error"]:
+                    head["error"] = document["error"]
+                yield (json.dumps(head, ensure_ascii=False)[:-1] + ', "sentences": [').encode("utf-8")
+
+                separator = ""
+                if document["count"]:
+                    first = document["first_sentence"]
+                    for row in connection.execute(
+                            "SELECT sentences FROM job_results WHERE job_id = ?"
+                            " AND first_sentence >= ? AND first_sentence < ? ORDER BY first_sentence",
+                            (job_id, first, first + document["count"])):
+                        yield (separator + row["sentences"][1:-1]).encode("utf-8")
+                        separator = ", "
+                yield b"]}\n"
+        finally:
+            connection.close()
+
+    def queue_stats(self) -> Dict:
+        """
+        Count jobs by status and find the wait of the oldest queued job.
+
+        Returns:
+            {"queued": n, "running": n, "done": n, "failed": n,
+             "oldest_queued_seconds": s}
+        """
+        connection = self._connection()
+        stats = {status: 0 for status in JOB_STATUSES}
+        for row in connection.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            stats[row["status"]] = row["n"]
+        oldest = connection.execute(
+            "SELECT MIN(created) FROM jobs WHERE status = 'queued'"
+        ).fetchone()[0]
+        stats["oldest_queued_seconds"] = round(time.time() - oldest, 3) if oldest else 0.0
+        return stats
+
+
+class JobRunner:
+    """
+    Background tasks on the server's event loop that process queued jobs.
+
+    Each server process runs `workers` job loops plus one maintenance loop
+    that sends heartbeats, requeues stale jobs and purges expired ones.
+    """
+
+    def __init__(self, store: JobStore, executor: SegmentationExecutor, baseline_splitter,
+                 workers: int = None, stale_after: float = None, max_attempts: int = None,
+                 model_loader=None):
+        """
+        Initialize the runner. No task is started until start().
+
+        Args:
+            store: The job queue
+            executor: Executor pools used for segmentation
+            baseline_splitter: BaselineSentenceSplitter for baseline jobs
+            workers: Jobs processed at a time
+            stale_after: Seconds without heartbeat before a job is requeued
+            max_attempts: Starts before an interrupted job fails
+            model_loader: ModelLoader; spaCy jobs wait until it is ready
+        """
+        if workers is None:
+            workers = int(os.environ.get("SEGMENT_JOB_WORKERS", 1))
+        if stale_after is None:
+            stale_after = float(os.environ.get("SEGMENT_JOB_STALE_AFTER", 30))
+        if max_attempts is None:
+            max_attempts = int(os.environ.get("SEGMENT_JOB_MAX_ATTEMPTS", 3))
+
+        self.store = store
+        self.executor = executor
+        self.baseline_splitter = baseline_splitter
+        self.workers = workers
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.model_loader = model_loader
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self):
+        """Start the job and maintenance loops on the running event loop."""
+        if self._tasks:
+            return
+        # Forked workers each need their own owner id
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._tasks.append(asyncio.create_task(self._maintain()))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    async def stop(self):
+        """Cancel the loops and hand running jobs back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.workers:
+            released = await asyncio.to_thread(self.store.release, self.owner)
+            if released:
+                print(f"✓ Returned {released} running job(s) to the queue")
+
+    def notify(self):
+        """Wake an idle job loop after a job was submitted."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _maintain(self):
+        last_purge = 0.0
+        while True:
+            try:
+                await asyncio.to_thread(self.store.heartbeat, self.owner)
+                await asyncio.to_thread(self.store.requeue_stale, self.stale_after, self.max_attempts)
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    await asyncio.to_thread(self.store.purge_expired)
+                    last_purge = time.monotonic()
+            except sqlite3.Error as e:
+                print(f"⚠ Warning: job queue maintenance failed: {e}")
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    async def _work(self):
+        while True:
+            if self.model_loader is not None and self.model_loader.status == "loading":
+                await asyncio.sleep(IDLE_POLL)
+                continue
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.owner)
+            except sqlite3.Error as e:
+                print(f"⚠ Warning: cannot read the job queue: {e}")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), IDLE_POLL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Storage errors; the job is requeued once its heartbeat is stale
+                traceback.print_exc()
+
+    async def _run(self, job: Dict):
+        """Segment a claimed job batch by batch, from its first unfinished document."""
+        start = time.perf_counter()
+        index = job["documents_done"]
+        try:
+            while True:
+                batch = await asyncio.to_thread(
+                    self.store.next_batch, job["id"], index, job["batch_size"]
+                )
+                if not batch:
+                    break
+                results = await self._segment(job, batch)
+                saved = await asyncio.to_thread(
+                    self.store.save_batch, job["id"], self.owner, batch, results
+                )
+                if not saved:
+                    return
+                for _, _, text in batch:
+                    metrics.observe_input(job["method"], job["language"], len(text))
+                index = batch[-1][0] + 1
+            status, error = "done", None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            status, error = "failed", f"{type(e).__name__}: {e}"
+
+        if await asyncio.to_thread(self.store.finish, job["id"], self.owner, status, error):
+            metrics.observe_job(status, time.perf_counter() - start)
+
+    async def _segment(self, job: Dict, batch: List[Document]) -> List[Tuple]:
+        """
+        Segment one batch in the executor pools, waiting while they are full.
+
+        A single spaCy or hybrid document is split with split_spans(), which
+        handles documents of any size; several are streamed through
+        split_many(). Baseline documents go through split() or split_many(),
+        so their sentences are whitespace-normalized like those of /segment
+        whatever the batch size.
+
+        Returns:
+            (sentences or spans, error) per document
+        """
+        method, language, pipeline = job["method"], job["language"], job["pipeline"]
+        texts = [text for _, _, text in batch]
+        while True:
+            try:
+                if len(texts) > 1:
+                    if method == "baseline":
+                        results = await self.executor.run_baseline(
+                            self.baseline_splitter.split_many, texts, language
+                        )
+                    elif method == "hybrid":
+                        results = await self.executor.run_spacy(
+                            hybrid_split_many, texts, language, job["batch_size"], pipeline
+                        )
+                    else:
+                        results = await self.executor.run_spacy(
+                            spacy_split_many, texts, language, job["batch_size"], pipeline
+                        )
+                    return [(result["sentences"], result["error"]) for result in results]
+
+                if method == "baseline":
+                    sentences = await self.executor.run_baseline(
+                        self.baseline_splitter.split, texts[0], language
+                    )
+                    return [(sentences, None)]
+                if method == "hybrid":
+                    spans, _ = await self.executor.run_spacy(
+                        hybrid_split_spans, texts[0], language, pipeline
+                    )
+                else:
+                    spans = await self.executor.run_spacy(
+                        spacy_split_spans, texts[0], language, pipeline
+                    )
+                return [(spans, None)]
+            except ExecutorSaturated as e:
+                await asyncio.sleep(e.retry_after)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if len(texts) > 1:
+                    raise
+                return [([], str(e))]
@@ -0,0 +1,300 @@
+"""
+Live Segmentation - Incremental Re-segmentation While a Document Is Edited
+
+Editors that re-segment the whole document on every keystroke pay for the
+whole document on every keystroke. The /segment/live WebSocket keeps the
+document on the server instead: the client sends edits (insert or delete at
+an offset), the server re-segments only the paragraphs the edit touched and
+answers with a diff of the sentence list.
+
+LiveDocument holds one connection's document as a list of blocks. A block is
+a paragraph plus the blank line(s) after it, so the blocks concatenate to the
+text and every block boundary lies inside whitespace that contains a blank
+line. Blank lines are always sentence boundaries here (as in the hybrid
+splitter), so each block is segmented on its own and its spans are kept
+relative to the block start. An edit:
+1. Splices the edited blocks; if the edited text no longer ends with a blank
+   line, the following blocks are joined to it until one does (a deleted
+   paragraph break merges two paragraphs)
+2. Splits the result into blocks again (an inserted blank line splits one)
+3. Re-segments just those blocks and shifts the start of every later block
+4. Compares the old and new sentences of the region and reports only the
+   ones that changed. A reset that changes the method, language or pipeline
+   replaces every sentence instead: the same span may read differently
+   under other settings (the baseline normalizes whitespace, spaCy does not)
+
+Offsets are in characters (code points) of the document text. An edit costs
+the size of the paragraphs it touches plus a pass over the block start
+offsets, independent of the document size otherwise.
+
+Diff messages tell the client to replace `delete` sentences at index `start`
+with the `sentences` (and `insert` spans) given; sentences after them move
+by `delta` characters. Documents are limited to SEGMENT_LIVE_MAX_CHARS and
+each server process accepts at most SEGMENT_LIVE_MAX_CONNECTIONS documents,
+so memory stays bounded: about the text size plus 16 bytes per sentence for
+each connection.
+
+Configuration (environment variables):
+    SEGMENT_LIVE_MAX_CHARS        Largest live document in characters
+                                  (default: 8 MB)
+    SEGMENT_LIVE_MAX_CONNECTIONS  Open live documents per server process
+                                  (default: 32)
+"""
+
+import bisect
+import os
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.executor import SegmentationExecutor, hybrid_split_spans_many, spacy_split_spans_many
+from backend.spans import SentenceSpans
+
+max_document_chars = int(os.environ.get("SEGMENT_LIVE_MAX_CHARS", 8 * 1024 * 1024))
+max_connections = int(os.environ.get("SEGMENT_LIVE_MAX_CONNECTIONS", 32))
+
+# A blank line and the whitespace after it, as in the hybrid splitter
+_SEPARATOR = re.compile(r"\n[ \t]*\n\s*")
+_BLANK_LINE = re.compile(r"\n[ \t]*\n")
+
+
+class EditError(ValueError):
+    """An edit does not fit the document."""
+
+
+class DocumentTooLarge(EditError):
+    """An edit would make the document longer than allowed."""
+
+
+class Edit(NamedTuple):
+    """A planned edit: blocks first..last are replaced by `blocks`."""
+    first: int
+    last: int
+    start: int
+    blocks: List[str]
+    delta: int
+    # Report every sentence of the region as changed, not just the diff
+    full: bool = False
+
+
+def split_blocks(text: str) -> List[str]:
+    """
+    Cut text into paragraphs, each with the blank line(s) after it.
+
+    Args:
+        text: Text to cut
+
+    Returns:
+        Blocks that concatenate to text; at least one (possibly empty)
+    """
+    blocks = []
+    start = 0
+    for match in _SEPARATOR.finditer(text):
+        blocks.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text) or not blocks:
+        blocks.append(text[start:])
+    return blocks
+
+
+def _ends_paragraph(text: str) -> bool:
+    """Whether text ends with a blank line (and optional whitespace)."""
+    tail = text[len(text.rstrip()):]
+    return _BLANK_LINE.search(tail) is not None
+
+
+class LiveDocument:
+    """
+    A document under edit, kept as segmented paragraph blocks.
+
+    Edits are planned with plan(), segmented by the caller and applied with
+    apply(); the document only changes in apply(), so a failed segmentation
+    leaves it as it was. Edits must be applied in the order they are planned.
+    """
+
+    def __init__(self, max_chars: int = None):
+        """
+        Initialize an empty document.
+
+        Args:
+            max_chars: Largest allowed document length in characters
+        """
+        self.max_chars = max_document_chars if max_chars is None else max_chars
+        self.blocks: List[str] = [""]
+        self.starts: List[int] = [0]
+        self.spans: List[SentenceSpans] = [SentenceSpans()]
+        self.length = 0
+        self.count = 0
+        self.version = 0
+
+    @property
+    def text(self) -> str:
+        """The whole document text."""
+        return "".join(self.blocks)
+
+    def plan(self, offset: int, delete: int = 0, insert: str = "") -> Edit:
+        """
+        Plan replacing `delete` characters at `offset` with `insert`.
+
+        Args:
+            offset: Character offset of the edit
+            delete: Number of characters removed
+            insert: Text inserted at offset
+
+        Returns:
+            Edit whose `blocks` need segmenting before apply()
+
+        Raises:
+            EditError: If the range is outside the document
+            DocumentTooLarge: If the result would exceed max_chars
+        """
+        if offset < 0 or delete < 0 or offset + delete > self.length:
+            raise EditError(f"Edit at {offset} (+{delete}) is outside the document "
+                            f"of {self.length} characters")
+        delta = len(insert) - delete
+        if self.length + delta > self.max_chars:
+            raise DocumentTooLarge(f"Document would exceed {self.max_chars} characters")
+
+        first = self._block_at(offset)
+        last = self._block_at(offset + delete - 1) if delete else first
+        start = self.starts[first]
+        region = "".join(self.blocks[first:last + 1])
+        local = offset - start
+        region = region[:local] + insert + region[local + delete:]
+
+        # A region that lost its trailing blank line runs into the next block
+        while last + 1 < len(self.blocks) and not _ends_paragraph(region):
+            last += 1
+            region += self.blocks[last]
+        return Edit(first, last, start, split_blocks(region), delta)
+
+    def plan_reset(self, text: str, full: bool = False) -> Edit:
+        """
+        Plan replacing the whole document.
+
+        Args:
+            text: The new document text
+            full: Replace every sentence in the diff, for a reset that
+                changes the segmentation settings
+
+        Raises:
+            DocumentTooLarge: If text is longer than max_chars
+        """
+        if len(text) > self.max_chars:
+            raise DocumentTooLarge(f"Document would exceed {self.max_chars} characters")
+        return Edit(0, len(self.blocks) - 1, 0, split_blocks(text), len(text) - self.length, full)
+
+    def apply(self, edit: Edit, spans: List[SentenceSpans],
+              span_texts: Callable[[str, SentenceSpans], List[str]] = None) -> Dict:
+        """
+        Apply a planned edit with the spans of its new blocks.
+
+        Args:
+            edit: Result of plan() or plan_reset()
+            spans: One SentenceSpans per block in edit.blocks, relative to
+                the block
+            span_texts: Builds sentence strings from a text and its spans
+                (default: SentenceSpans.texts)
+
+        Returns:
+            Diff with "version", "start", "delete", "insert" (spans),
+            "sentences", "delta" and "count"
+        """
+        first_index = sum(len(block_spans) for block_spans in self.spans[:edit.first])
+        old_region = "".join(self.blocks[edit.first:edit.last + 1])
+        old = self._region_spans(edit.first, edit.last)
+        region = "".join(edit.blocks)
+
+        new = []
+        new_starts = []
+        position = 0
+        for block, block_spans in zip(edit.blocks, spans):
+            new_starts.append(edit.start + position)
+            new.extend((position + start, position + end) for start, end in block_spans)
+            position += len(block)
+
+        # Only sentences that changed are reported: the unchanged head keeps
+        # its offsets, the unchanged tail moves by delta
+        def same(old_span, new_span, shift):
+            return old_span[0] + shift == new_span[0] and old_span[1] + shift == new_span[1] and \
+                old_region[old_span[0]:old_span[1]] == region[new_span[0]:new_span[1]]
+
+        head = 0
+        while not edit.full and head < min(len(old), len(new)) and same(old[head], new[head], 0):
+            head += 1
+        tail = 0
+        while not edit.full and tail < min(len(old), len(new)) - head and \
+                same(old[-1 - tail], new[-1 - tail], edit.delta):
+            tail += 1
+        changed = SentenceSpans()
+        for start, end in new[head:len(new) - tail]:
+            changed.append(start, end)
+        texts = span_texts(region, changed) if span_texts else changed.texts(region)
+
+        self.blocks[edit.first:edit.last + 1] = edit.blocks
+        self.spans[edit.first:edit.last + 1] = spans
+        self.starts[edit.first:] = new_starts + [start + edit.delta
+                                                 for start in self.starts[edit.last + 1:]]
+        self.length += edit.delta
+        self.count += len(new) - len(old)
+        self.version += 1
+
+        return {
+            "type": "diff",
+            "version": self.version,
+            "start": first_index + head,
+            "delete": len(old) - head - tail,
+            "insert": [[edit.start + start, edit.start + end] for start, end in changed],
+            "sentences": texts,
+            "delta": edit.delta,
+            "count": self.count,
+        }
+
+    def _block_at(self, offset: int) -> int:
+        """Index of the block containing offset (the last block for the end)."""
+        return max(bisect.bisect_right(self.starts, offset) - 1, 0)
+
+    def _region_spans(self, first: int, last: int) -> List[tuple]:
+        """Sentence offsets of blocks first..last, relative to block first."""
+        spans = []
+        base = self.starts[first]
+        for index in range(first, last + 1):
+            start = self.starts[index] - base
+            spans.extend((start + s, start + e) for s, e in self.spans[index])
+        return spans
+
+
+def _baseline_spans_many(splitter: BaselineSentenceSplitter, texts: List[str],
+                         language: str) -> List[SentenceSpans]:
+    """Segment several blocks with the baseline splitter."""
+    return [splitter.split_spans(text, language) for text in texts]
+
+
+async def segment_blocks(executor: SegmentationExecutor, baseline_splitter: BaselineSentenceSplitter,
+                         method: str, language: str, profile: Optional[str],
+                         blocks: List[str]) -> List[SentenceSpans]:
+    """
+    Segment the blocks of an edit in the executor pools.
+
+    spaCy and hybrid blocks go through nlp.pipe together.
+
+    Args:
+        executor: Executor layer
+        baseline_splitter: Splitter for method="baseline"
+        method: "baseline", "spacy" or "hybrid"
+        language: Language code (en, fr, de, es)
+        profile: Resolved spaCy pipeline profile
+        blocks: Block texts
+
+    Returns:
+        One SentenceSpans per block, relative to the block
+
+    Raises:
+        ExecutorSaturated: If the pool has too many pending tasks
+    """
+    if method == "baseline":
+        return await executor.run_baseline(_baseline_spans_many, baseline_splitter, blocks, language)
+    if method == "hybrid":
+        results = await executor.run_spacy(hybrid_split_spans_many, blocks, language, profile)
+        return [spans for spans, _ in results]
+    return await executor.run_spacy(spacy_split_spans_many, blocks, language, profile)
@@ -4,18 +4,26 @@ FastAPI Backend for Sentence Segmentation Tool
 This module implements a REST API for sentence segmentation using:
 1. Baseline: Rule-based regex sentence splitter
 2. Proposed: spaCy-based NLP sentence segmentation
+3. Hybrid: baseline rules, with spaCy only around ambiguous boundaries
 
 Supports English (mandatory) and multilingual extension (French, German, Spanish).
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Type
+import asyncio
+import json
 import sys
 import os
+import time
 
 # Add parent directory to path for imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -24,11 +32,36 @@ if parent_dir not in sys.path:
 
 from backend.baseline_splitter import BaselineSentenceSplitter
 from backend.spacy_splitter import SpacySentenceSplitter
+from backend.startup import ModelLoader
+from backend.hybrid_splitter import HybridSentenceSplitter
+from backend.cache import ResultCache
+from backend import compression, encoding, jobs, live, metrics
+from backend.batching import RequestCoalescer
+from backend.profiling import RequestProfiler, call_with_profile, format_breakdown
+from backend.streaming import SentenceStream, decode_chunks
+from backend.executor import (
+    ExecutorSaturated, SegmentationExecutor, hybrid_profile_spans, hybrid_split_many,
+    hybrid_split_spans, spacy_profile_spans, spacy_split_many, spacy_split_spans,
+    spacy_split_spans_profiled
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load models in background mode and run jobs; stop both on shutdown."""
+    model_loader.start()
+    job_runner.start()
+    yield
+    await job_runner.stop()
+    executor.shutdown()
+    spacy_splitter.shutdown()
+
 
 app = FastAPI(
     title="Sentence Segmentation API",
     description="A web-based sentence segmentation tool using NLP",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend
@@ -40,29 +73,224 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/zstd request bodies are inflated while they arrive; large responses
+# are gzip-compressed for clients that accept it
+app.add_middleware(compression.RequestDecompressionMiddleware)
+if compression.gzip_min_size > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=compression.gzip_min_size,
+                       compresslevel=compression.gzip_level)
+
 # Serve static files from the 'frontend/' directory
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
 
 # Initialize splitters
 baseline_splitter = BaselineSentenceSplitter()
-spacy_splitter = SpacySentenceSplitter()
+spacy_splitter = SpacySentenceSplitter(preload=())
+
+# Preloaded models are loaded and warmed up here, or in a background thread
+# once the server runs (SEGMENT_STARTUP_MODE=background)
+model_loader = ModelLoader(spacy_splitter)
+if model_loader.mode == "eager":
+    model_loader.load()
+
+# Blocking segmentation runs in thread/process pools, never on the event loop
+executor = SegmentationExecutor(spacy_splitter)
+
+# Concurrent small spaCy/hybrid requests share one nlp.pipe batch
+coalescer = RequestCoalescer(executor)
+
+# Open /segment/live documents in this process
+live_connections = 0
+
+# Background jobs for documents too large to wait for, queued in SQLite
+job_store = jobs.JobStore()
+job_runner = jobs.JobRunner(job_store, executor, baseline_splitter, model_loader=model_loader)
+
+# Serialized /segment responses keyed by input text and model version
+result_cache = ResultCache()
+
+# Admin-gated timing breakdowns and sampled cProfile dumps
+request_profiler = RequestProfiler()
+
+SUPPORTED_LANGUAGES = ["en", "fr", "de", "es"]
+SUPPORTED_METHODS = ["baseline", "spacy", "hybrid"]
 
 
 class SegmentationRequest(BaseModel):
     """Request model for sentence segmentation"""
     text: str
     language: str = "en"
-    method: str = "spacy"  # "baseline" or "spacy"
+    method: str = "spacy"  # "baseline", "spacy" or "hybrid"
+    output: str = "sentences"  # "sentences" or "spans"
+    pipeline: Optional[str] = None  # spaCy pipeline profile, None for the server default
+    profile: bool = False  # timing breakdown, requires the X-Admin-Token header
 
 
 class SegmentationResponse(BaseModel):
-    """Response model containing segmented sentences"""
+    """
+    Response model containing segmented sentences.
+    
+    With output="spans" only `spans` is returned: [start, end] character
+    offsets into the request text, for clients that already hold the text.
+    `profile` is only present for profiled requests, `spacy_fraction` (share
+    of characters sent to the spaCy model) only for method="hybrid".
+    """
+    sentences: Optional[List[str]] = None
+    spans: Optional[List[List[int]]] = None
+    method: str
+    language: str
+    pipeline: Optional[str] = None
+    count: int
+    spacy_fraction: Optional[float] = None
+    profile: Optional[dict] = None
+
+
+class BatchSegmentationRequest(BaseModel):
+    """Request model for segmenting many documents in one call"""
+    texts: List[str]
+    language: str = "en"
+    method: str = "spacy"  # "baseline", "spacy" or "hybrid"
+    pipeline: Optional[str] = None  # spaCy pipeline profile, None for the server default
+    batch_size: int = 64
+
+
+class JobRequest(BaseModel):
+    """Request model for submitting a segmentation job: one text or many"""
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
+    language: str = "en"
+    method: str = "spacy"  # "baseline", "spacy" or "hybrid"
+    pipeline: Optional[str] = None  # spaCy pipeline profile, None for the server default
+    batch_size: int = 64
+
+
+class LiveMessage(BaseModel):
+    """Client message on /segment/live: a reset, insert, delete or replace"""
+    type: str
+    text: str = ""  # reset: the whole document; insert/replace: the inserted text
+    offset: int = 0  # insert/delete/replace: character offset of the edit
+    length: int = 0  # delete/replace: number of characters removed
+    language: Optional[str] = None  # reset only, None keeps the current setting
+    method: Optional[str] = None  # reset only
+    pipeline: Optional[str] = None  # reset only
+
+
+class BatchItemResult(BaseModel):
+    """Segmentation result for one document of a batch"""
     sentences: List[str]
+    count: int
+    error: Optional[str] = None
+    spacy_fraction: Optional[float] = None  # method="hybrid" only
+
+
+class BatchSegmentationResponse(BaseModel):
+    """Response model for batch segmentation, results in input order"""
+    results: List[BatchItemResult]
     method: str
     language: str
+    pipeline: Optional[str] = None
     count: int
 
 
+def validate_language_and_method(language: str, method: str):
+    """
+    Check that a language/method combination is supported.
+    
+    Args:
+        language: Requested language code
+        method: Requested segmentation method
+        
+    Raises:
+        HTTPException: 400 if the combination is not supported
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Language '{language}' not supported. Supported: {SUPPORTED_LANGUAGES}"
+        )
+    
+    if method not in SUPPORTED_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Method '{method}' not supported. Use 'baseline', 'spacy' or 'hybrid'"
+        )
+
+
+def resolve_pipeline(method: str, pipeline: Optional[str]) -> Optional[str]:
+    """
+    Resolve the spaCy pipeline profile for a request.
+    
+    Args:
+        method: Segmentation method
+        pipeline: Requested profile, or None for the server default
+        
+    Returns:
+        Profile name for spaCy and hybrid requests, None for the baseline method
+        
+    Raises:
+        HTTPException: 400 if the profile is not supported, 503 while the
+            models are still loading
+    """
+    if method == "baseline":
+        return None
+    if not model_loader.ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"spaCy models are not ready ({model_loader.status})",
+            headers={"Retry-After": "1"}
+        )
+    try:
+        return spacy_splitter.resolve_profile(pipeline)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def saturated_error(error: ExecutorSaturated) -> HTTPException:
+    """
+    Build the 503 response for a saturated executor pool.
+    
+    Args:
+        error: ExecutorSaturated raised by the executor layer
+        
+    Returns:
+        HTTPException with a Retry-After header
+    """
+    return HTTPException(
+        status_code=503,
+        detail=f"Server busy: {error}",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def segment_profiled(request: SegmentationRequest, pipeline: Optional[str]):
+    """
+    Segment a request with the splitter's profile_spans() for a timing breakdown.
+    
+    Args:
+        request: Validated segmentation request with profile=True
+        pipeline: Resolved spaCy pipeline profile
+        
+    Returns:
+        (spans, profile) where profile is the response's "profile" field
+    """
+    dump_path = request_profiler.dump_path(request.method, request.language)
+    start = time.perf_counter()
+    if request.method == "baseline":
+        spans, breakdown = await executor.run_baseline(
+            call_with_profile, baseline_splitter.profile_spans,
+            (request.text, request.language), dump_path
+        )
+    elif request.method == "hybrid":
+        spans, breakdown = await executor.run_spacy(
+            hybrid_profile_spans, request.text, request.language, pipeline, dump_path
+        )
+    else:
+        spans, breakdown = await executor.run_spacy(
+            spacy_profile_spans, request.text, request.language, pipeline, dump_path
+        )
+    return spans, format_breakdown(breakdown, time.perf_counter() - start, dump_path)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the frontend HTML"""
@@ -73,13 +301,109 @@ async def root():
         return "<h1>Frontend not found. Please ensure frontend/index.html exists.</h1>"
 
 
-@app.post("/segment", response_model=SegmentationResponse)
-async def segment_sentences(request: SegmentationRequest):
+def validation_error(error: ValidationError) -> RequestValidationError:
+    """
+    Convert a body validation error into FastAPI's 422 error.
+    
+    The errors leave out "input": for invalid JSON it is the whole body.
+    """
+    return RequestValidationError([
+        dict(item, loc=("body", *item["loc"]))
+        for item in error.errors(include_url=False, include_input=False)
+    ])
+
+
+async def parse_body(http_request: Request, model: Type[BaseModel]) -> BaseModel:
     """
-    Segment input text into sentences using either baseline or spaCy method.
+    Parse a request body that is either model JSON or a plain-text document.
+    
+    A text/plain body becomes the model's `text` field; the other fields come
+    from query parameters (?language=fr&method=baseline). The body is read
+    chunk by chunk into one buffer, so no second copy of a large document is
+    made before validation.
     
     Args:
-        request: SegmentationRequest containing text, language, and method
+        http_request: Incoming request
+        model: Pydantic model of the request
+        
+    Returns:
+        The validated model
+        
+    Raises:
+        HTTPException: If a text/plain body cannot be decoded
+        RequestValidationError: If the JSON or parameters are invalid (422)
+    """
+    content_type = http_request.headers.get("content-type", "")
+    media_type, _, parameters = content_type.partition(";")
+    
+    body = bytearray()
+    async for chunk in http_request.stream():
+        body += chunk
+    
+    try:
+        if media_type.strip().lower() == "text/plain":
+            charset = "utf-8"
+            for parameter in parameters.split(";"):
+                name, _, value = parameter.partition("=")
+                if name.strip().lower() == "charset" and value.strip():
+                    charset = value.strip().strip('"')
+            try:
+                text = body.decode(charset)
+            except (LookupError, UnicodeDecodeError) as e:
+                raise HTTPException(status_code=400, detail=f"Cannot decode text/plain body: {e}")
+            del body
+            return model.model_validate(dict(http_request.query_params, text=text))
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise validation_error(e)
+
+
+async def read_segmentation_request(http_request: Request) -> SegmentationRequest:
+    """Parse a /segment body: SegmentationRequest JSON or a plain-text document."""
+    return await parse_body(http_request, SegmentationRequest)
+
+
+def parse_duration(http_request: Request, handler_start: float) -> float:
+    """
+    Time between the request arriving and the handler starting.
+    
+    This covers reading the body, JSON parsing and model validation.
+    
+    Args:
+        http_request: Incoming request, stamped by MetricsMiddleware
+        handler_start: perf_counter() value at the start of the handler
+        
+    Returns:
+        Seconds, or 0.0 if the request was not stamped
+    """
+    start = getattr(http_request.state, "metrics_start", None)
+    return handler_start - start if start is not None else 0.0
+
+
+@app.post("/segment", response_model=SegmentationResponse, response_model_exclude_none=True,
+          openapi_extra={"requestBody": {"required": True, "content": {
+              "application/json": {"schema": SegmentationRequest.model_json_schema()},
+              "text/plain": {"schema": {"type": "string"}},
+          }}})
+async def segment_sentences(http_request: Request,
+                            request: SegmentationRequest = Depends(read_segmentation_request)):
+    """
+    Segment input text into sentences using the baseline, spaCy or hybrid method.
+    
+    The body is SegmentationRequest JSON, or the raw document as text/plain
+    with the other fields as query parameters. Either may be sent gzip or
+    zstd compressed (Content-Encoding, see backend/compression.py).
+    
+    With "profile": true and a valid X-Admin-Token header the response also
+    contains a per-phase timing breakdown (never cached).
+    
+    The Accept header selects the encoding: JSON (default), MessagePack or
+    the binary sentence offsets format, which implies output="spans" (see
+    backend/encoding.py).
+    
+    Args:
+        request: SegmentationRequest containing text, language, method and output
+        http_request: The raw request, used for stage timing
         
     Returns:
         SegmentationResponse with segmented sentences and metadata
@@ -87,52 +411,623 @@ async def segment_sentences(request: SegmentationRequest):
     Raises:
         HTTPException: If language is not supported or segmentation fails
     """
+    handler_start = time.perf_counter()
     try:
-        # Validate language
-        supported_languages = ["en", "fr", "de", "es"]
-        if request.language not in supported_languages:
+        validate_language_and_method(request.language, request.method)
+        pipeline = resolve_pipeline(request.method, request.pipeline)
+        
+        # Validate output mode
+        if request.output not in ("sentences", "spans"):
             raise HTTPException(
                 status_code=400,
-                detail=f"Language '{request.language}' not supported. Supported: {supported_languages}"
+                detail=f"Output '{request.output}' not supported. Use 'sentences' or 'spans'"
             )
         
-        # Select segmentation method
-        if request.method == "baseline":
-            # Baseline only supports English
-            if request.language != "en":
-                raise HTTPException(
-                    status_code=400,
-                    detail="Baseline method only supports English. Use 'spacy' for multilingual support."
+        try:
+            media_type = encoding.negotiate(http_request.headers.get("accept"))
+        except ValueError as e:
+            raise HTTPException(status_code=406, detail=str(e))
+        output = "spans" if media_type == encoding.OFFSETS else request.output
+        
+        if request.profile and not request_profiler.is_authorized(
+                http_request.headers.get("X-Admin-Token")):
+            raise HTTPException(status_code=403,
+                                detail="Profiling requires a valid X-Admin-Token header")
+        
+        # Identical requests against the same model version are served from
+        # the result cache
+        cache_key = None
+        if result_cache.enabled and not request.profile:
+            if request.method == "spacy":
+                model_version = spacy_splitter.model_version(request.language, pipeline)
+            elif request.method == "hybrid":
+                model_version = (
+                    f"hybrid-{HybridSentenceSplitter.version}-baseline-{baseline_splitter.version}/"
+                    f"{spacy_splitter.model_version(request.language, pipeline)}"
+                )
+            else:
+                model_version = f"baseline-{baseline_splitter.version}"
+            cache_key = result_cache.make_key(
+                request.text, request.language, request.method, model_version, output, media_type
+            )
+            if result_cache.disk_enabled:
+                cached = await asyncio.to_thread(result_cache.get, cache_key)
+            else:
+                cached = result_cache.get(cache_key)
+            if cached is not None:
+                metrics.observe_stages(request.method, request.language, {
+                    "parse": parse_duration(http_request, handler_start),
+                    "lookup": time.perf_counter() - handler_start,
+                })
+                return Response(content=cached, media_type=media_type, headers={"Vary": "Accept"})
+        
+        lookup_end = time.perf_counter()
+        
+        # One in N ordinary requests is run under cProfile (off by default)
+        sample_dump = None
+        if request_profiler.should_sample():
+            sample_dump = request_profiler.dump_path(request.method, request.language)
+        
+        # Segment in the executor pools; splitters already return stripped,
+        # non-empty sentences
+        profile = None
+        spacy_fraction = None
+        if request.profile:
+            spans, profile = await segment_profiled(request, pipeline)
+            if output == "sentences":
+                if request.method == "baseline":
+                    sentences = baseline_splitter.span_texts(request.text, spans)
+                else:
+                    sentences = spans.texts(request.text)
+        elif request.method == "baseline":
+            split = baseline_splitter.split_spans if output == "spans" else baseline_splitter.split
+            if sample_dump:
+                result = await executor.run_baseline(
+                    call_with_profile, split, (request.text, request.language), sample_dump
                 )
-            sentences = baseline_splitter.split(request.text)
-        elif request.method == "spacy":
-            sentences = spacy_splitter.split(request.text, request.language)
+            else:
+                result = await executor.run_baseline(split, request.text, request.language)
+            if output == "spans":
+                spans = result
+            else:
+                sentences = result
+        elif request.method == "hybrid":
+            if not sample_dump and coalescer.accepts(request.text):
+                spans, spacy_fraction = await coalescer.split_spans(
+                    "hybrid", request.text, request.language, pipeline
+                )
+            else:
+                spans, spacy_fraction = await executor.run_spacy(
+                    hybrid_split_spans, request.text, request.language, pipeline, sample_dump
+                )
+            if output == "sentences":
+                sentences = spans.texts(request.text)
         else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Method '{request.method}' not supported. Use 'baseline' or 'spacy'"
+            if sample_dump:
+                spans = await executor.run_spacy(
+                    spacy_split_spans_profiled, request.text, request.language, pipeline, sample_dump
+                )
+            elif coalescer.accepts(request.text):
+                spans, _ = await coalescer.split_spans(
+                    "spacy", request.text, request.language, pipeline
+                )
+            else:
+                spans = await executor.run_spacy(
+                    spacy_split_spans, request.text, request.language, pipeline
+                )
+            if output == "sentences":
+                sentences = spans.texts(request.text)
+        
+        segment_end = time.perf_counter()
+        
+        # SegmentationResponse fields, serialized without building the
+        # pydantic model: validating every sentence string is pure overhead
+        items = spans if output == "spans" else sentences
+        fields = {
+            output: items,
+            "method": request.method,
+            "language": request.language,
+            "pipeline": pipeline,
+            "count": len(items),
+            "spacy_fraction": spacy_fraction,
+            "profile": profile,
+        }
+        body = encoding.encode_response(media_type, fields)
+        if cache_key is not None:
+            if result_cache.disk_enabled:
+                await asyncio.to_thread(result_cache.put, cache_key, body)
+            else:
+                result_cache.put(cache_key, body)
+        
+        metrics.observe_stages(request.method, request.language, {
+            "parse": parse_duration(http_request, handler_start),
+            "lookup": lookup_end - handler_start,
+            "segment": segment_end - lookup_end,
+            "serialize": time.perf_counter() - segment_end,
+        })
+        metrics.observe_input(request.method, request.language, len(request.text))
+        return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+    
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise saturated_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Segmentation error: {str(e)}")
+
+
+@app.post("/segment/batch", response_model=BatchSegmentationResponse, response_model_exclude_none=True)
+async def segment_batch(request: BatchSegmentationRequest, http_request: Request):
+    """
+    Segment many documents in one request.
+    
+    spaCy documents are streamed through nlp.pipe, which is much faster than
+    one /segment call per document for short texts. A document that fails
+    gets an error in its own result; the rest of the batch still succeeds.
+    
+    Args:
+        request: BatchSegmentationRequest containing texts, language and method
+        http_request: The raw request, used for stage timing
+        
+    Returns:
+        BatchSegmentationResponse with one result per input text, in order
+        
+    Raises:
+        HTTPException: If language/method is not supported or the batch fails
+    """
+    handler_start = time.perf_counter()
+    try:
+        validate_language_and_method(request.language, request.method)
+        pipeline = resolve_pipeline(request.method, request.pipeline)
+        
+        if request.batch_size < 1:
+            raise HTTPException(status_code=400, detail="batch_size must be at least 1")
+        
+        lookup_end = time.perf_counter()
+        if request.method == "baseline":
+            results = await executor.run_baseline(
+                baseline_splitter.split_many, request.texts, request.language
+            )
+        elif request.method == "hybrid":
+            results = await executor.run_spacy(
+                hybrid_split_many, request.texts, request.language, request.batch_size, pipeline
+            )
+        else:
+            results = await executor.run_spacy(
+                spacy_split_many, request.texts, request.language, request.batch_size, pipeline
             )
         
-        # Filter out empty sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
+        metrics.observe_stages(request.method, request.language, {
+            "parse": parse_duration(http_request, handler_start),
+            "lookup": lookup_end - handler_start,
+            "segment": time.perf_counter() - lookup_end,
+        })
+        for text in request.texts:
+            metrics.observe_input(request.method, request.language, len(text))
         
-        return SegmentationResponse(
-            sentences=sentences,
+        return BatchSegmentationResponse(
+            results=[
+                BatchItemResult(
+                    sentences=result["sentences"],
+                    count=len(result["sentences"]),
+                    error=result["error"],
+                    spacy_fraction=result.get("spacy_fraction")
+                )
+                for result in results
+            ],
             method=request.method,
             language=request.language,
-            count=len(sentences)
+            pipeline=pipeline,
+            count=len(results)
         )
     
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise saturated_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Segmentation error: {str(e)}")
 
 
+class BodyFirstStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for handlers that are still reading the request body.
+    
+    Under ASGI spec versions before 2.4 Starlette watches for client
+    disconnects by calling receive() while the response streams, which would
+    swallow body chunks the handler has not read yet. The watcher is held
+    back until `body_done` is set. `on_close` is called once the response
+    is over, even if its content was never iterated.
+    """
+    
+    def __init__(self, content, body_done: asyncio.Event, on_close=None, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_done = body_done
+        self.on_close = on_close
+    
+    async def __call__(self, scope, receive, send):
+        async def receive_after_body():
+            await self.body_done.wait()
+            return await receive()
+        
+        try:
+            await super().__call__(scope, receive_after_body, send)
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+
+
+@app.post("/segment/stream")
+async def segment_stream(request: Request, language: str = "en", method: str = "spacy",
+                         pipeline: Optional[str] = None):
+    """
+    Segment an arbitrarily large plain-text body as it is uploaded.
+    
+    The request body is raw UTF-8 text (chunked transfer encoding works) and
+    is never buffered as a whole. Sentences are returned incrementally as
+    newline-delimited JSON, one {"index": n, "sentence": "..."} per line.
+    Each stream holds a thread of the executor's stream pool until it ends;
+    when all are taken the request is refused with 503 before any output.
+    
+    Args:
+        request: Incoming request whose body is the document text
+        language: Language code (en, fr, de, es)
+        method: "baseline" or "spacy" ("hybrid" is not available here)
+        pipeline: spaCy pipeline profile, None for the server default
+        
+    Returns:
+        StreamingResponse with application/x-ndjson content
+        
+    Raises:
+        HTTPException: If language/method/pipeline is not supported, or 503
+            if too many streams are running
+    """
+    validate_language_and_method(language, method)
+    if method == "hybrid":
+        raise HTTPException(
+            status_code=400,
+            detail="Method 'hybrid' is not available for streaming. Use 'baseline' or 'spacy'"
+        )
+    pipeline = resolve_pipeline(method, pipeline)
+    
+    if method == "baseline":
+        segment = partial(baseline_splitter.iter_sentences, language=language)
+    else:
+        segment = partial(spacy_splitter.iter_sentences, language=language, profile=pipeline)
+    
+    stream = SentenceStream(segment)
+    try:
+        executor.start_stream(stream.run)
+    except ExecutorSaturated as e:
+        raise saturated_error(e)
+    
+    body_done = asyncio.Event()
+    
+    async def body_chunks():
+        try:
+            async for data in request.stream():
+                yield data
+        finally:
+            body_done.set()
+    
+    async def ndjson_lines():
+        index = 0
+        async for batch in stream.sentences(decode_chunks(body_chunks())):
+            lines = []
+            for sentence in batch:
+                lines.append(json.dumps({"index": index, "sentence": sentence}, ensure_ascii=False))
+                index += 1
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    
+    return BodyFirstStreamingResponse(ndjson_lines(), body_done, on_close=stream.cancel,
+                                      media_type="application/x-ndjson")
+
+
+def live_error(status: int, detail: str, document: live.LiveDocument, **extra) -> dict:
+    """Error message for a /segment/live client; the document is unchanged."""
+    return dict({"type": "error", "status": status, "detail": detail,
+                 "version": document.version, "length": document.length}, **extra)
+
+
+@app.websocket("/segment/live")
+async def segment_live(websocket: WebSocket):
+    """
+    Segment a document incrementally while it is being edited.
+    
+    The client sends JSON text messages:
+        {"type": "reset", "text": ..., "language": "en", "method": "spacy",
+         "pipeline": null}                       replace the whole document
+        {"type": "insert", "offset": n, "text": ...}
+        {"type": "delete", "offset": n, "length": m}
+        {"type": "replace", "offset": n, "length": m, "text": ...}
+    Offsets count characters (code points). Only the paragraphs an edit
+    touches are segmented again (see backend/live.py). Every message is
+    answered in order with a diff:
+        {"type": "diff", "version": v, "start": i, "delete": d,
+         "insert": [[start, end], ...], "sentences": [...], "delta": k,
+         "count": total, "elapsed_ms": ms}
+    meaning: replace `delete` sentences at index `start` with `sentences`
+    (at the `insert` offsets); later sentences move by `delta` characters.
+    Or with {"type": "error", "status": ..., "detail": ...}, after which the
+    document is as it was before the message; on status 409 the client's
+    copy has diverged and it should send a reset.
+    
+    Args:
+        websocket: The client connection
+    """
+    global live_connections
+    await websocket.accept()
+    if live_connections >= live.max_connections:
+        await websocket.close(code=1013, reason="Too many live documents, try again later")
+        return
+    
+    live_connections += 1
+    document = live.LiveDocument()
+    language, method, requested_pipeline = "en", "spacy", None
+    try:
+        while True:
+            data = await websocket.receive_text()
+            start = time.perf_counter()
+            try:
+                message = LiveMessage.model_validate_json(data)
+                if message.type == "reset":
+                    settings = (message.language or language, message.method or method,
+                                message.pipeline)
+                    validate_language_and_method(settings[0], settings[1])
+                    edit = document.plan_reset(
+                        message.text, full=settings != (language, method, requested_pipeline)
+                    )
+                elif message.type in ("insert", "delete", "replace"):
+                    settings = (language, method, requested_pipeline)
+                    edit = document.plan(
+                        message.offset,
+                        0 if message.type == "insert" else message.length,
+                        "" if message.type == "delete" else message.text
+                    )
+                else:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Message type '{message.type}' not supported. "
+                               f"Use 'reset', 'insert', 'delete' or 'replace'"
+                    )
+                
+                pipeline = resolve_pipeline(settings[1], settings[2])
+                spans = await live.segment_blocks(
+                    executor, baseline_splitter, settings[1], settings[0], pipeline, edit.blocks
+                )
+                span_texts = baseline_splitter.span_texts if settings[1] == "baseline" else None
+                reply = document.apply(edit, spans, span_texts)
+                reply["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                language, method, requested_pipeline = settings
+            except ValidationError as e:
+                reply = live_error(422, str(e), document)
+            except live.DocumentTooLarge as e:
+                reply = live_error(413, str(e), document)
+            except live.EditError as e:
+                reply = live_error(409, str(e), document)
+            except HTTPException as e:
+                reply = live_error(e.status_code, e.detail, document)
+            except ExecutorSaturated as e:
+                reply = live_error(503, f"Server busy: {e}", document, retry_after=e.retry_after)
+            except Exception as e:
+                reply = live_error(500, f"Segmentation error: {str(e)}", document)
+            await websocket.send_text(json.dumps(reply, ensure_ascii=False))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_connections -= 1
+
+
+def job_response(job: dict, status_code: int = 200) -> JSONResponse:
+    """Render a job with the URLs of its results."""
+    content = dict(job, results=f"/jobs/{job['id']}/results", download=f"/jobs/{job['id']}/download")
+    return JSONResponse(status_code=status_code, content=content)
+
+
+async def get_job_or_404(job_id: str) -> dict:
+    """Look up a job, raising 404 if it does not exist (or has expired)."""
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@app.post("/jobs", status_code=202, openapi_extra={"requestBody": {"required": True, "content": {
+    "application/json": {"schema": JobRequest.model_json_schema()},
+    "text/plain": {"schema": {"type": "string"}},
+    "multipart/form-data": {"schema": {"type": "object", "properties": {
+        "file": {"type": "array", "items": {"type": "string", "format": "binary"}},
+        "language": {"type": "string"}, "method": {"type": "string"},
+        "pipeline": {"type": "string"}, "batch_size": {"type": "integer"},
+    }}},
+}}})
+async def submit_job(http_request: Request):
+    """
+    Queue documents for background segmentation and return the job at once.
+    
+    The body is JobRequest JSON ("text" or "texts"), a plain-text document
+    with the settings as query parameters, or a multipart form with one or
+    more `file` uploads (*.txt: one document, *.jsonl: one
+    {"id": ..., "text": ...} per line) and the settings as form fields.
+    Poll GET /jobs/{id} for progress.
+    
+    Args:
+        http_request: Incoming request
+        
+    Returns:
+        202 with the queued job and a Location header
+        
+    Raises:
+        HTTPException: 400 for invalid input, 503 if the queue is full
+    """
+    content_type = http_request.headers.get("content-type", "")
+    if content_type.lower().startswith("multipart/form-data"):
+        form = await http_request.form()
+        settings = {name: value for name, value in form.multi_items() if isinstance(value, str)}
+        documents = []
+        for upload in form.getlist("file"):
+            if isinstance(upload, str):
+                continue
+            try:
+                documents.extend(jobs.documents_from_upload(upload.filename or "upload.txt",
+                                                            await upload.read()))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        try:
+            request = JobRequest.model_validate(settings)
+        except ValidationError as e:
+            raise validation_error(e)
+    else:
+        request = await parse_body(http_request, JobRequest)
+        if request.texts is not None:
+            documents = [(str(index), text) for index, text in enumerate(request.texts)]
+        elif request.text is not None:
+            documents = [("0", request.text)]
+        else:
+            documents = []
+    
+    validate_language_and_method(request.language, request.method)
+    pipeline = None
+    if request.method != "baseline":
+        try:
+            pipeline = spacy_splitter.resolve_profile(request.pipeline)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if request.batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be at least 1")
+    if not documents:
+        raise HTTPException(status_code=400,
+                            detail="No documents: send 'text', 'texts' or a file upload")
+    
+    try:
+        job = await asyncio.to_thread(job_store.submit, documents, request.method,
+                                      request.language, pipeline, request.batch_size)
+    except jobs.QueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {e}",
+                            headers={"Retry-After": str(executor.spacy_pool.retry_after)})
+    job_runner.notify()
+    
+    response = job_response(job, status_code=202)
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return response
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status and progress of a job.
+    
+    status is "queued", "running", "done" or "failed"; progress is the share
+    of characters segmented so far (0-1).
+    """
+    return job_response(await get_job_or_404(job_id))
+
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(job_id: str, offset: int = 0, limit: int = 1000):
+    """
+    One page of a job's sentences, numbered across all of its documents.
+    
+    Sentences of finished batches can be read while the job is still
+    running. next_offset is null once the job is finished and all sentences
+    have been returned.
+    
+    Args:
+        job_id: Job id
+        offset: Index of the first sentence
+        limit: Sentences per page (1-10000)
+    """
+    if offset < 0 or not 1 <= limit <= 10000:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit 1-10000")
+    job = await get_job_or_404(job_id)
+    items = await asyncio.to_thread(job_store.results_page, job_id, offset, limit)
+    end = offset + len(items)
+    more = end < job["sentences"] or job["status"] in ("queued", "running")
+    return {
+        "id": job_id,
+        "status": job["status"],
+        "offset": offset,
+        "count": len(items),
+        "total": job["sentences"],
+        "next_offset": end if more else None,
+        "items": items,
+    }
+
+
+@app.get("/jobs/{job_id}/download")
+async def download_job_results(job_id: str):
+    """
+    All results of a finished job as newline-delimited JSON, one line per
+    document: {"document": 0, "id": "...", "count": n, "sentences": [...]}.
+    
+    Raises:
+        HTTPException: 404 for unknown jobs, 409 while the job is not done
+    """
+    job = await get_job_or_404(job_id)
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, not done")
+    return StreamingResponse(
+        job_store.iter_download(job_id), media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{job_id}.jsonl"'}
+    )
+
+
+@app.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: str):
+    """Cancel a job and delete its documents and results."""
+    if not await asyncio.to_thread(job_store.delete, job_id):
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return Response(status_code=204)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss/eviction counters and sizes"""
+    if result_cache.disk_enabled:
+        return await asyncio.to_thread(result_cache.stats)
+    return result_cache.stats()
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Request, latency, input-size and job queue metrics in Prometheus text format"""
+    if metrics.enabled:
+        metrics.observe_job_queue(await asyncio.to_thread(job_store.queue_stats))
+    return Response(content=metrics.registry.render(),
+                    media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """
+    Liveness check: 200 while the process works, even if models are still loading.
+    
+    status is "healthy", "loading" (SEGMENT_STARTUP_MODE=background) or
+    "failed" (503) if model loading raised an error.
+    """
+    if model_loader.status == "failed":
+        return JSONResponse(status_code=503, content={
+            "status": "failed", "message": f"Model loading failed: {model_loader.error}"
+        })
+    if model_loader.status == "loading":
+        return {"status": "loading", "message": "Sentence Segmentation API is loading models"}
     return {"status": "healthy", "message": "Sentence Segmentation API is running"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 200 once the preloaded models are loaded and warmed up, 503 before"""
+    if not model_loader.ready:
+        return JSONResponse(status_code=503, content=model_loader.describe(),
+                            headers={"Retry-After": "1"})
+    return model_loader.describe()
+
+
+# Count and time every request; added last so all route paths are known
+if metrics.enabled:
+    app.add_middleware(metrics.MetricsMiddleware, endpoints=[route.path for route in app.routes])
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
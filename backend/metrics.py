@@ -0,0 +1,313 @@
+"""
+Metrics - Prometheus Text-Format Instrumentation
+
+Collects request counters, an in-flight gauge and latency/input-size
+histograms, and renders them in the Prometheus text exposition format for
+the /metrics endpoint. No client library is needed; the few metric types
+used here are implemented directly and kept cheap (a lock, a dictionary
+lookup and a bisect per observation).
+
+Four layers record data:
+- MetricsMiddleware (ASGI) counts every request by endpoint and status,
+  tracks requests in flight and times them end to end
+- The /segment handlers record per-stage latency by method and language:
+    parse      body read + JSON parsing + validation (before the handler runs)
+    lookup     request checks, model version and result cache lookup
+    segment    splitter call, including time queued in the executor
+    serialize  building and encoding the response
+- The request coalescer records how many requests each model batch served
+- The job runner records how long jobs take; the queue depth by status is
+  read from the job database on every scrape, so it covers all workers
+
+Configuration (environment variables):
+    SEGMENT_METRICS   "0" disables all instrumentation (default: enabled)
+"""
+
+import bisect
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Input size buckets in characters, 100 B to 50 MB
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000, 50000000)
+
+# Coalesced batch size buckets in requests
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Job duration buckets in seconds, 1 s to 1 h
+JOB_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render {name="value",...}, or an empty string without labels."""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a named metric with a fixed list of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._render_sample(labels, value))
+        return lines
+
+    def _render_sample(self, labels: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type_name = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    type_name = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, plus their sum and count."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        # Per-bucket (non-cumulative) counts; the last slot is +Inf, then sum
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def _render_sample(self, labels: Tuple[str, ...], state) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+        label_text = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{label_text} {_format_value(state[-1])}")
+        lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            The /metrics response body
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Whether instrumentation is active for this process
+enabled = os.environ.get("SEGMENT_METRICS", "1") != "0"
+
+registry = MetricsRegistry()
+
+requests_total = registry.register(Counter(
+    "segment_requests_total", "HTTP requests by endpoint and status code",
+    ("endpoint", "status")
+))
+errors_total = registry.register(Counter(
+    "segment_errors_total", "HTTP requests that ended with a 4xx/5xx status",
+    ("endpoint", "status")
+))
+in_flight = registry.register(Gauge(
+    "segment_requests_in_flight", "HTTP requests currently being processed",
+    ("endpoint",)
+))
+request_duration = registry.register(Histogram(
+    "segment_request_duration_seconds", "End-to-end HTTP request latency",
+    ("endpoint",)
+))
+stage_duration = registry.register(Histogram(
+    "segment_stage_duration_seconds", "Latency of each segmentation stage",
+    ("method", "language", "stage")
+))
+input_chars = registry.register(Histogram(
+    "segment_input_chars", "Size of segmented inputs in characters",
+    ("method", "language"), buckets=SIZE_BUCKETS
+))
+coalesced_batch_size = registry.register(Histogram(
+    "segment_coalesced_batch_size", "Requests served by one coalesced model batch",
+    ("method",), buckets=BATCH_BUCKETS
+))
+
+jobs = registry.register(Gauge(
+    "segment_jobs", "Jobs in the job queue by status, across all server processes",
+    ("status",)
+))
+oldest_queued_job = registry.register(Gauge(
+    "segment_job_oldest_queued_seconds", "Time the oldest queued job has been waiting"
+))
+job_duration = registry.register(Histogram(
+    "segment_job_duration_seconds", "Time from a job's start to its completion",
+    ("status",), buckets=JOB_BUCKETS
+))
+
+
+def observe_stages(method: str, language: str, stages: Dict[str, float]):
+    """
+    Record the durations of several stages of one request.
+
+    Args:
+        method: Segmentation method
+        language: Language code
+        stages: Stage name -> seconds
+    """
+    if enabled:
+        for stage, seconds in stages.items():
+            stage_duration.observe(seconds, method, language, stage)
+
+
+def observe_input(method: str, language: str, chars: int):
+    """Record the size of a segmented input."""
+    if enabled:
+        input_chars.observe(chars, method, language)
+
+
+def observe_batch(method: str, size: int):
+    """Record the number of requests in one coalesced batch."""
+    if enabled:
+        coalesced_batch_size.observe(size, method)
+
+
+def observe_job_queue(stats: Dict):
+    """
+    Record the job queue depth.
+
+    Args:
+        stats: JobStore.queue_stats() result
+    """
+    if enabled:
+        for status, count in stats.items():
+            if status != "oldest_queued_seconds":
+                jobs.set(count, status)
+        oldest_queued_job.set(stats["oldest_queued_seconds"])
+
+
+def observe_job(status: str, seconds: float):
+    """Record a finished job ("done" or "failed") and how long it ran."""
+    if enabled:
+        job_duration.observe(seconds, status)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing every HTTP request.
+
+    Endpoint labels are limited to known route paths (others become
+    "other") so arbitrary URLs cannot create unbounded label sets. The
+    request start time is stored in scope["state"]["metrics_start"] so
+    handlers can measure the parsing stage.
+    """
+
+    def __init__(self, app, endpoints: Iterable[str]):
+        self.app = app
+        self.endpoints = frozenset(endpoints)
+
+    def _endpoint(self, path: str) -> str:
+        if path in self.endpoints:
+            return path
+        if path.startswith("/static/"):
+            return "/static"
+        return "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["metrics_start"] = start
+        endpoint = self._endpoint(scope["path"])
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc(endpoint)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec(endpoint)
+            status_label = str(status)
+            requests_total.inc(endpoint, status_label)
+            if status >= 400:
+                errors_total.inc(endpoint, status_label)
+            request_duration.observe(time.perf_counter() - start, endpoint)
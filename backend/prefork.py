@@ -0,0 +1,258 @@
+"""
+Pre-fork Server - Worker Processes Sharing One Copy of the Models
+
+`uvicorn --workers N` starts N independent interpreters. Each one imports
+backend.main and loads its own spaCy models, so memory grows linearly with
+the number of workers. This launcher imports the app and loads the models
+once in a parent process and then forks the workers, so every page nobody
+writes to stays shared copy-on-write between all of them.
+
+Two details keep those pages shared:
+- gc.freeze() moves every object that exists at fork time into a permanent
+  generation. Without it, the first collection in each worker writes to the
+  GC header of every model object and copies the page it lives on.
+- The listening socket is bound in the parent and inherited, so workers
+  accept from one queue and start serving right after fork.
+
+The parent only supervises:
+- A worker that exits (crashed, or recycled after its request limit) is
+  replaced by a new fork
+- SIGHUP: rolling restart. Every worker is replaced by a fresh fork and the
+  old one finishes its open requests before exiting. Code and models come
+  from the parent, so restart the launcher itself to deploy new versions.
+- SIGTERM / SIGINT: graceful stop. Workers still running after the graceful
+  timeout are killed.
+
+Workers run spaCy in a thread pool by default (SEGMENT_SPACY_EXECUTOR=thread):
+a process pool per worker would duplicate what the workers already provide.
+SPACY_PRELOAD_LANGUAGES defaults to all languages, so no worker loads a
+private copy of a model on first use, and SEGMENT_STARTUP_MODE is always
+"eager" (see backend/startup.py).
+
+Configuration (environment variables):
+    SEGMENT_WORKERS              Worker processes (default: CPU count)
+    SEGMENT_MAX_REQUESTS         Requests after which a worker is recycled,
+                                 0 for never (default: 10000)
+    SEGMENT_MAX_REQUESTS_JITTER  Random extra requests per worker so they do
+                                 not all recycle at once (default: 1000)
+    SEGMENT_GRACEFUL_TIMEOUT     Seconds workers get to finish open requests
+                                 on stop and restart (default: 30)
+"""
+
+import gc
+import os
+import random
+import signal
+import socket
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+# Workers that exit sooner than this after being forked are restarted with
+# a delay, so a worker that cannot start does not turn into a fork loop
+_MIN_WORKER_LIFETIME = 1.0
+
+
+class PreforkServer:
+    """
+    Forks uvicorn workers from a parent that has already loaded the models.
+    """
+
+    def __init__(self, app: str = "backend.main:app", host: str = "0.0.0.0",
+                 port: int = 8000, workers: int = None, max_requests: int = None,
+                 max_requests_jitter: int = None, graceful_timeout: int = None,
+                 log_level: str = "info"):
+        """
+        Initialize the launcher.
+
+        Args:
+            app: Import string of the ASGI application
+            host: Address to bind
+            port: Port to bind
+            workers: Number of worker processes
+            max_requests: Requests after which a worker is replaced, 0 for never
+            max_requests_jitter: Upper bound of the random number of requests
+                added to max_requests for each worker
+            graceful_timeout: Seconds a stopping worker may take to finish its
+                open requests before it is killed
+            log_level: uvicorn log level of the workers
+        """
+        if workers is None:
+            workers = int(os.environ.get("SEGMENT_WORKERS", os.cpu_count() or 1))
+        if max_requests is None:
+            max_requests = int(os.environ.get("SEGMENT_MAX_REQUESTS", 10000))
+        if max_requests_jitter is None:
+            max_requests_jitter = int(os.environ.get("SEGMENT_MAX_REQUESTS_JITTER", 1000))
+        if graceful_timeout is None:
+            graceful_timeout = int(os.environ.get("SEGMENT_GRACEFUL_TIMEOUT", 30))
+        if workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}")
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+
+        # Running workers: pid -> (generation, fork time). A SIGHUP starts a
+        # new generation; workers of older ones are not replaced when they exit.
+        self._workers: Dict[int, Tuple[int, float]] = {}
+        self._generation = 0
+        self._signals: List[int] = []
+
+    def run(self) -> int:
+        """
+        Load the app, fork the workers and supervise them until stopped.
+
+        Returns:
+            Exit status for the launcher process
+        """
+        os.environ.setdefault("SEGMENT_SPACY_EXECUTOR", "thread")
+        os.environ.setdefault("SPACY_PRELOAD_LANGUAGES", "en,fr,de,es")
+        # Models must be loaded before fork to be shared, never in the
+        # background by each worker
+        os.environ["SEGMENT_STARTUP_MODE"] = "eager"
+
+        # Importing backend.main constructs the splitters and loads the models
+        app = import_from_string(self.app)
+        sock = uvicorn.Config(app, host=self.host, port=self.port).bind_socket()
+
+        # Everything allocated so far is shared with the workers; keep the
+        # collector from ever touching (and so copying) it
+        gc.collect()
+        gc.freeze()
+
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._on_signal)
+
+        print(f"✓ Pre-fork server: starting {self.workers} workers "
+              f"(parent pid {os.getpid()})", flush=True)
+        try:
+            for _ in range(self.workers):
+                self._spawn(app, sock)
+            self._supervise(app, sock)
+        finally:
+            self._stop()
+            sock.close()
+        return 0
+
+    def _on_signal(self, signum, frame):
+        # Only record the signal; the supervision loop acts on it
+        self._signals.append(signum)
+
+    def _supervise(self, app, sock: socket.socket):
+        """Replace exited workers and handle signals until asked to stop."""
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum != signal.SIGHUP:
+                    print("✓ Pre-fork server: stopping workers", flush=True)
+                    return
+                self._restart(app, sock)
+
+            for pid, generation, started, code in self._reap():
+                if generation != self._generation:
+                    continue
+                if code == 0:
+                    print(f"✓ Worker {pid} recycled", flush=True)
+                else:
+                    print(f"⚠ Worker {pid} exited with status {code}, replacing it", flush=True)
+                    if time.monotonic() - started < _MIN_WORKER_LIFETIME:
+                        time.sleep(_MIN_WORKER_LIFETIME)
+                self._spawn(app, sock)
+
+            time.sleep(0.1)
+
+    def _restart(self, app, sock: socket.socket):
+        """Replace every worker, forking the new one before stopping the old."""
+        print("✓ Pre-fork server: rolling restart", flush=True)
+        self._generation += 1
+        for pid in list(self._workers):
+            self._spawn(app, sock)
+            self._kill(pid, signal.SIGTERM)
+
+    def _spawn(self, app, sock: socket.socket):
+        """Fork one worker of the current generation."""
+        max_requests = None
+        if self.max_requests > 0:
+            max_requests = self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._run_worker(app, sock, max_requests)
+                status = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self._workers[pid] = (self._generation, time.monotonic())
+
+    def _run_worker(self, app, sock: socket.socket, max_requests: Optional[int]):
+        """Serve requests in a forked child until stopped or recycled."""
+        # The parent handles SIGHUP; uvicorn installs its own SIGTERM and
+        # SIGINT handlers for a graceful shutdown
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        config = uvicorn.Config(
+            app,
+            log_level=self.log_level,
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def _reap(self) -> List[Tuple[int, int, float, int]]:
+        """
+        Collect workers that have exited, without blocking.
+
+        Returns:
+            (pid, generation, fork time, exit status) for each exited worker
+        """
+        exited = []
+        while self._workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self._workers:
+                generation, started = self._workers.pop(pid)
+                exited.append((pid, generation, started, os.waitstatus_to_exitcode(status)))
+        return exited
+
+    def _stop(self):
+        """Stop all workers, killing those that outlive the graceful timeout."""
+        for pid in self._workers:
+            self._kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in list(self._workers):
+            print(f"⚠ Worker {pid} did not stop in {self.graceful_timeout}s, killing it", flush=True)
+            self._kill(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            del self._workers[pid]
+
+    @staticmethod
+    def _kill(pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,149 @@
+"""
+Profiling - Per-Request Diagnostics for Slow Documents
+
+Two opt-in tools for finding out where time goes on a specific input:
+
+1. Timing breakdown: /segment with "profile": true (and a valid X-Admin-Token
+   header) runs the splitter's profile_spans() instead of split_spans() and
+   returns the time spent in each phase or spaCy pipeline component. If a
+   profile directory is configured, a cProfile dump is written as well.
+
+2. Sampled dumps: with SEGMENT_PROFILE_SAMPLE_RATE=N, one in every N ordinary
+   /segment requests runs under cProfile and its stats are written to the
+   profile directory. Dumps are standard pstats files; open them with
+   `python -m pstats`, snakeviz, or convert them to a flamegraph with
+   flameprof / gprof2dot.
+
+When nothing is configured the request path only pays for an attribute
+check: no profiler is created and no timers run.
+
+Configuration (environment variables):
+    SEGMENT_ADMIN_TOKEN          Token required for "profile": true (unset: disabled)
+    SEGMENT_PROFILE_DIR          Directory for .prof dumps (unset: no dumps)
+    SEGMENT_PROFILE_SAMPLE_RATE  Profile 1 in N ordinary requests (default: 0, off)
+"""
+
+import cProfile
+import hmac
+import itertools
+import os
+import time
+import uuid
+from typing import Callable, Optional, Sequence
+
+
+class RequestProfiler:
+    """
+    Admin gating, sampling and dump paths for request profiling.
+    """
+
+    def __init__(self, admin_token: str = None, profile_dir: str = None,
+                 sample_rate: int = None):
+        """
+        Initialize the profiler settings.
+
+        Args:
+            admin_token: Token that must accompany profile requests
+            profile_dir: Directory where cProfile dumps are written
+            sample_rate: Profile one in this many ordinary requests, 0 for never
+        """
+        if admin_token is None:
+            admin_token = os.environ.get("SEGMENT_ADMIN_TOKEN") or None
+        if profile_dir is None:
+            profile_dir = os.environ.get("SEGMENT_PROFILE_DIR") or None
+        if sample_rate is None:
+            sample_rate = int(os.environ.get("SEGMENT_PROFILE_SAMPLE_RATE", 0))
+
+        self.admin_token = admin_token
+        self.profile_dir = profile_dir
+        # Sampling needs somewhere to write the dumps
+        self.sample_rate = sample_rate if profile_dir else 0
+        self._counter = itertools.count(1)
+
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """
+        Check an X-Admin-Token header value.
+
+        Args:
+            token: Header value, or None if missing
+
+        Returns:
+            True if profiling is enabled and the token matches
+        """
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8"))
+
+    def should_sample(self) -> bool:
+        """Return True for one in every sample_rate calls."""
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    def dump_path(self, method: str, language: str) -> Optional[str]:
+        """
+        Choose a file name for a new dump.
+
+        Args:
+            method: Segmentation method
+            language: Language code
+
+        Returns:
+            Path inside the profile directory, or None if dumps are disabled
+        """
+        if not self.profile_dir:
+            return None
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{method}-{language}-{uuid.uuid4().hex[:8]}.prof"
+        return os.path.join(self.profile_dir, name)
+
+
+def call_with_profile(func: Callable, args: Sequence, dump_path: Optional[str]):
+    """
+    Call func(*args), under cProfile if a dump path is given.
+
+    Runs inside the executor worker (thread or process) so the profile
+    covers the splitter itself rather than the event loop.
+
+    Args:
+        func: Function to call
+        args: Positional arguments
+        dump_path: Where to write the pstats dump, or None to just call func
+
+    Returns:
+        The result of func(*args)
+    """
+    if dump_path is None:
+        return func(*args)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(dump_path)
+
+
+def format_breakdown(breakdown: dict, total_seconds: float,
+                     dump_path: Optional[str]) -> dict:
+    """
+    Turn a splitter breakdown into the "profile" field of a response.
+
+    Args:
+        breakdown: Second element returned by a splitter's profile_spans()
+        total_seconds: Wall time of the whole segmentation call
+        dump_path: Path of the cProfile dump, if one was written
+
+    Returns:
+        Dictionary with phase timings in milliseconds, counts and the dump path
+    """
+    result = dict(breakdown)
+    result["phases_ms"] = {
+        phase: round(seconds * 1000, 3) for phase, seconds in breakdown["phases"].items()
+    }
+    del result["phases"]
+    result["total_ms"] = round(total_seconds * 1000, 3)
+    result["dump"] = dump_path
+    return result
+
@@ -0,0 +1,292 @@
+"""
+Model Snapshots - Sentence-Only Pipelines in One Artifact
+
+spacy.load() resolves the installed package, reads its config and then
+loads every component from its own directory of files, including the ones
+a pipeline profile excludes again right away. Every worker repeats this for
+every language.
+
+The build step below loads each (language, profile) pipeline once, keeping
+only the components that profile needs for doc.sents, and writes it into a
+snapshot directory:
+
+    manifest.json   format version, spaCy version and, per pipeline, the
+                    package version, config, offset, size and SHA-256
+    pipelines.bin   the nlp.to_bytes() blobs (vocab, strings, weights),
+                    one after another
+
+The loader maps pipelines.bin read-only and rebuilds a pipeline from its
+config plus a view of its own region, so only that region is read from
+disk and it is not copied before deserializing. The checksum of a region is
+verified on its first load only. Snapshots built by another spaCy version
+or from another package version are ignored; such models load with
+spacy.load() as before.
+
+This is a faster load, not shared model memory: from_bytes() deserializes
+the weights into private arrays of every process, exactly like spacy.load(),
+so resident memory per worker is unchanged. Only the page cache copy of
+pipelines.bin is shared between workers. The time saved is in skipping
+work: spacy.load() builds the default tokenizer with all of the language's
+special cases and then replaces every one of them with the package's
+serialized tokenizer, while the loader builds an empty placeholder
+tokenizer, which from_bytes() fills completely, and only constructs the
+components a profile keeps.
+
+Build (rerun after upgrading spaCy or a model package):
+    python -m backend.snapshots --output snapshots/ [--languages en,fr,de,es]
+        [--profiles full,parser-only,senter]
+
+Configuration (environment variables):
+    SPACY_SNAPSHOT_DIR  Directory written by the build step; pipelines found
+                        there are loaded from it (default: unset, disabled)
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "pipelines.bin"
+
+# Registered in spaCy's tokenizer registry on the first load()
+_PLACEHOLDER_TOKENIZER = "segment.placeholder_tokenizer.v1"
+_registry_lock = threading.Lock()
+_placeholder_registered = False
+
+# Profiles that load a trained package, including the default "full";
+# "sentencizer" has no weights to snapshot
+DEFAULT_PROFILES = ("full", "parser-only", "senter")
+
+
+def _entry_name(language: str, profile: str) -> str:
+    return f"{language}/{profile}"
+
+
+def _register_placeholder_tokenizer():
+    """Register a tokenizer factory that creates an empty Tokenizer."""
+    global _placeholder_registered
+    with _registry_lock:
+        if _placeholder_registered:
+            return
+        import spacy
+        from spacy.tokenizer import Tokenizer
+
+        @spacy.registry.tokenizers(_PLACEHOLDER_TOKENIZER)
+        def create_placeholder_tokenizer():
+            # No rules, prefixes or special cases: Tokenizer.from_bytes()
+            # resets and restores all of them
+            return lambda nlp: Tokenizer(nlp.vocab)
+
+        _placeholder_registered = True
+
+
+def build_snapshots(output_dir: str, languages: Iterable[str],
+                    profiles: Iterable[str] = DEFAULT_PROFILES) -> dict:
+    """
+    Write snapshots of the given pipelines into output_dir.
+
+    Models that are not installed are skipped with a warning.
+
+    Args:
+        output_dir: Directory for manifest.json and pipelines.bin
+        languages: Language codes (en, fr, de, es)
+        profiles: Pipeline profiles from PIPELINE_PROFILES
+
+    Returns:
+        The manifest that was written
+    """
+    import spacy
+    from backend.spacy_splitter import LANGUAGE_MODELS, PIPELINE_PROFILES, _load_pipeline
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {"format": FORMAT_VERSION, "spacy_version": spacy.__version__, "pipelines": {}}
+    data_path = os.path.join(output_dir, DATA_NAME)
+
+    with open(data_path + ".tmp", "wb") as data:
+        for language in languages:
+            for profile in profiles:
+                if language not in LANGUAGE_MODELS or profile not in PIPELINE_PROFILES:
+                    raise ValueError(f"Unknown language or profile: {language}/{profile}")
+                model_name = LANGUAGE_MODELS[language]
+                try:
+                    nlp = _load_pipeline(language, model_name, profile)
+                except OSError:
+                    print(f"⚠ Skipping {language}/{profile}: {model_name} is not installed")
+                    continue
+
+                blob = nlp.to_bytes()
+                manifest["pipelines"][_entry_name(language, profile)] = {
+                    "model": model_name,
+                    "model_version": spacy.util.get_package_version(model_name),
+                    "components": nlp.pipe_names,
+                    "config": nlp.config.to_str(),
+                    "offset": data.tell(),
+                    "size": len(blob),
+                    "sha256": hashlib.sha256(blob).hexdigest(),
+                }
+                data.write(blob)
+                print(f"✓ {language}/{profile}: {', '.join(nlp.pipe_names)} "
+                      f"({len(blob) / (1024 * 1024):.1f} MB)")
+
+    # Replace the old artifact only once the new one is complete
+    os.replace(data_path + ".tmp", data_path)
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class SnapshotStore:
+    """
+    Read-only access to a snapshot directory.
+
+    The manifest is read when the store is opened; spaCy is only imported
+    and versions are only checked on the first load().
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot directory.
+
+        Args:
+            path: Directory written by build_snapshots()
+
+        Raises:
+            OSError: If the manifest or data file cannot be opened
+            ValueError: If the manifest has an unsupported format
+        """
+        with open(os.path.join(path, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format in {path}: {manifest.get('format')}")
+
+        self.path = path
+        self.spacy_version: str = manifest["spacy_version"]
+        self.pipelines: Dict[str, dict] = manifest["pipelines"]
+
+        with open(os.path.join(path, DATA_NAME), "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._lock = threading.Lock()
+        self._compatible: Optional[bool] = None
+        # Entries whose checksum matched; the file is read-only and mapped,
+        # so they are not hashed again when a pipeline is reloaded
+        self._verified: Set[str] = set()
+
+    @classmethod
+    def from_environment(cls) -> Optional["SnapshotStore"]:
+        """
+        Open the store named by SPACY_SNAPSHOT_DIR.
+
+        Returns:
+            The store, or None if the variable is unset or the directory
+            cannot be used (a warning is printed)
+        """
+        path = os.environ.get("SPACY_SNAPSHOT_DIR")
+        if not path:
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠ Warning: ignoring model snapshots in {path}: {e}")
+            return None
+
+    def load(self, language: str, profile: str):
+        """
+        Rebuild a pipeline from its snapshot.
+
+        Args:
+            language: Language code
+            profile: Pipeline profile name
+
+        Returns:
+            spaCy Language object, or None if there is no usable snapshot for
+            this pipeline (missing, stale or corrupt)
+        """
+        name = _entry_name(language, profile)
+        entry = self.pipelines.get(name)
+        if entry is None or not self._is_compatible():
+            return None
+
+        import spacy
+
+        installed = spacy.util.get_package_version(entry["model"])
+        if installed != entry["model_version"]:
+            print(f"⚠ Warning: snapshot of {entry['model']} {entry['model_version']} is stale "
+                  f"(installed: {installed}), loading the package instead")
+            return None
+
+        # A view of the mapped region: neither hashing nor from_bytes()
+        # needs a copy of the blob
+        with memoryview(self._data)[entry["offset"]:entry["offset"] + entry["size"]] as blob:
+            if not self._verify(name, blob, entry["sha256"]):
+                print(f"⚠ Warning: snapshot of {language}/{profile} is corrupt, "
+                      f"loading the package instead")
+                return None
+
+            _register_placeholder_tokenizer()
+            try:
+                config = spacy.util.load_config_from_str(entry["config"])
+                config["nlp"]["tokenizer"] = {"@tokenizers": _PLACEHOLDER_TOKENIZER}
+                nlp = spacy.util.get_lang_class(config["nlp"]["lang"]).from_config(config)
+                return nlp.from_bytes(blob)
+            except Exception as e:
+                print(f"⚠ Warning: cannot restore snapshot of {language}/{profile} ({e}), "
+                      f"loading the package instead")
+                return None
+
+    def close(self):
+        """Unmap the data file."""
+        self._data.close()
+
+    def _verify(self, name: str, blob: memoryview, sha256: str) -> bool:
+        """Check the checksum of an entry the first time it is loaded."""
+        if name in self._verified:
+            return True
+        if hashlib.sha256(blob).hexdigest() != sha256:
+            return False
+        with self._lock:
+            self._verified.add(name)
+        return True
+
+    def _is_compatible(self) -> bool:
+        """Check once that the snapshots were written by this spaCy version."""
+        with self._lock:
+            if self._compatible is None:
+                import spacy
+
+                self._compatible = self.spacy_version == spacy.__version__
+                if not self._compatible:
+                    print(f"⚠ Warning: model snapshots in {self.path} were built with spaCy "
+                          f"{self.spacy_version}, running {spacy.__version__}; ignoring them")
+            return self._compatible
+
+
+def main(argv=None):
+    """Entry point for `python -m backend.snapshots`."""
+    from backend.spacy_splitter import LANGUAGE_MODELS
+
+    parser = argparse.ArgumentParser(prog="python -m backend.snapshots",
+                                     description="Build sentence-only spaCy model snapshots")
+    parser.add_argument("--output", required=True, help="Snapshot directory to write")
+    parser.add_argument("--languages", default=",".join(LANGUAGE_MODELS),
+                        help="Comma-separated languages (default: all)")
+    parser.add_argument("--profiles", default=",".join(DEFAULT_PROFILES),
+                        help="Comma-separated pipeline profiles")
+    args = parser.parse_args(argv)
+
+    manifest = build_snapshots(
+        args.output,
+        [language.strip() for language in args.languages.split(",") if language.strip()],
+        [profile.strip() for profile in args.profiles.split(",") if profile.strip()],
+    )
+    print(f"Wrote {len(manifest['pipelines'])} pipelines to {args.output}")
+    return 0 if manifest["pipelines"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,74 @@ NLP library. This is the proposed system that leverages linguistic knowledge
 and trained models to accurately identify sentence boundaries.
 
 Supports English (mandatory) and multilingual extension (French, German, Spanish).
+
+Models are cached per process: every process that segments keeps its own
+LRU of up to SPACY_MAX_MODELS models. Those are the API process, every spaCy
+pool worker (SEGMENT_SPACY_EXECUTOR=process, the default) and every
+parallel-splitting worker; a spaCy pool worker that receives a large
+document starts its own parallel pool. With P = SEGMENT_PROCESS_WORKERS and
+W = SPACY_PARALLEL_WORKERS, one server process can therefore hold up to
+(1 + P x (1 + W)) x SPACY_MAX_MODELS models in process mode and
+(1 + W) x SPACY_MAX_MODELS in thread mode; a pre-fork server multiplies
+that by its number of workers. Workers forked after preloading share the
+preloaded models' pages until they write to them.
 """
 
-import spacy
+import re
 import os
-from typing import List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.baseline_splitter import BaselineSentenceSplitter, SUPPORTED_LANGUAGES as BASELINE_LANGUAGES
+from backend.snapshots import SnapshotStore
+from backend.spans import SentenceSpans
+
+
+# Language to model mapping
+LANGUAGE_MODELS = {
+    "en": "en_core_web_sm",
+    "fr": "fr_core_news_sm",
+    "de": "de_core_news_sm",
+    "es": "es_core_news_sm"
+}
+
+# Pipeline profiles, from most accurate to cheapest:
+#   full         - the complete *_core_*_sm pipeline
+#   parser-only  - tok2vec + dependency parser, which is what sets doc.sents
+#   senter       - the small statistical sentence recognizer shipped with
+#                  each package (disabled by default there)
+#   sentencizer  - spaCy's rule-based punctuation sentencizer, no model
+#                  weights at all
+PIPELINE_PROFILES = ("full", "parser-only", "senter", "sentencizer")
+
+# Components kept for each profile that loads a trained package
+_PROFILE_COMPONENTS = {
+    "parser-only": {"tok2vec", "parser"},
+    "senter": {"senter"},
+}
+
+# Every component name used by the *_core_*_sm packages
+_PACKAGE_COMPONENTS = {
+    "tok2vec", "tagger", "morphologizer", "parser", "senter",
+    "attribute_ruler", "lemmatizer", "trainable_lemmatizer", "ner"
+}
+
+
+def preload_languages() -> List[str]:
+    """
+    Return the languages listed in SPACY_PRELOAD_LANGUAGES.
+    
+    Returns:
+        Language codes in the configured order, possibly empty
+    """
+    return [
+        language.strip()
+        for language in os.environ.get("SPACY_PRELOAD_LANGUAGES", "").split(",")
+        if language.strip()
+    ]
 
 
 class SpacySentenceSplitter:
@@ -20,91 +83,656 @@ class SpacySentenceSplitter:
     This class loads appropriate spaCy models for different languages and
     uses spaCy's built-in sentence segmentation capabilities, which are
     based on trained models that understand linguistic patterns.
+    
+    Models are loaded on first use per (language, profile) and kept in a
+    small LRU cache, so a deployment that only serves English never pays for
+    the other models. Only doc.sents is read, so the cheaper pipeline
+    profiles (see PIPELINE_PROFILES) leave out components that do not affect
+    sentence boundaries.
+    
+    Documents longer than the parallel threshold are cut into pieces at
+    safe pre-boundaries, segmented across a process pool and stitched back
+    together (see _split_spans_parallel). This also lifts spaCy's max_length
+    limit for large inputs.
+    
+    Configuration (environment variables):
+        SPACY_MAX_MODELS           Maximum resident models per process
+                                   (default: all four)
+        SPACY_PRELOAD_LANGUAGES    Comma-separated languages to load at startup
+        SPACY_PIPELINE_PROFILE     Default pipeline profile (default: full)
+        SPACY_PARALLEL_THRESHOLD   Characters above which documents are split
+                                   in parallel, 0 disables (default: 500000)
+        SPACY_PARALLEL_WORKERS     Processes for parallel splitting
+                                   (default: CPU count)
+        SPACY_PIECE_SIZE           Target characters per piece (default: 200000)
+        SPACY_SNAPSHOT_DIR         Load pipelines from model snapshots built
+                                   with `python -m backend.snapshots`
     """
     
-    def __init__(self):
-        """Initialize the spaCy splitter and load models."""
-        self.models = {}
-        self._load_models()
+    def __init__(self, max_models: int = None, preload: Iterable[str] = None,
+                 profile: str = None, parallel_threshold: int = None,
+                 parallel_workers: int = None, piece_size: int = None,
+                 snapshots: SnapshotStore = None):
+        """
+        Initialize the spaCy splitter.
+        
+        Args:
+            max_models: Maximum number of models kept in memory; the least
+                recently used one is evicted when the limit is exceeded
+            preload: Languages to load immediately instead of on first use
+            profile: Default pipeline profile for requests that do not pick one
+            parallel_threshold: Minimum document length for parallel
+                splitting, 0 to disable
+            parallel_workers: Number of processes for parallel splitting
+            piece_size: Target length of the pieces a large document is cut into
+            snapshots: Model snapshots to load pipelines from before falling
+                back to spacy.load (default: SPACY_SNAPSHOT_DIR)
+        """
+        self.default_profile = profile or os.environ.get("SPACY_PIPELINE_PROFILE", "full")
+        if self.default_profile not in PIPELINE_PROFILES:
+            raise ValueError(
+                f"Pipeline profile '{self.default_profile}' not supported. "
+                f"Supported: {list(PIPELINE_PROFILES)}"
+            )
+        
+        # Resident models keyed by (language, profile), in least- to
+        # most-recently-used order
+        self.models: "OrderedDict[tuple, object]" = OrderedDict()
+        self.max_models = max(1, max_models or int(
+            os.environ.get("SPACY_MAX_MODELS", len(LANGUAGE_MODELS))
+        ))
+        
+        # (language, profile) pairs whose model package is not installed, so
+        # we do not retry spacy.load on every request
+        self._missing = set()
+        
+        # _lock guards the LRU dictionary and the lock table; per-model locks
+        # make sure two threads never load the same model at the same time
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        
+        # Parallel splitting of very large documents; the pool is started on
+        # first use
+        if parallel_threshold is None:
+            parallel_threshold = int(os.environ.get("SPACY_PARALLEL_THRESHOLD", 500000))
+        self.parallel_threshold = parallel_threshold
+        self.parallel_workers = parallel_workers or int(
+            os.environ.get("SPACY_PARALLEL_WORKERS", os.cpu_count() or 1)
+        )
+        self.piece_size = piece_size or int(os.environ.get("SPACY_PIECE_SIZE", 200000))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._baseline = BaselineSentenceSplitter()
+        self.snapshots = snapshots or SnapshotStore.from_environment()
+        
+        if preload is None:
+            preload = preload_languages()
+        for language in preload:
+            self.get_model(language)
+    
+    def resolve_profile(self, profile: str = None) -> str:
+        """
+        Return the profile to use for a request.
+        
+        Args:
+            profile: Requested profile, or None for the deployment default
+            
+        Returns:
+            A name from PIPELINE_PROFILES
+            
+        Raises:
+            ValueError: If the profile is not supported
+        """
+        profile = profile or self.default_profile
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(
+                f"Pipeline profile '{profile}' not supported. Supported: {list(PIPELINE_PROFILES)}"
+            )
+        return profile
+    
+    def get_model(self, language: str, profile: str = None):
+        """
+        Return the spaCy model for a language, loading it on first use.
+        
+        Falls back to English if the language is unknown or its model is not
+        installed.
+        
+        Args:
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            
+        Returns:
+            spaCy Language object, or None if not even English is available
+        """
+        if language not in LANGUAGE_MODELS:
+            language = "en"
+        key = (language, self.resolve_profile(profile))
+        
+        model = self._get_resident(key)
+        if model is None and key not in self._missing:
+            with self._lock:
+                load_lock = self._load_locks.setdefault(key, threading.Lock())
+            with load_lock:
+                # Another thread may have finished loading while we waited
+                model = self._get_resident(key)
+                if model is None and key not in self._missing:
+                    model = self._load_model(*key)
+        
+        if model is None and language != "en":
+            return self.get_model("en", profile)
+        return model
     
-    def _load_models(self):
+    def model_version(self, language: str, profile: str = None) -> str:
         """
-        Load spaCy models for supported languages.
+        Describe the model that would segment a request, for cache keys.
         
-        Models are loaded lazily - only when first needed for a language.
-        Falls back to English if a model fails to load.
+        Uses the metadata of the model if it is loaded in this process, and
+        the installed package version otherwise (e.g. when models only live
+        in executor worker processes). Either way the string changes when
+        the model package is upgraded.
+        
+        Args:
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            
+        Returns:
+            Version string such as "spacy-3.7.2/en_core_web_sm-3.7.1/full"
+        """
+        import spacy
+        
+        if language not in LANGUAGE_MODELS:
+            language = "en"
+        profile = self.resolve_profile(profile)
+        
+        if profile == "sentencizer":
+            model_id = f"blank-{language}"
+        else:
+            model = self._get_resident((language, profile))
+            if model is not None:
+                model_id = f"{model.meta.get('lang')}_{model.meta.get('name')}-{model.meta.get('version')}"
+            else:
+                model_name = LANGUAGE_MODELS[language]
+                model_id = f"{model_name}-{spacy.util.get_package_version(model_name) or 'missing'}"
+        
+        return f"spacy-{spacy.__version__}/{model_id}/{profile}"
+    
+    def _get_resident(self, key: tuple):
+        """Return a loaded model and mark it as most recently used."""
+        with self._lock:
+            model = self.models.get(key)
+            if model is not None:
+                self.models.move_to_end(key)
+            return model
+    
+    def _load_model(self, language: str, profile: str):
         """
-        # Language to model mapping
-        language_models = {
-            "en": "en_core_web_sm",
-            "fr": "fr_core_news_sm",
-            "de": "de_core_news_sm",
-            "es": "es_core_news_sm"
-        }
+        Load the spaCy model for one language and profile and cache it.
         
-        # Try to load English model first (mandatory)
+        Args:
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile name
+            
+        Returns:
+            spaCy Language object, or None if the model is not installed
+        """
+        model_name = LANGUAGE_MODELS[language]
         try:
-            self.models["en"] = spacy.load("en_core_web_sm")
-            print("✓ Loaded English model (en_core_web_sm)")
+            model = self.snapshots.load(language, profile) if self.snapshots else None
+            if model is not None:
+                source = f"{model_name} snapshot"
+            else:
+                model = _load_pipeline(language, model_name, profile)
+                source = "blank pipeline" if profile == "sentencizer" else model_name
+            print(f"✓ Loaded {language} model ({source}, {profile} profile: "
+                  f"{', '.join(model.pipe_names)})")
         except OSError:
-            print("⚠ Warning: English model not found. Please install with:")
-            print("  python -m spacy download en_core_web_sm")
-            print("  Falling back to basic tokenization...")
-            self.models["en"] = None
-        
-        # Try to load multilingual models (optional)
-        for lang_code, model_name in language_models.items():
-            if lang_code == "en":
-                continue  # Already loaded
-            
-            try:
-                self.models[lang_code] = spacy.load(model_name)
-                print(f"✓ Loaded {lang_code} model ({model_name})")
-            except OSError:
-                print(f"⚠ Warning: {model_name} not found. Install with:")
-                print(f"  python -m spacy download {model_name}")
-                print(f"  Falling back to English model for {lang_code}...")
-                # Fallback to English model if available
-                self.models[lang_code] = self.models.get("en")
-    
-    def split(self, text: str, language: str = "en") -> List[str]:
+            print(f"⚠ Warning: {model_name} not found. Install with:")
+            print(f"  python -m spacy download {model_name}")
+            if language == "en":
+                print("  Falling back to basic tokenization...")
+            else:
+                print(f"  Falling back to English model for {language}...")
+            self._missing.add((language, profile))
+            return None
+        
+        with self._lock:
+            self.models[(language, profile)] = model
+            while len(self.models) > self.max_models:
+                (evicted, evicted_profile), _ = self.models.popitem(last=False)
+                print(f"✓ Evicted {evicted} model ({evicted_profile} profile, "
+                      f"limit: {self.max_models} resident models)")
+        return model
+    
+    def split(self, text: str, language: str = "en", profile: str = None) -> List[str]:
         """
         Split text into sentences using spaCy.
         
         Args:
             text: Input text to segment
             language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
             
         Returns:
             List of sentences (strings)
         """
+        return self.split_spans(text, language, profile).texts(text)
+    
+    def split_spans(self, text: str, language: str = "en",
+                    profile: str = None) -> SentenceSpans:
+        """
+        Split text into sentences using spaCy and return character offsets only.
+        
+        Offsets come straight from spaCy's sentence spans, trimmed of
+        surrounding whitespace, so no sentence strings are allocated.
+        
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            
+        Returns:
+            SentenceSpans with (start, end) offsets into the original text
+        """
         if not text or not text.strip():
-            return []
+            return SentenceSpans()
+        
+        if self.parallel_threshold and len(text) > self.parallel_threshold:
+            return self._split_spans_parallel(text, language, profile)
+        
+        return self._split_spans_single(text, language, profile)
+    
+    def _split_spans_single(self, text: str, language: str, profile: str) -> SentenceSpans:
+        """
+        Segment a whole document with one call to the spaCy model.
         
-        # Get appropriate model (fallback to English if language model unavailable)
-        model = self.models.get(language) or self.models.get("en")
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            
+        Returns:
+            SentenceSpans with (start, end) offsets into the original text
+        """
+        # Get appropriate model (loaded on first use, English fallback)
+        model = self.get_model(language, profile)
         
         if model is None:
             # Fallback: basic sentence splitting if no model available
             print("⚠ No spaCy model available. Using basic fallback.")
-            return self._fallback_split(text)
+            return self._fallback_spans(text)
         
         try:
             # Process text with spaCy
-            doc = model(text)
+            return self._doc_spans(model(text))
+        
+        except Exception as e:
+            print(f"⚠ Error in spaCy processing: {e}")
+            # Fallback to basic splitting
+            return self._fallback_spans(text)
+    
+    def _split_spans_parallel(self, text: str, language: str, profile: str) -> SentenceSpans:
+        """
+        Segment a large document in pieces across a process pool.
+        
+        1. Cut the text at safe pre-boundaries (see _cut_points)
+        2. Segment every piece in parallel
+        3. Re-segment a small window around every seam, with two sentences
+           of context on each side, so boundaries near a cut are decided the
+           same way a single pass would decide them
+        
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
             
-            # Extract sentences using spaCy's sentence segmentation
-            sentences = [sent.text.strip() for sent in doc.sents]
+        Returns:
+            SentenceSpans with (start, end) offsets into the original text
+        """
+        cuts = [0] + self._cut_points(text, language) + [len(text)]
+        pieces = [(text[start:end], language, profile) for start, end in zip(cuts, cuts[1:])]
+        
+        if len(pieces) == 1:
+            return self._split_spans_single(text, language, profile)
+        
+        if self.parallel_workers > 1:
+            results = self._get_pool(language, profile).map(_segment_piece, pieces)
+        else:
+            results = (self._split_spans_single(*piece) for piece in pieces)
+        
+        # Stitch the pieces together, reconciling each seam
+        context = 2
+        merged: List[Tuple[int, int]] = []
+        for piece_start, piece_spans in zip(cuts, results):
+            spans = [(start + piece_start, end + piece_start) for start, end in piece_spans]
+            if merged and spans:
+                window_start = merged[-context:][0][0]
+                window_end = spans[:context][-1][1]
+                window_spans = self._split_spans_single(
+                    text[window_start:window_end], language, profile
+                )
+                del merged[-context:]
+                merged.extend((start + window_start, end + window_start)
+                              for start, end in window_spans)
+                spans = spans[context:]
+            merged.extend(spans)
+        
+        result = SentenceSpans()
+        for start, end in merged:
+            result.append(start, end)
+        return result
+    
+    def profile_spans(self, text: str, language: str = "en",
+                      profile: str = None) -> Tuple[SentenceSpans, Dict]:
+        """
+        Split text in a single pass and time every pipeline component.
+        
+        Phases:
+            model_lookup  resolving (and possibly loading) the model
+            tokenizer     nlp.make_doc
+            <component>   one entry per pipeline component, in order
+            spans         extracting trimmed sentence offsets from the Doc
+        
+        Documents are always processed in one pass here, even above the
+        parallel threshold, so the numbers describe the model itself. Only
+        used for diagnostics; split() and split_spans() are not instrumented.
+        
+        Args:
+            text: Input text to segment
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
             
-            # Filter out empty sentences
-            sentences = [s for s in sentences if s]
+        Returns:
+            (spans, breakdown) where breakdown has "phases" (seconds),
+            "counts" and the "model" version
+        """
+        phases = {}
+        start = time.perf_counter()
+        model = self.get_model(language, profile)
+        phases["model_lookup"] = time.perf_counter() - start
+        counts = {"chars": len(text)}
+        
+        if model is None or not text.strip():
+            start = time.perf_counter()
+            spans = self._fallback_spans(text) if text.strip() else SentenceSpans()
+            phases["fallback"] = time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            doc = model.make_doc(text)
+            phases["tokenizer"] = time.perf_counter() - start
+            for name, component in model.pipeline:
+                start = time.perf_counter()
+                doc = component(doc)
+                phases[name] = time.perf_counter() - start
+            start = time.perf_counter()
+            spans = self._doc_spans(doc)
+            phases["spans"] = time.perf_counter() - start
+            counts["tokens"] = len(doc)
+        
+        counts["sentences"] = len(spans)
+        return spans, {"phases": phases, "counts": counts,
+                       "model": self.model_version(language, profile)}
+    
+    def shutdown(self):
+        """Stop the process pool used for parallel splitting, if started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _cut_points(self, text: str, language: str) -> List[int]:
+        """
+        Choose offsets where a large document can be cut into pieces.
+        
+        Each cut lies within half a piece of its target position and is, in
+        order of preference: a paragraph break, a boundary found by the
+        baseline splitter, whitespace, or (as a last resort) the target itself.
+        
+        Args:
+            text: Document to cut
+            language: Language code, selecting the baseline's abbreviations
+            
+        Returns:
+            Sorted list of cut offsets, excluding 0 and len(text)
+        """
+        size = self.piece_size
+        cuts = []
+        position = 0
+        while len(text) - position > size + size // 2:
+            target = position + size
+            low, high = target - size // 2, target + size // 2
+            cuts.append(self._find_cut(text, language, low, target, high))
+            position = cuts[-1]
+        return cuts
+    
+    def _find_cut(self, text: str, language: str, low: int, target: int, high: int) -> int:
+        """
+        Find the safe cut in text[low:high] closest to target.
+        
+        Args:
+            text: Document to cut
+            language: Language code, selecting the baseline's abbreviations
+            low: Earliest allowed cut
+            target: Preferred cut
+            high: Latest allowed cut
+            
+        Returns:
+            Cut offset
+        """
+        candidates = [match.end() for match in _PARAGRAPH_BREAK.finditer(text, low, high)]
+        
+        if not candidates:
+            if language not in BASELINE_LANGUAGES:
+                language = "en"
+            window = self._baseline.split_spans(text[low:high], language)
+            candidates = [start + low for start in window.starts[1:]]
+        
+        if not candidates:
+            before = text.rfind(" ", low, target)
+            after = text.find(" ", target, high)
+            candidates = [pos + 1 for pos in (before, after) if pos != -1]
+        
+        if not candidates:
+            return target
+        return min(candidates, key=lambda pos: abs(pos - target))
+    
+    def _get_pool(self, language: str, profile: str) -> ProcessPoolExecutor:
+        """
+        Return the process pool for parallel splitting, starting it if needed.
+        
+        The model is loaded before the pool starts, so forked workers inherit
+        it instead of loading their own copy.
+        """
+        global _piece_parent
+        with self._lock:
+            pool = self._pool
+        if pool is None:
+            self.get_model(language, profile)
+            with self._lock:
+                if self._pool is None:
+                    _piece_parent = self
+                    self._pool = ProcessPoolExecutor(
+                        self.parallel_workers, initializer=_init_piece_worker
+                    )
+                pool = self._pool
+        return pool
+    
+    def iter_sentences(self, chunks: Iterable[str], language: str = "en",
+                       profile: str = None, window: int = 100000) -> Iterator[str]:
+        """
+        Segment a stream of text chunks, yielding sentences as they become final.
+        
+        Chunks are buffered until at least `window` characters are available.
+        The buffer is then segmented; every sentence except the last is final
+        and yielded, and the last one is carried over to be completed by the
+        following chunks. Memory stays bounded by the window plus the longest
+        sentence.
+        
+        Args:
+            chunks: Iterable of text pieces, in order
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            window: Minimum number of characters to segment at a time
             
-            return sentences
+        Yields:
+            Sentences (strings)
+        """
+        buffer = ""
+        next_run = window
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer += chunk
+            if len(buffer) < next_run:
+                continue
+            
+            spans = self.split_spans(buffer, language, profile)
+            if len(spans) > 1:
+                for start, end in list(spans)[:-1]:
+                    yield buffer[start:end]
+                buffer = buffer[spans[-1][0]:]
+                next_run = window
+            else:
+                # One long sentence so far: wait for another window of text
+                # instead of re-segmenting the growing buffer on every chunk
+                next_run = len(buffer) + window
+        
+        yield from self.split(buffer, language, profile)
+    
+    def split_many(self, texts: Iterable[str], language: str = "en",
+                   batch_size: int = 64, n_process: int = 1,
+                   profile: str = None) -> List[Dict]:
+        """
+        Split many documents at once by streaming them through nlp.pipe.
         
+        Batching amortizes the per-call pipeline overhead, which dominates for
+        short documents. A document that fails is reported in its own result
+        instead of failing the whole batch.
+        
+        Args:
+            texts: Documents to segment
+            language: Language code (en, fr, de, es)
+            batch_size: Number of documents spaCy processes per batch
+            n_process: Number of processes nlp.pipe uses
+            profile: Pipeline profile, or None for the default
+            
+        Returns:
+            One dictionary per input document, in input order, with
+            "sentences" (list of strings) and "error" (None or a message)
+        """
+        texts = list(texts)
+        results: List[Dict] = [None] * len(texts)
+        model = self.get_model(language, profile)
+        
+        # Resolve documents that do not need the model up front
+        pending = []
+        for index, text in enumerate(texts):
+            if not isinstance(text, str):
+                results[index] = {"sentences": [], "error": "Text must be a string"}
+            elif not text.strip():
+                results[index] = {"sentences": [], "error": None}
+            elif model is None:
+                results[index] = {"sentences": self._fallback_split(text), "error": None}
+            elif len(text) > model.max_length:
+                results[index] = {
+                    "sentences": [],
+                    "error": f"Text of length {len(text)} exceeds maximum of {model.max_length}"
+                }
+            else:
+                pending.append(index)
+        
+        try:
+            docs = model.pipe(
+                (texts[index] for index in pending),
+                batch_size=batch_size,
+                n_process=n_process
+            )
+            for index, doc in zip(pending, docs):
+                results[index] = {
+                    "sentences": self._doc_spans(doc).texts(texts[index]),
+                    "error": None
+                }
         except Exception as e:
-            print(f"⚠ Error in spaCy processing: {e}")
-            # Fallback to basic splitting
-            return self._fallback_split(text)
+            print(f"⚠ Error in spaCy batch processing: {e}")
+            # Retry the unfinished documents one by one so only the failing
+            # ones are reported as errors
+            for index in pending:
+                if results[index] is not None:
+                    continue
+                try:
+                    doc = model(texts[index])
+                    results[index] = {
+                        "sentences": self._doc_spans(doc).texts(texts[index]),
+                        "error": None
+                    }
+                except Exception as doc_error:
+                    results[index] = {"sentences": [], "error": str(doc_error)}
+        
+        return results
+    
+    def split_spans_many(self, texts: List[str], language: str = "en",
+                         profile: str = None, batch_size: int = 64) -> List[SentenceSpans]:
+        """
+        Segment many documents through nlp.pipe and return offsets only.
+        
+        Used for the many small regions the hybrid splitter hands over.
+        Documents too long for one model call go through split_spans(), and
+        a document that makes the batch fail is retried on its own.
+        
+        Args:
+            texts: Documents to segment
+            language: Language code (en, fr, de, es)
+            profile: Pipeline profile, or None for the default
+            batch_size: Number of documents spaCy processes per batch
+            
+        Returns:
+            One SentenceSpans per input document, in input order
+        """
+        results: List[Optional[SentenceSpans]] = [None] * len(texts)
+        model = self.get_model(language, profile)
+        
+        pending = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                results[index] = SentenceSpans()
+            elif model is None:
+                results[index] = self._fallback_spans(text)
+            elif len(text) > model.max_length or \
+                    (self.parallel_threshold and len(text) > self.parallel_threshold):
+                results[index] = self.split_spans(text, language, profile)
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return results
+        
+        try:
+            docs = model.pipe((texts[index] for index in pending), batch_size=batch_size)
+            for index, doc in zip(pending, docs):
+                results[index] = self._doc_spans(doc)
+        except Exception as e:
+            print(f"⚠ Error in spaCy batch processing: {e}")
+            for index in pending:
+                if results[index] is None:
+                    results[index] = self._split_spans_single(texts[index], language, profile)
+        
+        return results
+    
+    def _doc_spans(self, doc) -> SentenceSpans:
+        """
+        Extract sentence offsets from a processed spaCy Doc.
+        
+        Args:
+            doc: spaCy Doc with sentence boundaries set
+            
+        Returns:
+            SentenceSpans with whitespace-only sentences skipped
+        """
+        text = doc.text
+        spans = SentenceSpans()
+        for sent in doc.sents:
+            start, end = _trim_whitespace(text, sent.start_char, sent.end_char)
+            if start < end:
+                spans.append(start, end)
+        return spans
     
     def _fallback_split(self, text: str) -> List[str]:
         """
@@ -116,7 +744,114 @@ class SpacySentenceSplitter:
         Returns:
             List of sentences
         """
-        import re
-        # Simple regex-based fallback
-        sentences = re.split(r'[.!?]+\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return self._fallback_spans(text).texts(text)
+    
+    def _fallback_spans(self, text: str) -> SentenceSpans:
+        """
+        Fallback sentence offsets when spaCy models are unavailable.
+        
+        Splits on sentence-ending punctuation followed by whitespace; the
+        punctuation itself is dropped, matching the original fallback.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            SentenceSpans for the non-empty pieces
+        """
+        spans = SentenceSpans()
+        start = 0
+        for match in _FALLBACK_PATTERN.finditer(text):
+            _add_trimmed(spans, text, start, match.start())
+            start = match.end()
+        _add_trimmed(spans, text, start, len(text))
+        return spans
+
+
+# Splitter that forked piece workers inherit; spawned workers build their own
+_piece_parent: Optional[SpacySentenceSplitter] = None
+_piece_splitter: Optional[SpacySentenceSplitter] = None
+
+# Blank line (possibly containing spaces/tabs) between paragraphs
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n\s*')
+
+
+def _init_piece_worker():
+    """Set up the splitter of a parallel piece worker process."""
+    global _piece_splitter
+    _piece_splitter = _piece_parent or SpacySentenceSplitter(preload=[])
+    # Pieces are already small; never fan out again from inside a worker
+    _piece_splitter.parallel_threshold = 0
+
+
+def _segment_piece(args: Tuple[str, str, str]) -> List[Tuple[int, int]]:
+    """Segment one piece of a large document inside a worker process."""
+    text, language, profile = args
+    return list(_piece_splitter._split_spans_single(text, language, profile))
+
+
+def _load_pipeline(language: str, model_name: str, profile: str):
+    """
+    Build the spaCy pipeline for a profile.
+    
+    Components that do not influence sentence boundaries are excluded at load
+    time, so their weights are never read from disk.
+    
+    Args:
+        language: Language code, used for the blank sentencizer pipeline
+        model_name: Installed spaCy package name
+        profile: Pipeline profile name
+        
+    Returns:
+        spaCy Language object
+        
+    Raises:
+        OSError: If the model package is not installed
+    """
+    # Imported here rather than at module level: importing spaCy takes
+    # seconds, and the API should be able to start before any model loads
+    import spacy
+    
+    if profile == "sentencizer":
+        model = spacy.blank(language)
+        model.add_pipe("sentencizer")
+        return model
+    
+    if profile == "full":
+        return spacy.load(model_name)
+    
+    keep = _PROFILE_COMPONENTS[profile]
+    model = spacy.load(model_name, exclude=sorted(_PACKAGE_COMPONENTS - keep))
+    if "senter" in keep and "senter" in model.disabled:
+        model.enable_pipe("senter")
+    return model
+
+
+# Simple regex-based fallback: sentence-ending punctuation followed by whitespace
+_FALLBACK_PATTERN = re.compile(r'[.!?]+\s+')
+
+
+def _trim_whitespace(text: str, start: int, end: int):
+    """
+    Shrink a [start, end) range so it excludes surrounding whitespace.
+    
+    Args:
+        text: Text the offsets refer to
+        start: Start offset
+        end: End offset
+        
+    Returns:
+        Tuple of trimmed (start, end) offsets
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _add_trimmed(spans: SentenceSpans, text: str, start: int, end: int):
+    """Append a trimmed span unless it is empty."""
+    start, end = _trim_whitespace(text, start, end)
+    if start < end:
+        spans.append(start, end)
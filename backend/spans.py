@@ -0,0 +1,89 @@
+"""
+Compact sentence span storage.
+
+Sentence boundaries are stored as character offsets into the original text
+instead of as copied sentence strings. Offsets live in a flat typed array
+(start0, end0, start1, end1, ...), which costs 16 bytes per sentence and
+avoids allocating one tuple object per sentence.
+"""
+
+from array import array
+from typing import Iterator, List, Tuple
+
+
+class SentenceSpans:
+    """
+    Array-backed list of (start, end) sentence offsets.
+
+    Offsets are half-open character positions, so text[start:end] is the
+    sentence without its surrounding whitespace.
+    """
+
+    __slots__ = ("offsets",)
+
+    def __init__(self, offsets: array = None):
+        """
+        Initialize the span list.
+
+        Args:
+            offsets: Optional flat array of alternating start/end offsets
+        """
+        self.offsets = offsets if offsets is not None else array('q')
+
+    def append(self, start: int, end: int):
+        """Append one sentence span."""
+        self.offsets.append(start)
+        self.offsets.append(end)
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 2
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("span index out of range")
+        return self.offsets[2 * index], self.offsets[2 * index + 1]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        offsets = self.offsets
+        return zip(offsets[0::2], offsets[1::2])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SentenceSpans):
+            return self.offsets == other.offsets
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SentenceSpans({self.to_list()!r})"
+
+    @property
+    def starts(self) -> array:
+        """Start offsets of all sentences."""
+        return self.offsets[0::2]
+
+    @property
+    def ends(self) -> array:
+        """End offsets of all sentences."""
+        return self.offsets[1::2]
+
+    def to_list(self) -> List[List[int]]:
+        """
+        Convert spans to a JSON-friendly list of [start, end] pairs.
+
+        Returns:
+            List of [start, end] lists
+        """
+        return [[start, end] for start, end in self]
+
+    def texts(self, text: str) -> List[str]:
+        """
+        Slice the sentences out of the text the spans were computed on.
+
+        Args:
+            text: Original text
+
+        Returns:
+            List of sentence strings
+        """
+        return [text[start:end] for start, end in self]
@@ -0,0 +1,148 @@
+"""
+Startup - Model Loading, Warm-up and Readiness
+
+Loading the spaCy models takes seconds per language. By default this happens
+while backend.main is imported, so the server does not accept connections
+until every model in SPACY_PRELOAD_LANGUAGES is loaded. That is what the
+pre-fork server needs, since it forks its workers only after loading.
+
+In background mode the server starts accepting connections right away and a
+thread loads the models. Meanwhile:
+- /health answers 200 with status "loading", so orchestrators see a live
+  process and do not restart it
+- /ready answers 503 until loading and warm-up are done, so load balancers
+  hold traffic back
+- spaCy and hybrid requests get 503 + Retry-After. Baseline requests are
+  served right away because they need no model.
+
+Warm-up segments a short representative text with every loaded model. The
+first call through a pipeline is noticeably slower than later ones, so the
+first real request should not pay for it.
+
+Configuration (environment variables):
+    SEGMENT_STARTUP_MODE  "eager" (load during import) or "background"
+                          (default: eager)
+    SEGMENT_WARMUP        1 to warm up the models before reporting ready,
+                          0 to skip it (default: 1)
+    SEGMENT_WARMUP_FILE   Text file used for warm-up (default: built-in sample)
+"""
+
+import os
+import threading
+import time
+import traceback
+from typing import Iterable, List, Optional
+
+from backend.spacy_splitter import SpacySentenceSplitter, preload_languages
+
+STARTUP_MODES = ("eager", "background")
+
+# Abbreviations, numbers, quotes and a paragraph break: enough to run every
+# component and code path of a pipeline once
+WARMUP_TEXT = (
+    "Dr. Smith arrived at 9:30 a.m. on Jan. 5, 2024. He said: \"The results "
+    "are 3.5% better than expected!\" Was anyone surprised? Not really.\n\n"
+    "The U.S. team, led by Prof. Jones, published the data (see p. 12). "
+    "Further work is planned..."
+)
+
+
+class ModelLoader:
+    """
+    Loads and warms up the preloaded spaCy models and tracks readiness.
+
+    status is "loading" until load() finishes, then "ready" or "failed".
+    """
+
+    def __init__(self, spacy_splitter: SpacySentenceSplitter,
+                 languages: Iterable[str] = None, mode: str = None,
+                 warmup: bool = None, warmup_text: str = None):
+        """
+        Initialize the loader. Nothing is loaded until load() or start().
+
+        Args:
+            spacy_splitter: Splitter whose models are loaded
+            languages: Languages to load (default: SPACY_PRELOAD_LANGUAGES)
+            mode: "eager" or "background"
+            warmup: Segment a warm-up text with every loaded model
+            warmup_text: Text for the warm-up
+        """
+        if languages is None:
+            languages = preload_languages()
+        if mode is None:
+            mode = os.environ.get("SEGMENT_STARTUP_MODE", "eager")
+        if warmup is None:
+            warmup = os.environ.get("SEGMENT_WARMUP", "1") != "0"
+        if warmup_text is None:
+            warmup_file = os.environ.get("SEGMENT_WARMUP_FILE")
+            if warmup_file:
+                with open(warmup_file, "r", encoding="utf-8") as f:
+                    warmup_text = f.read()
+            else:
+                warmup_text = WARMUP_TEXT
+
+        if mode not in STARTUP_MODES:
+            raise ValueError(f"SEGMENT_STARTUP_MODE must be one of {STARTUP_MODES}, got '{mode}'")
+
+        self.spacy_splitter = spacy_splitter
+        self.languages: List[str] = list(languages)
+        self.mode = mode
+        self.warmup = warmup
+        self.warmup_text = warmup_text
+
+        self.status = "loading"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once every model is loaded and warmed up."""
+        return self.status == "ready"
+
+    def start(self):
+        """Load the models in a daemon thread, unless already loaded or loading."""
+        if self.status != "loading" or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.load, name="model-loader", daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Load and warm up the models in the calling thread."""
+        start = time.perf_counter()
+        try:
+            for language in self.languages:
+                self.spacy_splitter.get_model(language)
+            loaded = time.perf_counter()
+            self.load_seconds = loaded - start
+
+            if self.warmup:
+                for language in self.languages:
+                    self.spacy_splitter.split_spans(self.warmup_text, language)
+                self.warmup_seconds = time.perf_counter() - loaded
+        except Exception as e:
+            traceback.print_exc()
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = "failed"
+            return
+
+        self.status = "ready"
+        print(f"✓ Models ready in {time.perf_counter() - start:.1f}s "
+              f"({', '.join(self.languages) or 'none preloaded'})", flush=True)
+
+    def describe(self) -> dict:
+        """
+        Summarize the loading state for the /health and /ready endpoints.
+
+        Returns:
+            Dictionary with status, languages, timings and the error if any
+        """
+        report = {"status": self.status, "languages": self.languages}
+        if self.load_seconds is not None:
+            report["load_seconds"] = round(self.load_seconds, 3)
+        if self.warmup_seconds is not None:
+            report["warmup_seconds"] = round(self.warmup_seconds, 3)
+        if self.error is not None:
+            report["error"] = self.error
+        return report
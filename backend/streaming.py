@@ -0,0 +1,218 @@
+"""
+Streaming Segmentation - Bridges Async Request Bodies and Sentence Generators
+
+The splitters' iter_sentences() methods are ordinary (blocking) generators
+that consume an iterable of text chunks. The API receives the request body
+as an async stream of bytes. This module connects the two:
+
+- the request body is decoded incrementally into text chunks
+- a worker thread runs the splitter generator over those chunks
+- sentences are handed back to the event loop in small batches
+
+Both directions use bounded queues, so a fast client cannot make the server
+buffer the whole document, and a slow reader applies backpressure to the
+splitter. The worker thread comes from the executor layer's stream pool
+(SegmentationExecutor.start_stream), which bounds how many streams run at a
+time. The event loop side never blocks and uses no other threads: the
+worker wakes it through loop.call_soon_threadsafe().
+"""
+
+import asyncio
+import codecs
+import queue
+import threading
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional
+
+# Sentinel marking the end of a queue's stream
+_END = object()
+
+# How often blocked queue operations re-check for cancellation (seconds)
+_POLL_INTERVAL = 0.1
+
+
+class _Failure:
+    """Wraps an exception raised in the worker thread."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+async def decode_chunks(byte_chunks: AsyncIterator[bytes],
+                        encoding: str = "utf-8") -> AsyncIterator[str]:
+    """
+    Decode a stream of bytes into text without buffering the whole body.
+
+    Multi-byte characters split across chunk boundaries are handled by an
+    incremental decoder.
+
+    Args:
+        byte_chunks: Async iterator of raw body chunks
+        encoding: Text encoding of the body
+
+    Yields:
+        Decoded text chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    async for data in byte_chunks:
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def _put(target: queue.Queue, item, cancelled: threading.Event) -> bool:
+    """Put into a bounded queue, giving up if the stream is cancelled."""
+    while not cancelled.is_set():
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _take(source: queue.Queue, limit: int) -> List:
+    """Take up to limit items that are already queued, without blocking."""
+    items = []
+    while len(items) < limit:
+        try:
+            items.append(source.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+
+class SentenceStream:
+    """
+    Runs a blocking sentence generator over an async stream of text chunks.
+
+    Create it on the event loop, start run() on a worker thread, then
+    iterate sentences(). cancel() stops the worker; sentences() calls it
+    when the iteration ends, and callers that never iterate must call it.
+    """
+
+    def __init__(self, segment: Callable[[Iterable[str]], Iterator[str]],
+                 max_pending_chunks: int = 4, max_pending_sentences: int = 1024):
+        """
+        Initialize the stream.
+
+        Args:
+            segment: Function taking an iterable of chunks and yielding
+                sentences, e.g. BaselineSentenceSplitter.iter_sentences
+            max_pending_chunks: Chunks buffered ahead of the splitter
+            max_pending_sentences: Sentences buffered ahead of the client
+        """
+        self.segment = segment
+        self.loop = asyncio.get_running_loop()
+        self.inbox: queue.Queue = queue.Queue(max_pending_chunks)
+        self.outbox: queue.Queue = queue.Queue(max_pending_sentences)
+        self.cancelled = threading.Event()
+        self.body_error: Optional[Exception] = None
+        self._chunk_taken = asyncio.Event()
+        self._sentences_ready = asyncio.Event()
+
+    def cancel(self):
+        """Stop the worker; safe to call from any thread, more than once."""
+        self.cancelled.set()
+
+    def run(self):
+        """Segment the incoming chunks. Runs on the worker thread."""
+        try:
+            for sentence in self.segment(self._incoming()):
+                if not self._send(sentence):
+                    return
+            self._send(_END)
+        except Exception as e:
+            self._send(_Failure(e))
+
+    def _incoming(self) -> Iterator[str]:
+        """Chunks fed by the event loop, as a blocking iterator."""
+        while True:
+            try:
+                chunk = self.inbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    return
+                continue
+            self.loop.call_soon_threadsafe(self._chunk_taken.set)
+            if chunk is _END:
+                return
+            yield chunk
+
+    def _send(self, item) -> bool:
+        """Queue an item for the event loop and wake it if it may be waiting."""
+        if not _put(self.outbox, item, self.cancelled):
+            return False
+        # The event loop only waits on an empty outbox, so waking it when the
+        # first item arrives is enough and keeps the per-sentence cost low
+        if self.outbox.qsize() == 1 or not isinstance(item, str):
+            try:
+                self.loop.call_soon_threadsafe(self._sentences_ready.set)
+            except RuntimeError:
+                # Event loop closed during shutdown
+                return False
+        return True
+
+    async def _feed(self, chunks: AsyncIterator[str]):
+        """Move chunks from the request body to the worker."""
+        try:
+            async for chunk in chunks:
+                if not await self._put_chunk(chunk):
+                    return
+            await self._put_chunk(_END)
+        except Exception as e:
+            # Reading the body failed (e.g. client disconnected)
+            self.body_error = e
+            self._sentences_ready.set()
+
+    async def _put_chunk(self, chunk) -> bool:
+        """Wait until the inbox has room for a chunk."""
+        while not self.cancelled.is_set():
+            try:
+                self.inbox.put_nowait(chunk)
+                return True
+            except queue.Full:
+                pass
+            self._chunk_taken.clear()
+            if self.inbox.full():
+                await self._chunk_taken.wait()
+        return False
+
+    async def sentences(self, chunks: AsyncIterator[str], limit: int = 256) -> AsyncIterator[List[str]]:
+        """
+        Feed chunks to the worker and yield its sentences.
+
+        Args:
+            chunks: Async iterator of text chunks
+            limit: Most sentences per yielded batch
+
+        Yields:
+            Lists of sentences, in document order
+        """
+        feeder = asyncio.ensure_future(self._feed(chunks))
+        try:
+            while True:
+                items = _take(self.outbox, limit)
+                if not items:
+                    if self.body_error is not None:
+                        raise self.body_error
+                    self._sentences_ready.clear()
+                    items = _take(self.outbox, limit)
+                    if not items:
+                        await self._sentences_ready.wait()
+                        continue
+                batch = []
+                for item in items:
+                    if item is _END:
+                        if batch:
+                            yield batch
+                        return
+                    if isinstance(item, _Failure):
+                        raise item.error
+                    batch.append(item)
+                yield batch
+        finally:
+            self.cancel()
+            feeder.cancel()
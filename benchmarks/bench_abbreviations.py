@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: baseline throughput with the per-language abbreviation lexicons.
+
+Segments the same synthetic document with every language's lexicon and with
+the legacy English set (the built-in abbreviations of at most three
+characters, the only ones that were looked up), and prints chars/s for each.
+The lexicons are larger and allow longer entries, which makes the reversed
+trie deeper; the walk still stops at the first character no abbreviation
+ends with, so throughput should not depend on the lexicon size. Exits with status 1 if any language is slower
+than the legacy set by more than --max-slowdown.
+
+Usage:
+    python benchmarks/bench_abbreviations.py [--size-mb 10] [--repeat 5] [--max-slowdown 0.05]
+"""
+
+import argparse
+import sys
+import time
+
+from common import format_size, synthetic_text
+
+from backend.baseline_splitter import SUPPORTED_LANGUAGES, BaselineSentenceSplitter
+
+# Abbreviations the splitter looked up before lexicons existed
+LEGACY_ABBREVIATIONS = (
+    'mr', 'mrs', 'ms', 'dr', 'sr', 'jr', 'vs', 'etc', 'e.g', 'i.e', 'a.m', 'p.m',
+    'am', 'pm', 'inc', 'ltd', 'st', 'ave', 'rd', 'no', 'vol', 'pp', 'fig', 'ed'
+)
+
+
+def measure(cases, text: str, repeat: int):
+    """
+    Time split_spans for every case, interleaving the cases to cancel drift.
+
+    Args:
+        cases: (name, splitter, language) tuples
+        text: Document to segment
+        repeat: Rounds; the fastest run of each case is kept
+
+    Returns:
+        Dictionary of name -> chars/s
+    """
+    best = {name: float("inf") for name, _, _ in cases}
+    for _ in range(repeat):
+        for name, splitter, language in cases:
+            start = time.perf_counter()
+            splitter.split_spans(text, language)
+            best[name] = min(best[name], time.perf_counter() - start)
+    return {name: len(text) / seconds for name, seconds in best.items()}
+
+
+def main():
+    """Compare every lexicon against the legacy set and apply the threshold."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per measurement; the fastest is reported")
+    parser.add_argument("--max-slowdown", type=float, default=0.05)
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    text = synthetic_text(size)
+    lexicons = BaselineSentenceSplitter()
+    legacy = BaselineSentenceSplitter(abbreviations={"en": LEGACY_ABBREVIATIONS})
+    cases = [("legacy", legacy, "en")] + [
+        (language, lexicons, language) for language in SUPPORTED_LANGUAGES
+    ]
+    speeds = measure(cases, text, args.repeat)
+
+    print(f"Document: {format_size(size)}")
+    print(f"\n{'Lexicon':<10} {'Entries':<9} {'Longest':<9} {'chars/s':<14} {'vs legacy'}")
+    print("-" * 53)
+    worst = 0.0
+    for name, splitter, language in cases:
+        abbreviations = splitter._get_lexicon(language).abbreviations
+        longest = max(map(len, abbreviations))
+        change = speeds[name] / speeds["legacy"] - 1
+        if name != "legacy":
+            worst = min(worst, change)
+        print(f"{name:<10} {len(abbreviations):<9} {longest:<9} {speeds[name]:<14,.0f} {change:+.1%}")
+
+    if -worst > args.max_slowdown:
+        print(f"\nFAIL: slowdown {-worst:.1%} exceeds {args.max_slowdown:.0%}")
+        return 1
+    print(f"\nOK: slowdown at most {max(0.0, -worst):.1%} (limit {args.max_slowdown:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
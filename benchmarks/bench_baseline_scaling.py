@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-character cost of BaselineSentenceSplitter.split.
+
+Runs the baseline splitter on synthetic documents from 1 KB to 50 MB and
+prints the time per character. A linear-time splitter shows a flat ns/char
+column across all sizes.
+
+Usage:
+    python benchmarks/bench_baseline_scaling.py [--max-mb 50]
+"""
+
+import argparse
+import time
+
+from common import format_size, synthetic_text
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+
+
+def main():
+    """Run the scaling benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-mb", type=float, default=50,
+                        help="Largest document size in MB (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per size; the fastest is reported")
+    args = parser.parse_args()
+
+    splitter = BaselineSentenceSplitter()
+    sizes = [1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024]
+    sizes = [s for s in sizes if s <= args.max_mb * 1024 * 1024]
+
+    print(f"{'Size':<10} {'Sentences':<12} {'Seconds':<12} {'ns/char':<10}")
+    print("-" * 46)
+    for size in sizes:
+        text = synthetic_text(size)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            sentences = splitter.split(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"{format_size(size):<10} {len(sentences):<12} {best:<12.4f} {best / size * 1e9:<10.1f}")
+
+
+if __name__ == "__main__":
+    main()
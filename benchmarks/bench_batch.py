@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-document vs batched spaCy segmentation.
+
+Segments 10,000 tweet-sized documents (one or two gold sentences each) once
+with one SpacySentenceSplitter.split call per document and once through
+SpacySentenceSplitter.split_many, and reports documents per second.
+
+Usage:
+    python benchmarks/bench_batch.py [--docs 10000] [--batch-size 256] [--n-process 1]
+"""
+
+import argparse
+import time
+
+from common import load_gold_datasets
+
+from backend.spacy_splitter import SpacySentenceSplitter
+
+
+def short_documents(count: int):
+    """
+    Build `count` short documents from the gold standard sentences.
+
+    Args:
+        count: Number of documents
+
+    Returns:
+        List of documents made of one or two consecutive gold sentences
+    """
+    sentences = [s for d in load_gold_datasets() for s in d['sentences']]
+    docs = []
+    for i in range(count):
+        first = sentences[i % len(sentences)]
+        if i % 2:
+            docs.append(first + " " + sentences[(i + 1) % len(sentences)])
+        else:
+            docs.append(first)
+    return docs
+
+
+def main():
+    """Run both paths and print docs/sec."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    splitter = SpacySentenceSplitter()
+    docs = short_documents(args.docs)
+
+    # Warm up the model so loading cost is not measured
+    splitter.split(docs[0], args.language)
+
+    start = time.perf_counter()
+    single = [splitter.split(doc, args.language) for doc in docs]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = splitter.split_many(docs, args.language,
+                                batch_size=args.batch_size, n_process=args.n_process)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for s, b in zip(single, batch) if s != b["sentences"])
+
+    print(f"{'Path':<24} {'Seconds':<10} {'Docs/sec':<10}")
+    print("-" * 44)
+    print(f"{'split() per document':<24} {single_time:<10.2f} {len(docs) / single_time:<10.0f}")
+    print(f"{'split_many()':<24} {batch_time:<10.2f} {len(docs) / batch_time:<10.0f}")
+    print(f"\nSpeedup: {single_time / batch_time:.2f}x, differing documents: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
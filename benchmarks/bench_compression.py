@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /segment latency and bytes on the wire with compressed transport.
+
+Starts the API (result cache off) and sends generated documents to /segment
+with the baseline method. The documents are random sentences over the gold
+vocabulary rather than repeated gold paragraphs, which would compress
+unrealistically well; they compress about 3x, like ordinary prose.
+Variants:
+    json               JSON request, uncompressed response (as before)
+    json, gzip         gzip JSON request, gzip response
+    json, zstd         zstd JSON request, gzip response (needs zstandard)
+    text, gzip         gzip text/plain request, gzip response
+    text, gzip, spans  as above with output=spans
+Latency is the median over --repeat requests on localhost and includes the
+client compressing the request and decompressing the response. The last
+column adds the time the bytes would take on a --mbps link.
+
+Usage:
+    python benchmarks/bench_compression.py [--sizes 1048576,10485760,52428800] [--mbps 100]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import statistics
+import time
+import urllib.request
+
+from common import format_size, load_gold_datasets, start_server
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def prose_text(size: int, seed: int = 0) -> str:
+    """
+    Generate `size` characters of random sentences over the gold vocabulary.
+
+    Args:
+        size: Document size in characters
+        seed: Random seed, so every run sends the same documents
+
+    Returns:
+        Text of sentences with 5-25 words each
+    """
+    words = sorted({word for dataset in load_gold_datasets()
+                    for word in re.findall(r"[A-Za-z']+", dataset["text"])})
+    rng = random.Random(seed)
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(5, 25)))
+        sentence = sentence[0].upper() + sentence[1:] + rng.choice(".....?!") + " "
+        sentences.append(sentence)
+        length += len(sentence)
+    return "".join(sentences)[:size]
+
+
+def variants(text: str, level: int) -> list:
+    """
+    Build the request variants to compare.
+
+    Args:
+        text: Document to segment
+        level: Client-side gzip level
+
+    Returns:
+        List of (label, query string, headers, function returning the body)
+    """
+    document = json.dumps({"text": text, "method": "baseline"}).encode("utf-8")
+    plain = text.encode("utf-8")
+    json_headers = {"Content-Type": "application/json"}
+    text_headers = {"Content-Type": "text/plain; charset=utf-8"}
+    compressed = {"Content-Encoding": "gzip", "Accept-Encoding": "gzip"}
+
+    rows = [
+        ("json", "", dict(json_headers, **{"Accept-Encoding": "identity"}), lambda: document),
+        ("json, gzip", "", dict(json_headers, **compressed),
+         lambda: gzip.compress(document, level)),
+    ]
+    if zstandard is not None:
+        rows.append(("json, zstd", "", {**json_headers, **compressed, "Content-Encoding": "zstd"},
+                     lambda: zstandard.ZstdCompressor().compress(document)))
+    rows += [
+        ("text, gzip", "?method=baseline", dict(text_headers, **compressed),
+         lambda: gzip.compress(plain, level)),
+        ("text, gzip, spans", "?method=baseline&output=spans", dict(text_headers, **compressed),
+         lambda: gzip.compress(plain, level)),
+    ]
+    return rows
+
+
+def send(port: int, query: str, headers: dict, make_body) -> tuple:
+    """
+    Send one /segment request.
+
+    Returns:
+        (seconds, request bytes, response bytes, decoded response)
+    """
+    start = time.perf_counter()
+    body = make_body()
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/segment{query}",
+                                     data=body, headers=headers)
+    with urllib.request.urlopen(request) as response:
+        raw = response.read()
+        encoded = response.headers.get("Content-Encoding") == "gzip"
+    result = json.loads(gzip.decompress(raw) if encoded else raw)
+    return time.perf_counter() - start, len(body), len(raw), result
+
+
+def main():
+    """Run every variant against every document size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1048576,10485760,52428800",
+                        help="Comma-separated document sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mbps", type=float, default=100, help="Link speed for the estimate")
+    parser.add_argument("--client-level", type=int, default=1, help="Client gzip level")
+    parser.add_argument("--port", type=int, default=8775)
+    args = parser.parse_args()
+
+    if zstandard is None:
+        print("zstandard is not installed; skipping the zstd rows")
+
+    server = start_server(args.port, env={"SEGMENT_CACHE_MAX_BYTES": "0"})
+    try:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            text = prose_text(size)
+            print(f"\n{format_size(size)} document")
+            print(f"{'Variant':<19} {'Up':<9} {'Down':<9} {'Latency ms':<12} {f'At {args.mbps:g} Mbit/s ms'}")
+            print("-" * 68)
+            expected = None
+            for label, query, headers, make_body in variants(text, args.client_level):
+                send(args.port, query, headers, make_body)  # warm-up
+                runs = [send(args.port, query, headers, make_body) for _ in range(args.repeat)]
+                _, up, down, result = runs[-1]
+                if "sentences" in result:
+                    expected = expected or result["sentences"]
+                    assert result["sentences"] == expected, f"{label}: different sentences"
+                latency = statistics.median(run[0] for run in runs)
+                on_link = latency + (up + down) * 8 / (args.mbps * 1e6)
+                print(f"{label:<19} {format_size(up):<9} {format_size(down):<9} "
+                      f"{latency * 1000:<12.0f} {on_link * 1000:.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
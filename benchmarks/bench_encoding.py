@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /segment response serialization time and size per encoding.
+
+Segments synthetic documents with the baseline splitter, then serializes the
+response the way the API did before (pydantic SegmentationResponse +
+model_dump_json) and with every encoding in backend/encoding.py. Times are
+the best of --repeat runs and cover building the response from the splitter
+output, i.e. everything after segmentation.
+
+Usage:
+    python benchmarks/bench_encoding.py [--sizes 1048576,10485760] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from common import format_size, synthetic_text
+
+from backend import encoding
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.main import SegmentationResponse
+
+
+def best_time(func, repeat: int):
+    """Return (best seconds, result) of calling func() `repeat` times."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def encoders(text: str, spans):
+    """
+    Build the serializers to compare.
+
+    Args:
+        text: Segmented document
+        spans: Its SentenceSpans
+
+    Returns:
+        List of (encoding, output, function returning the body)
+    """
+    common = {"method": "baseline", "language": "en"}
+
+    def pydantic_sentences():
+        sentences = spans.texts(text)
+        return SegmentationResponse(sentences=sentences, count=len(sentences),
+                                    **common).model_dump_json(exclude_none=True).encode("utf-8")
+
+    def pydantic_spans():
+        return SegmentationResponse(spans=spans.to_list(), count=len(spans),
+                                    **common).model_dump_json(exclude_none=True).encode("utf-8")
+
+    def fields(output):
+        items = spans if output == "spans" else spans.texts(text)
+        return dict({output: items, "count": len(items)}, **common)
+
+    json_name = "orjson" if encoding.orjson is not None else "json"
+    rows = [
+        ("pydantic (before)", "sentences", pydantic_sentences),
+        ("pydantic (before)", "spans", pydantic_spans),
+        (json_name, "sentences", lambda: encoding.encode_response(encoding.JSON, fields("sentences"))),
+        (json_name, "spans", lambda: encoding.encode_response(encoding.JSON, fields("spans"))),
+    ]
+    if encoding.msgpack is not None:
+        rows += [
+            ("msgpack", "sentences", lambda: encoding.encode_response(encoding.MSGPACK, fields("sentences"))),
+            ("msgpack", "spans", lambda: encoding.encode_response(encoding.MSGPACK, fields("spans"))),
+        ]
+    rows.append(("offsets", "spans", lambda: encoding.encode_response(encoding.OFFSETS, fields("spans"))))
+    return rows
+
+
+def main():
+    """Print serialization time and size for every encoding and document size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1048576,10485760",
+                        help="Comma-separated document sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if encoding.msgpack is None:
+        print("msgpack is not installed; skipping the MessagePack rows\n")
+
+    splitter = BaselineSentenceSplitter()
+    for size in [int(s) for s in args.sizes.split(",")]:
+        text = synthetic_text(size)
+        spans = splitter.split_spans(text)
+        print(f"\n{format_size(size)} document, {len(spans)} sentences")
+        print(f"{'Encoding':<18} {'Output':<10} {'Serialize ms':<13} {'Bytes':<12} {'vs before'}")
+        print("-" * 64)
+        before = {}
+        for name, output, func in encoders(text, spans):
+            seconds, body = best_time(func, args.repeat)
+            before.setdefault(output, seconds)
+            print(f"{name:<18} {output:<10} {seconds * 1000:<13.1f} {len(body):<12} "
+                  f"{before[output] / seconds:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: accuracy and throughput of the hybrid splitter against spaCy.
+
+Scores the gold standard datasets with the baseline, spaCy and hybrid
+splitters (micro-averaged precision/recall/F1, same boundary matching as
+evaluation/evaluate.py), then measures throughput and the share of text the
+hybrid sends to spaCy on two documents:
+    gold   the gold paragraphs repeated; built to be full of abbreviations,
+           quotes and numbers, so this is close to the worst case
+    prose  ordinary running text: paragraphs of --prose (default: the prose
+           paragraphs of ACADEMIC_REPORT.md) repeated
+
+Exits with status 1 if the hybrid's F1 is more than --tolerance below spaCy's.
+
+Usage:
+    python benchmarks/bench_hybrid.py [--language en] [--size-kb 512] [--tolerance 0.01]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from common import PROJECT_ROOT, load_gold_datasets, synthetic_text
+
+from backend.hybrid_splitter import HybridSentenceSplitter
+from evaluation.evaluate import SegmentationEvaluator
+
+DEFAULT_PROSE = os.path.join(PROJECT_ROOT, "ACADEMIC_REPORT.md")
+
+
+def prose_text(path: str, size: int) -> str:
+    """
+    Build a document of roughly `size` characters from running text.
+
+    Only paragraphs that start with a letter and are longer than 200
+    characters are kept, which drops Markdown headings, lists, tables and
+    code blocks.
+
+    Args:
+        path: Plain text or Markdown file
+        size: Target document size in characters
+
+    Returns:
+        Whole paragraphs separated by blank lines, truncated to `size`
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", f.read())]
+    paragraphs = [p for p in paragraphs if len(p) > 200 and p[0].isalpha()]
+    block = "\n\n".join(paragraphs) + "\n\n"
+    return (block * (size // len(block) + 1))[:size]
+
+
+def score(evaluator: SegmentationEvaluator, split_spans) -> dict:
+    """
+    Score a splitter on all gold datasets with micro-averaged metrics.
+
+    Args:
+        evaluator: Evaluator providing the boundary helpers
+        split_spans: Function text -> SentenceSpans
+
+    Returns:
+        Dictionary with precision, recall and f1_score
+    """
+    def documents():
+        for dataset in load_gold_datasets():
+            text = dataset['text']
+            spans = split_spans(text)
+            gold = evaluator._get_sentence_boundaries(text, dataset['sentences'])
+            yield (gold, evaluator._get_span_boundaries(spans),
+                   len(dataset['sentences']), len(spans))
+
+    return evaluator.calculate_corpus_metrics(documents())["micro"]
+
+
+def throughput(split_spans, text: str, repeat: int = 3) -> float:
+    """Return the best chars/s of split_spans(text) over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        split_spans(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text) / best
+
+
+def main():
+    """Print the accuracy and throughput tables and apply the F1 tolerance."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--pipeline", default=None, help="spaCy pipeline profile")
+    parser.add_argument("--size-kb", type=int, default=512,
+                        help="Size of the throughput documents in KB")
+    parser.add_argument("--prose", default=DEFAULT_PROSE,
+                        help="Text or Markdown file for the prose document")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Allowed F1 drop versus spaCy")
+    args = parser.parse_args()
+
+    evaluator = SegmentationEvaluator()
+    # Measure the model itself, not the process pool for large documents
+    evaluator.spacy_splitter.parallel_threshold = 0
+    hybrid = HybridSentenceSplitter(evaluator.spacy_splitter, evaluator.baseline_splitter)
+    language, pipeline = args.language, args.pipeline
+    evaluator.spacy_splitter.get_model(language, pipeline)
+
+    systems = {
+        "baseline": lambda text: evaluator.baseline_splitter.split_spans(text, language),
+        "spacy": lambda text: evaluator.spacy_splitter.split_spans(text, language, pipeline),
+        "hybrid": lambda text: hybrid.split_spans(text, language, pipeline),
+    }
+
+    print(f"{'System':<10} {'Precision':<10} {'Recall':<10} {'F1'}")
+    print("-" * 38)
+    f1 = {}
+    for name, split_spans in systems.items():
+        metrics = score(evaluator, split_spans)
+        f1[name] = metrics["f1_score"]
+        print(f"{name:<10} {metrics['precision']:<10.4f} {metrics['recall']:<10.4f} "
+              f"{metrics['f1_score']:.4f}")
+
+    size = args.size_kb * 1024
+    documents = {"gold": synthetic_text(size), "prose": prose_text(args.prose, size)}
+    print(f"\n{'Document':<10} {'spaCy KB/s':<12} {'Hybrid KB/s':<13} {'Speedup':<9} {'Sent to spaCy'}")
+    print("-" * 58)
+    for name, text in documents.items():
+        spacy_speed = throughput(systems["spacy"], text)
+        hybrid_speed = throughput(systems["hybrid"], text)
+        fraction = hybrid.split_spans_with_fraction(text, language, pipeline)[1]
+        print(f"{name:<10} {spacy_speed / 1024:<12.0f} {hybrid_speed / 1024:<13.0f} "
+              f"{hybrid_speed / spacy_speed:<9.1f} {fraction:.1%}")
+
+    drop = f1["spacy"] - f1["hybrid"]
+    if drop > args.tolerance:
+        print(f"\nFAIL: hybrid F1 is {drop:.4f} below spaCy (tolerance {args.tolerance})")
+        return 1
+    print(f"\nOK: hybrid F1 within {args.tolerance} of spaCy ({drop:+.4f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
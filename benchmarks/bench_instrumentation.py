@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: overhead of the /metrics instrumentation on the baseline path.
+
+Starts the API twice, with SEGMENT_METRICS=1 and SEGMENT_METRICS=0 (result
+cache disabled in both), sends the same sequence of baseline /segment
+requests to each and compares median latency. The two servers are measured
+in alternating rounds to cancel out drift. Exits with status 1 if the
+overhead exceeds --max-overhead.
+
+Usage:
+    python benchmarks/bench_instrumentation.py [--requests 500] [--rounds 3] [--max-overhead 0.02]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import urllib.request
+
+from common import format_size, start_server, synthetic_text
+
+from backend import metrics
+
+PORTS = {"on": 8771, "off": 8772}
+
+
+def time_requests(port: int, text: str, count: int) -> float:
+    """
+    Send `count` baseline /segment requests and return the median latency.
+
+    Args:
+        port: Server port
+        text: Document to segment
+        count: Number of requests
+
+    Returns:
+        Median latency in seconds
+    """
+    body = json.dumps({"text": text, "language": "en", "method": "baseline"}).encode("utf-8")
+    latencies = []
+    for _ in range(count):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}/segment", data=body,
+                                         headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def observe_cost(samples: int = 200000) -> float:
+    """Return the cost of one histogram observation in nanoseconds."""
+    histogram = metrics.Histogram("bench_seconds", "benchmark", ("method", "language", "stage"))
+    start = time.perf_counter()
+    for _ in range(samples):
+        histogram.observe(0.003, "baseline", "en", "segment")
+    return (time.perf_counter() - start) / samples * 1e9
+
+
+def main():
+    """Print per-size overhead and apply the threshold."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per size and round")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-overhead", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"Histogram.observe: {observe_cost():.0f} ns per call")
+
+    servers = {
+        name: start_server(port, {"SEGMENT_METRICS": "1" if name == "on" else "0",
+                                  "SEGMENT_CACHE_MAX_BYTES": "0"})
+        for name, port in PORTS.items()
+    }
+    worst = 0.0
+    try:
+        print(f"\n{'Size':<8} {'Off (ms)':<10} {'On (ms)':<10} {'Overhead'}")
+        print("-" * 38)
+        for size in (1024, 10 * 1024, 100 * 1024):
+            text = synthetic_text(size)
+            medians = {"on": [], "off": []}
+            for name, port in PORTS.items():
+                time_requests(port, text, 20)  # warm-up
+            for _ in range(args.rounds):
+                for name, port in PORTS.items():
+                    medians[name].append(time_requests(port, text, args.requests))
+            on, off = min(medians["on"]), min(medians["off"])
+            overhead = (on - off) / off
+            worst = max(worst, overhead)
+            print(f"{format_size(size):<8} {off * 1000:<10.3f} {on * 1000:<10.3f} {overhead:+.2%}")
+    finally:
+        for server in servers.values():
+            server.terminate()
+            server.wait()
+
+    if worst > args.max_overhead:
+        print(f"\nFAIL: overhead {worst:.2%} exceeds {args.max_overhead:.0%}")
+        return 1
+    print(f"\nOK: overhead at most {worst:.2%} (limit {args.max_overhead:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
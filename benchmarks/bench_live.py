@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: edit-to-update latency of /segment/live on a large document.
+
+Starts the API (result cache off), loads a synthetic document into a
+/segment/live connection and sends --edits random edits, one at a time:
+typing a character, deleting one, ending a sentence inside a paragraph,
+inserting a paragraph break and deleting one (which merges two paragraphs).
+The latency of an edit is the time from sending it to receiving its diff.
+For comparison, the table also shows a full POST /segment of the same
+document, which is what re-segmenting on every keystroke costs.
+
+After the edits the sentence list rebuilt from the diffs is compared with a
+fresh reset of the final text over a new connection.
+
+Needs the websockets package (installed with uvicorn[standard]).
+
+Usage:
+    python benchmarks/bench_live.py [--size 1048576] [--edits 200] [--methods baseline,spacy]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import urllib.request
+
+from common import format_size, percentile, start_server, synthetic_text
+
+try:
+    from websockets.sync.client import connect
+except ImportError:
+    connect = None
+
+
+def random_edit(rng: random.Random, text: str) -> tuple:
+    """
+    Pick a random edit of the text.
+
+    Returns:
+        (kind, offset, characters deleted, inserted text)
+    """
+    kind = rng.choice(("type", "delete", "sentence", "split", "merge"))
+    if kind == "merge":
+        position = text.find("\n\n", rng.randrange(len(text)))
+        if position >= 0:
+            return kind, position, 2, " "
+        kind = "split"
+    offset = rng.randrange(len(text))
+    if kind == "type":
+        return kind, offset, 0, rng.choice("abcdefghij ")
+    if kind == "delete":
+        return kind, offset, 1, ""
+    if kind == "sentence":
+        return kind, offset, 0, ". New"
+    return kind, offset, 0, "\n\n"
+
+
+def request(socket, message: dict) -> tuple:
+    """Send one message and wait for its reply; returns (seconds, reply)."""
+    start = time.perf_counter()
+    socket.send(json.dumps(message))
+    reply = json.loads(socket.recv())
+    seconds = time.perf_counter() - start
+    if reply["type"] == "error":
+        raise RuntimeError(f"{message['type']} failed: {reply['detail']}")
+    return seconds, reply
+
+
+def full_segment(port: int, text: str, method: str, pipeline: str, repeat: int = 3) -> float:
+    """Median seconds of a POST /segment of the whole document."""
+    body = json.dumps({"text": text, "method": method, "pipeline": pipeline}).encode("utf-8")
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        http_request = urllib.request.Request(f"http://127.0.0.1:{port}/segment", data=body,
+                                              headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(http_request) as response:
+            response.read()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_method(port: int, text: str, method: str, pipeline: str, edits: int, seed: int) -> dict:
+    """Load the document, apply random edits and check the final sentences."""
+    rng = random.Random(seed)
+    url = f"ws://127.0.0.1:{port}/segment/live"
+    reset = {"type": "reset", "text": text, "method": method, "pipeline": pipeline}
+    with connect(url, max_size=None) as socket:
+        load_seconds, reply = request(socket, reset)
+        sentences = reply["sentences"]
+
+        latencies, server_ms = [], []
+        for _ in range(edits):
+            _, offset, delete, insert = random_edit(rng, text)
+            seconds, diff = request(socket, {"type": "replace", "offset": offset,
+                                             "length": delete, "text": insert})
+            text = text[:offset] + insert + text[offset + delete:]
+            sentences[diff["start"]:diff["start"] + diff["delete"]] = diff["sentences"]
+            latencies.append(seconds)
+            server_ms.append(diff["elapsed_ms"])
+
+    with connect(url, max_size=None) as socket:
+        _, fresh = request(socket, dict(reset, text=text))
+    assert sentences == fresh["sentences"], f"{method}: live sentences differ from a fresh reset"
+
+    return {
+        "load_ms": load_seconds * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "server_p50_ms": percentile(server_ms, 50),
+        "full_ms": full_segment(port, text, method, pipeline) * 1000,
+        "sentences": len(sentences),
+    }
+
+
+def main():
+    """Measure edit latency for every method and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="Document size in characters")
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--methods", default="baseline,spacy,hybrid")
+    parser.add_argument("--pipeline", help="spaCy pipeline profile (default: server default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8777)
+    args = parser.parse_args()
+
+    if connect is None:
+        print("websockets is not installed: pip install websockets")
+        return
+
+    text = synthetic_text(args.size)
+    server = start_server(args.port, env={"SEGMENT_CACHE_MAX_BYTES": "0"})
+    try:
+        print(f"\n{format_size(args.size)} document, {args.edits} edits per method")
+        print(f"{'Method':<10} {'Sentences':<10} {'Load ms':<9} {'Edit p50':<9} {'Edit p99':<9} "
+              f"{'Server p50':<11} {'Full /segment ms'}")
+        print("-" * 78)
+        for method in args.methods.split(","):
+            result = run_method(args.port, text, method, args.pipeline, args.edits, args.seed)
+            print(f"{method:<10} {result['sentences']:<10} {result['load_ms']:<9.0f} "
+                  f"{result['p50_ms']:<9.2f} {result['p99_ms']:<9.2f} "
+                  f"{result['server_p50_ms']:<11.2f} {result['full_ms']:.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
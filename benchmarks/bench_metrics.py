@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: boundary matching speed of the evaluation metrics.
+
+Builds synthetic gold boundaries and noisy predictions (shifted, dropped
+and spurious boundaries) and times match_boundaries() and the corpus-level
+API. A small case is also scored with the previous nested-loop matcher to
+show the speedup and where it double-counted predictions.
+
+Usage:
+    python benchmarks/bench_metrics.py [--boundaries 1000000] [--documents 1000]
+"""
+
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the project root on sys.path)
+
+from evaluation.evaluate import BOUNDARY_TOLERANCE, SegmentationEvaluator, match_boundaries
+
+
+def synthetic_boundaries(count: int, seed: int = 0):
+    """
+    Build sorted gold and predicted boundary lists.
+
+    Args:
+        count: Number of gold boundaries
+        seed: Random seed
+
+    Returns:
+        (gold, predicted) sorted lists of distinct positions
+    """
+    rng = random.Random(seed)
+    gold = []
+    position = 0
+    for _ in range(count):
+        position += rng.randint(3, 200)
+        gold.append(position)
+    predicted = {pos + rng.randint(-7, 7) for pos in gold if rng.random() < 0.9}
+    predicted.update(rng.randint(0, position) for _ in range(count // 10))
+    return gold, sorted(predicted)
+
+
+def nested_loop_matches(gold, predicted, tolerance: int = BOUNDARY_TOLERANCE) -> int:
+    """The previous O(n*m) matcher, kept here for comparison only."""
+    tp = 0
+    for gold_pos in gold:
+        for pred_pos in predicted:
+            if abs(gold_pos - pred_pos) <= tolerance:
+                tp += 1
+                break
+    return tp
+
+
+def main():
+    """Print matching timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boundaries", type=int, default=1000000)
+    parser.add_argument("--documents", type=int, default=1000,
+                        help="Documents the boundaries are split into for the corpus API")
+    args = parser.parse_args()
+
+    gold, predicted = synthetic_boundaries(args.boundaries)
+
+    start = time.perf_counter()
+    tp = match_boundaries(gold, predicted)
+    elapsed = time.perf_counter() - start
+    print(f"match_boundaries: {len(gold):,} gold vs {len(predicted):,} predicted "
+          f"-> {tp:,} matches in {elapsed:.3f}s")
+
+    # The same boundaries scored as a corpus of equally sized documents
+    evaluator = SegmentationEvaluator()
+    step = gold[-1] // args.documents + 1
+
+    def documents():
+        g = p = 0
+        for index in range(args.documents):
+            end = (index + 1) * step
+            g_start, p_start = g, p
+            while g < len(gold) and gold[g] < end:
+                g += 1
+            while p < len(predicted) and predicted[p] < end:
+                p += 1
+            yield gold[g_start:g], predicted[p_start:p], g - g_start + 1, p - p_start + 1
+
+    start = time.perf_counter()
+    corpus = evaluator.calculate_corpus_metrics(documents())
+    elapsed = time.perf_counter() - start
+    print(f"calculate_corpus_metrics: {corpus['documents']} documents in {elapsed:.3f}s")
+    print(f"  micro F1 {corpus['micro']['f1_score']:.4f}, macro F1 {corpus['macro']['f1_score']:.4f}")
+
+    small_gold, small_predicted = gold[:5000], predicted[:5000]
+    start = time.perf_counter()
+    old_tp = nested_loop_matches(small_gold, small_predicted)
+    old_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    new_tp = match_boundaries(small_gold, small_predicted)
+    new_elapsed = time.perf_counter() - start
+    print(f"\n5,000 boundaries: nested loop {old_elapsed:.3f}s ({old_tp} matches), "
+          f"two-pointer {new_elapsed:.4f}s ({new_tp} one-to-one matches)")
+
+
+if __name__ == "__main__":
+    main()
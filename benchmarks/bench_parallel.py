@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parallel chunked spaCy segmentation of single large documents.
+
+For each document size this times SpacySentenceSplitter.split_spans with
+1, 2, 4 and 8 worker processes and reports the speedup over one worker.
+It then checks that the parallel result agrees with a single spaCy pass
+over a smaller document (spaCy's max_length is raised for that pass only).
+
+Usage:
+    python benchmarks/bench_parallel.py [--sizes-mb 10 50 100] [--workers 1 2 4 8]
+                                        [--profile senter] [--agreement-mb 2]
+"""
+
+import argparse
+import time
+
+from common import format_size, synthetic_text
+
+from backend.spacy_splitter import SpacySentenceSplitter
+
+
+def time_split(text: str, language: str, profile: str, workers: int) -> float:
+    """
+    Time one parallel split of text.
+
+    Args:
+        text: Document to segment
+        language: Language code
+        profile: Pipeline profile
+        workers: Number of worker processes
+
+    Returns:
+        Elapsed seconds
+    """
+    splitter = SpacySentenceSplitter(preload=[], parallel_threshold=1,
+                                     parallel_workers=workers)
+    splitter.get_model(language, profile)
+    try:
+        start = time.perf_counter()
+        splitter.split_spans(text, language, profile)
+        return time.perf_counter() - start
+    finally:
+        splitter.shutdown()
+
+
+def check_agreement(text: str, language: str, profile: str, workers: int) -> float:
+    """
+    Compare parallel boundaries with a single spaCy pass.
+
+    Args:
+        text: Document to segment
+        language: Language code
+        profile: Pipeline profile
+        workers: Number of worker processes for the parallel run
+
+    Returns:
+        Fraction of single-pass spans also produced by the parallel run
+    """
+    splitter = SpacySentenceSplitter(preload=[], parallel_threshold=1,
+                                     parallel_workers=workers)
+    model = splitter.get_model(language, profile)
+    try:
+        parallel = set(splitter.split_spans(text, language, profile))
+        model.max_length = max(model.max_length, len(text) + 1)
+        single = set(splitter._doc_spans(model(text)))
+    finally:
+        splitter.shutdown()
+    return len(single & parallel) / len(single) if single else 1.0
+
+
+def main():
+    """Print the speedup table and the agreement check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--profile", default="senter")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--agreement-mb", type=int, default=2,
+                        help="Size of the document used for the agreement check")
+    args = parser.parse_args()
+
+    print(f"\n{'Size':<10} {'Workers':<8} {'Seconds':<10} {'MB/s':<8} {'Speedup'}")
+    print("-" * 46)
+    for size_mb in args.sizes_mb:
+        text = synthetic_text(size_mb * 1024 * 1024)
+        baseline = None
+        for workers in args.workers:
+            elapsed = time_split(text, args.language, args.profile, workers)
+            baseline = baseline or elapsed
+            print(f"{format_size(len(text)):<10} {workers:<8} {elapsed:<10.2f} "
+                  f"{len(text) / elapsed / 1024 / 1024:<8.2f} {baseline / elapsed:.2f}x")
+
+    text = synthetic_text(args.agreement_mb * 1024 * 1024)
+    agreement = check_agreement(text, args.language, args.profile, max(args.workers))
+    print(f"\nAgreement with single pass on {format_size(len(text))}: {agreement:.4%}")
+
+
+if __name__ == "__main__":
+    main()
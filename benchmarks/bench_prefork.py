@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark: server memory with pre-forked workers versus uvicorn --workers.
+
+For each worker count, starts the API with
+    prefork  python run_server.py --workers N  (models loaded once, then fork)
+    uvicorn  python -m uvicorn backend.main:app --workers N  (models per worker)
+sends a few spaCy requests per worker, waits for memory to settle and reads
+/proc/<pid>/smaps_rollup of every process in the server's tree:
+    RSS  resident pages, shared ones counted in every process that maps them
+    PSS  shared pages divided between the processes sharing them; the sum
+         over all processes is the real memory used by the server
+    USS  pages private to the process (what a worker costs on its own)
+
+Per-worker columns are averages over the worker processes; totals include
+the parent. Linux only.
+
+Usage:
+    python benchmarks/bench_prefork.py [--workers 1,4,16] [--languages en]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+from common import start_server
+
+MODES = {
+    "prefork": ["run_server.py", "--workers"],
+    "uvicorn": ["-m", "uvicorn", "backend.main:app", "--workers"],
+}
+
+
+def descendants(pid: int) -> List[int]:
+    """Return the pids of all processes below `pid` in the process tree."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces; fields after it are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """
+    Read the RSS, PSS and USS of a process from smaps_rollup.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dictionary with rss, pss and uss in kB
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def worker_pids(pid: int) -> List[int]:
+    """
+    Return the worker processes of a server.
+
+    The pre-fork parent and the uvicorn multiprocess supervisor have the
+    workers as children; a single uvicorn worker is the server process itself.
+    Helpers such as the multiprocessing resource tracker are left out.
+    """
+    workers = []
+    for child in descendants(pid):
+        try:
+            with open(f"/proc/{child}/cmdline", "rb") as f:
+                if b"resource_tracker" not in f.read():
+                    workers.append(child)
+        except OSError:
+            pass
+    return workers or [pid]
+
+
+def warm_up(port: int, requests: int):
+    """Send spaCy requests so every worker has touched the model pages."""
+    body = json.dumps({
+        "text": "Dr. Smith arrived at 5 p.m. He sat down. The meeting started.",
+        "language": "en", "method": "spacy",
+    }).encode("utf-8")
+    for _ in range(requests):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/segment", data=body,
+            headers={"Content-Type": "application/json"}
+        )
+        urllib.request.urlopen(request, timeout=60).read()
+
+
+def settle(pid: int, workers: int, timeout: float = 300) -> None:
+    """Wait until all workers exist and the total RSS stops growing."""
+    deadline = time.time() + timeout
+    previous = -1
+    while time.time() < deadline:
+        pids = worker_pids(pid)
+        try:
+            total = sum(memory_kb(p)["rss"] for p in {pid, *pids})
+        except OSError:
+            total = -1
+        if len(pids) >= workers and abs(total - previous) <= 0.01 * total:
+            return
+        previous = total
+        time.sleep(2)
+
+
+def measure(mode: str, workers: int, port: int, env: dict) -> dict:
+    """
+    Start one server configuration and measure its memory.
+
+    Args:
+        mode: Key of MODES
+        workers: Number of worker processes
+        port: Port for the server
+        env: Extra environment variables
+
+    Returns:
+        Per-worker averages and totals in MB
+    """
+    server = start_server(port, env, MODES[mode] + [str(workers)])
+    try:
+        settle(server.pid, workers)
+        warm_up(port, 10 * workers)
+        settle(server.pid, workers)
+
+        pids = worker_pids(server.pid)
+        memory = {p: memory_kb(p) for p in {server.pid, *pids}}
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    report = {"workers": len(pids)}
+    for key in ("rss", "pss", "uss"):
+        report[f"worker_{key}"] = sum(memory[p][key] for p in pids) / len(pids) / 1024
+        report[f"total_{key}"] = sum(m[key] for m in memory.values()) / 1024
+    return report
+
+
+def main():
+    """Measure every mode and worker count and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="1,4,16",
+                        help="Comma-separated worker counts")
+    parser.add_argument("--languages", default="en",
+                        help="SPACY_PRELOAD_LANGUAGES for both modes")
+    parser.add_argument("--port", type=int, default=8771)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("This benchmark needs Linux /proc/<pid>/smaps_rollup")
+        return 1
+
+    env = {"SPACY_PRELOAD_LANGUAGES": args.languages, "SEGMENT_SPACY_EXECUTOR": "thread"}
+    print(f"{'Mode':<9} {'Workers':<8} {'RSS/worker':<11} {'PSS/worker':<11} {'USS/worker':<11} "
+          f"{'Total RSS':<10} {'Total PSS'}")
+    print("-" * 72)
+    for workers in [int(n) for n in args.workers.split(",")]:
+        for mode in MODES:
+            report = measure(mode, workers, args.port, env)
+            print(f"{mode:<9} {report['workers']:<8} {report['worker_rss']:<11.0f} "
+                  f"{report['worker_pss']:<11.0f} {report['worker_uss']:<11.0f} "
+                  f"{report['total_rss']:<10.0f} {report['total_pss']:.0f}")
+    print("\nAll values in MB. Total PSS is the memory the server really uses.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: accuracy and throughput of each spaCy pipeline profile.
+
+For every profile in PIPELINE_PROFILES this scores the gold standard
+datasets (micro-averaged precision/recall/F1, same boundary matching as
+evaluation/evaluate.py) and measures throughput on a synthetic document.
+Use the table to pick the cheapest profile whose F1 is within tolerance of
+the full pipeline.
+
+Usage:
+    python benchmarks/bench_profiles.py [--language en] [--size-kb 512] [--tolerance 0.01]
+"""
+
+import argparse
+import time
+
+from common import load_gold_datasets, synthetic_text
+
+from backend.spacy_splitter import PIPELINE_PROFILES
+from evaluation.evaluate import SegmentationEvaluator
+
+
+def score_profile(evaluator: SegmentationEvaluator, profile: str, language: str) -> dict:
+    """
+    Score one profile on all gold datasets with micro-averaged metrics.
+
+    Args:
+        evaluator: Evaluator whose spaCy splitter is used
+        profile: Pipeline profile name
+        language: Language code
+
+    Returns:
+        Dictionary with precision, recall and f1_score
+    """
+    def documents():
+        for dataset in load_gold_datasets():
+            text = dataset['text']
+            spans = evaluator.spacy_splitter.split_spans(text, language, profile)
+            gold = evaluator._get_sentence_boundaries(text, dataset['sentences'])
+            yield (gold, evaluator._get_span_boundaries(spans),
+                   len(dataset['sentences']), len(spans))
+
+    return evaluator.calculate_corpus_metrics(documents())["micro"]
+
+
+def main():
+    """Print the accuracy/throughput table for all profiles."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--size-kb", type=int, default=512,
+                        help="Size of the throughput document in KB")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Allowed F1 drop versus the full pipeline")
+    args = parser.parse_args()
+
+    evaluator = SegmentationEvaluator()
+    text = synthetic_text(args.size_kb * 1024)
+
+    rows = []
+    for profile in PIPELINE_PROFILES:
+        start = time.perf_counter()
+        evaluator.spacy_splitter.get_model(args.language, profile)
+        load_time = time.perf_counter() - start
+
+        metrics = score_profile(evaluator, profile, args.language)
+
+        start = time.perf_counter()
+        evaluator.spacy_splitter.split_spans(text, args.language, profile)
+        elapsed = time.perf_counter() - start
+        rows.append((profile, load_time, metrics, len(text) / elapsed))
+
+    full_f1 = rows[0][2]["f1_score"]
+    print(f"\n{'Profile':<14} {'Load s':<8} {'Precision':<10} {'Recall':<10} {'F1':<8} "
+          f"{'KB/s':<10} {'Speedup':<8} {'Within tol.'}")
+    print("-" * 84)
+    for profile, load_time, metrics, chars_per_sec in rows:
+        within = "yes" if full_f1 - metrics["f1_score"] <= args.tolerance else "no"
+        print(f"{profile:<14} {load_time:<8.2f} {metrics['precision']:<10.4f} {metrics['recall']:<10.4f} "
+              f"{metrics['f1_score']:<8.4f} {chars_per_sec / 1024:<10.0f} "
+              f"{chars_per_sec / rows[0][3]:<8.1f} {within}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: model load time and memory with and without model snapshots.
+
+Builds a snapshot directory for the requested languages and profile (see
+backend/snapshots.py), then starts fresh Python processes that construct a
+SpacySentenceSplitter, load every language and segment one sentence, once
+with spacy.load() from the installed packages and once from the snapshots.
+Load time excludes importing spaCy, which both pay. Each row is the median
+over --repeat processes.
+
+Usage:
+    python benchmarks/bench_snapshots.py [--languages en,fr,de,es] [--profile parser-only]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from common import PROJECT_ROOT
+
+from backend.snapshots import build_snapshots
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from backend.spacy_splitter import SpacySentenceSplitter
+splitter = SpacySentenceSplitter(preload=[])
+import spacy
+imported = time.perf_counter()
+for language in sys.argv[1].split(","):
+    splitter.get_model(language)
+loaded = time.perf_counter()
+splitter.split("Dr. Smith arrived. He sat down.", "en")
+segmented = time.perf_counter()
+sys.path.insert(0, "benchmarks")
+from common import peak_rss_mb
+print(json.dumps({
+    "load_s": loaded - imported,
+    "first_segment_s": segmented - loaded,
+    "ready_s": segmented - start,
+    "peak_rss_mb": peak_rss_mb(),
+}))
+"""
+
+
+def run_child(languages: str, env: dict) -> dict:
+    """Run the child script with extra environment variables and parse its report."""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, languages],
+        cwd=PROJECT_ROOT, env=dict(os.environ, **env),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Build the snapshots, run both configurations and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--languages", default="en,fr,de,es")
+    parser.add_argument("--profile", default="parser-only",
+                        help="Pipeline profile to snapshot and load")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    languages = [language.strip() for language in args.languages.split(",")]
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        manifest = build_snapshots(snapshot_dir, languages, [args.profile])
+        # Only languages whose package is installed can be compared
+        languages = [language for language in languages
+                     if f"{language}/{args.profile}" in manifest["pipelines"]]
+        if not languages:
+            print("No model packages installed, nothing to compare")
+            return 1
+
+        size = os.path.getsize(os.path.join(snapshot_dir, "pipelines.bin"))
+        print(f"\nSnapshot of {','.join(languages)} ({args.profile}): "
+              f"{size / (1024 * 1024):.1f} MB\n")
+
+        configurations = [
+            ("spacy.load", {"SPACY_SNAPSHOT_DIR": "", "SPACY_PIPELINE_PROFILE": args.profile}),
+            ("snapshot", {"SPACY_SNAPSHOT_DIR": snapshot_dir,
+                          "SPACY_PIPELINE_PROFILE": args.profile}),
+        ]
+        print(f"{'Loader':<12} {'Load s':<9} {'1st segment s':<15} {'Ready s':<9} {'Peak RSS MB'}")
+        print("-" * 58)
+        for label, env in configurations:
+            reports = [run_child(",".join(languages), env) for _ in range(args.repeat)]
+
+            def median(key):
+                return statistics.median(report[key] for report in reports)
+
+            print(f"{label:<12} {median('load_s'):<9.3f} {median('first_segment_s'):<15.3f} "
+                  f"{median('ready_s'):<9.3f} {median('peak_rss_mb'):.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: splitter startup time and memory per worker.
+
+Each configuration runs in a fresh Python process, which constructs a
+SpacySentenceSplitter, segments one English sentence and reports the time
+taken by each step plus the peak RSS of the process.
+
+Usage:
+    python benchmarks/bench_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from common import PROJECT_ROOT
+
+CHILD_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from backend.spacy_splitter import SpacySentenceSplitter
+imported = time.perf_counter()
+splitter = SpacySentenceSplitter()
+constructed = time.perf_counter()
+splitter.split("Dr. Smith arrived. He sat down.", "en")
+segmented = time.perf_counter()
+import sys
+sys.path.insert(0, "benchmarks")
+from common import peak_rss_mb
+print(json.dumps({
+    "import_s": imported - start,
+    "construct_s": constructed - imported,
+    "first_segment_s": segmented - constructed,
+    "resident_models": list(splitter.models),
+    "peak_rss_mb": peak_rss_mb(),
+}))
+"""
+
+# (label, environment) pairs
+CONFIGURATIONS = [
+    ("lazy (no preload)", {"SPACY_PRELOAD_LANGUAGES": ""}),
+    ("preload en", {"SPACY_PRELOAD_LANGUAGES": "en"}),
+    ("preload all", {"SPACY_PRELOAD_LANGUAGES": "en,fr,de,es"}),
+    ("preload all, max 1", {"SPACY_PRELOAD_LANGUAGES": "en,fr,de,es", "SPACY_MAX_MODELS": "1"}),
+]
+
+
+def run_configuration(env: dict) -> dict:
+    """Run the child script with extra environment variables and parse its report."""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=PROJECT_ROOT, env=dict(os.environ, **env),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Run every configuration and print a results table."""
+    print(f"{'Configuration':<22} {'Construct s':<12} {'1st segment s':<14} {'Ready s':<10} "
+          f"{'Peak RSS MB':<12} {'Resident'}")
+    print("-" * 90)
+    for label, env in CONFIGURATIONS:
+        report = run_configuration(env)
+        ready = report["import_s"] + report["construct_s"] + report["first_segment_s"]
+        print(f"{label:<22} {report['construct_s']:<12.2f} {report['first_segment_s']:<14.2f} "
+              f"{ready:<10.2f} {report['peak_rss_mb']:<12.0f} {','.join(report['resident_models'])}")
+
+
+if __name__ == "__main__":
+    main()
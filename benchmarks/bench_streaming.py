@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bounded-memory streaming segmentation of a very large input.
+
+Feeds a generated document (1 GB by default) to iter_sentences() in fixed
+size chunks, without ever materializing the full text, and checks that the
+peak RSS grows by no more than a limit (chunk size plus the longest
+sentence, plus interpreter overhead).
+
+Usage:
+    python benchmarks/bench_streaming.py [--gb 1] [--chunk-kb 1024] [--method baseline]
+"""
+
+import argparse
+import sys
+import time
+
+from common import format_size, peak_rss_mb, synthetic_text
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+
+
+def generate_chunks(total: int, chunk_size: int):
+    """
+    Yield `total` characters of synthetic text in chunks of `chunk_size`.
+
+    Args:
+        total: Total number of characters
+        chunk_size: Characters per chunk
+
+    Yields:
+        Text chunks
+    """
+    # A single reusable chunk; offsetting it keeps boundaries moving across
+    # chunk edges without allocating the whole document
+    base = synthetic_text(chunk_size * 2)
+    produced = 0
+    offset = 0
+    while produced < total:
+        size = min(chunk_size, total - produced)
+        yield base[offset:offset + size]
+        produced += size
+        offset = (offset + 7919) % chunk_size
+
+
+def main():
+    """Stream the generated input and report throughput and peak memory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--gb", type=float, default=1.0)
+    parser.add_argument("--chunk-kb", type=int, default=1024)
+    parser.add_argument("--method", default="baseline", choices=["baseline", "spacy"])
+    parser.add_argument("--max-growth-mb", type=float, default=256,
+                        help="Fail if peak RSS grows by more than this")
+    args = parser.parse_args()
+
+    total = int(args.gb * 1024 ** 3)
+    chunk_size = args.chunk_kb * 1024
+
+    if args.method == "baseline":
+        sentences = BaselineSentenceSplitter().iter_sentences(generate_chunks(total, chunk_size))
+    else:
+        from backend.spacy_splitter import SpacySentenceSplitter
+        splitter = SpacySentenceSplitter()
+        splitter.split("Warm up.", "en")
+        sentences = splitter.iter_sentences(generate_chunks(total, chunk_size))
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    count = 0
+    longest = 0
+    for sentence in sentences:
+        count += 1
+        longest = max(longest, len(sentence))
+    elapsed = time.perf_counter() - start
+    growth = peak_rss_mb() - rss_before
+
+    print(f"Input:            {format_size(total)} in {format_size(chunk_size)} chunks ({args.method})")
+    print(f"Sentences:        {count} (longest {longest} chars)")
+    print(f"Time:             {elapsed:.1f} s ({total / elapsed / 1024 / 1024:.1f} MB/s)")
+    print(f"Peak RSS growth:  {growth:.1f} MB (limit {args.max_growth_mb:.0f} MB)")
+
+    if growth > args.max_growth_mb:
+        print("FAIL: memory was not bounded by chunk size plus longest sentence")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
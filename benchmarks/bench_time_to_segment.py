@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time from server launch to the first successful segmentation.
+
+Each configuration starts a fresh server process and polls it every 50 ms,
+recording how long after launch
+    /health  first answers 200 (process is up)
+    /ready   first answers 200 (models loaded and warmed up)
+    segment  a spaCy /segment request first succeeds
+plus the latency of that first successful request.
+
+Usage:
+    python benchmarks/bench_time_to_segment.py [--languages en] [--port 8772]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from common import PROJECT_ROOT
+
+UVICORN = ["-m", "uvicorn", "backend.main:app"]
+
+# (label, extra environment, server command)
+CONFIGURATIONS = [
+    ("eager", {"SEGMENT_STARTUP_MODE": "eager"}, UVICORN),
+    ("eager, no warm-up", {"SEGMENT_STARTUP_MODE": "eager", "SEGMENT_WARMUP": "0"}, UVICORN),
+    ("background", {"SEGMENT_STARTUP_MODE": "background"}, UVICORN),
+    ("background, no warm-up", {"SEGMENT_STARTUP_MODE": "background", "SEGMENT_WARMUP": "0"}, UVICORN),
+    ("pre-fork, 2 workers", {}, ["run_server.py", "--workers", "2"]),
+]
+
+SEGMENT_BODY = json.dumps({
+    "text": "The meeting ended at 5 p.m. Everyone went home.",
+    "language": "en", "method": "spacy",
+}).encode("utf-8")
+
+
+def succeeds(url: str, body: bytes = None) -> bool:
+    """True if a GET (or POST with body) to url answers 200."""
+    headers = {"Content-Type": "application/json"} if body else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers),
+                                    timeout=30) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return False
+
+
+def measure(env: dict, command: list, port: int, timeout: float = 300) -> dict:
+    """
+    Launch one server configuration and time its startup milestones.
+
+    Args:
+        env: Extra environment variables for the server
+        command: Python arguments that start the server
+        port: Port for the server
+        timeout: Seconds to wait for the first successful segmentation
+
+    Returns:
+        Seconds after launch for "health", "ready" and "segment", and the
+        latency of the first successful request as "first_request"
+    """
+    base = f"http://127.0.0.1:{port}"
+    launched = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *command,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=dict(os.environ, **env),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    report = {}
+    try:
+        while "segment" not in report:
+            if time.perf_counter() - launched > timeout:
+                raise RuntimeError(f"No successful segmentation within {timeout}s")
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+
+            for name, url in (("health", f"{base}/health"), ("ready", f"{base}/ready")):
+                if name not in report and succeeds(url):
+                    report[name] = time.perf_counter() - launched
+
+            request_start = time.perf_counter()
+            if succeeds(f"{base}/segment", SEGMENT_BODY):
+                report["segment"] = time.perf_counter() - launched
+                report["first_request"] = time.perf_counter() - request_start
+            else:
+                time.sleep(0.05)
+
+        # The server may have become ready between the /ready poll and the
+        # segment request of the same round
+        report.setdefault("ready", report["segment"])
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+    return report
+
+
+def main():
+    """Run every configuration and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--languages", default="en",
+                        help="SPACY_PRELOAD_LANGUAGES for every configuration")
+    parser.add_argument("--port", type=int, default=8772)
+    args = parser.parse_args()
+
+    print(f"{'Configuration':<24} {'Health s':<10} {'Ready s':<10} {'1st segment s':<15} "
+          f"{'1st request ms'}")
+    print("-" * 76)
+    for label, env, command in CONFIGURATIONS:
+        # Thread pool everywhere, as in pre-fork mode: process pool workers
+        # would start after the first request and blur its latency
+        env = dict(env, SPACY_PRELOAD_LANGUAGES=args.languages, SEGMENT_SPACY_EXECUTOR="thread")
+        report = measure(env, command, args.port)
+        print(f"{label:<24} {report.get('health', float('nan')):<10.2f} {report['ready']:<10.2f} "
+              f"{report['segment']:<15.2f} {report['first_request'] * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Shared helpers for the benchmark scripts.
+
+All benchmarks run offline: synthetic corpora are generated by repeating the
+hand-annotated paragraphs in evaluation/gold_standard_data.json until the
+requested size is reached.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+GOLD_DATA_PATH = os.path.join(PROJECT_ROOT, "evaluation", "gold_standard_data.json")
+
+
+def load_gold_datasets() -> List[dict]:
+    """
+    Load the gold standard datasets.
+
+    Returns:
+        List of dataset dictionaries with 'id', 'text' and 'sentences'
+    """
+    with open(GOLD_DATA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f).get('datasets', [])
+
+
+def synthetic_text(size: int) -> str:
+    """
+    Build a synthetic document of roughly `size` characters from gold texts.
+
+    Args:
+        size: Target document size in characters
+
+    Returns:
+        Text made of whole gold paragraphs, truncated to `size` characters
+    """
+    paragraphs = [d['text'] for d in load_gold_datasets()]
+    block = " ".join(paragraphs) + "\n\n"
+    repeats = size // len(block) + 1
+    return (block * repeats)[:size]
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of this process in megabytes.
+
+    Returns:
+        Peak RSS in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def format_size(size: int) -> str:
+    """
+    Format a byte/character count for table output.
+
+    Args:
+        size: Size in bytes or characters
+
+    Returns:
+        Human readable size, e.g. "10KB" or "50MB"
+    """
+    for unit, factor in (("MB", 1024 * 1024), ("KB", 1024)):
+        if size >= factor:
+            return f"{size / factor:g}{unit}"
+    return f"{size}B"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of values (nearest-rank method).
+
+    Args:
+        values: Samples
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def start_server(port: int, env: dict = None, args: List[str] = None) -> subprocess.Popen:
+    """
+    Start the API in a subprocess and wait until it responds.
+
+    Args:
+        port: Port to listen on
+        env: Extra environment variables for the server
+        args: Command to run instead of uvicorn, e.g. run_server.py with
+            options; it must accept --host, --port and --log-level
+
+    Returns:
+        The running server process (terminate it when done)
+    """
+    server_env = dict(os.environ, **(env or {}))
+    args = args or ["-m", "uvicorn", "backend.main:app"]
+    process = subprocess.Popen(
+        [sys.executable, *args,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=server_env
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 120 seconds")
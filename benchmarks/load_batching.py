@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Load test: /segment throughput and tail latency with and without request
+coalescing.
+
+Starts the API twice (result cache off), once with SEGMENT_BATCH_MAX_SIZE=1
+(every request is its own model call, as before) and once with the
+coalescer's defaults. For every concurrency level, that many clients post
+small documents (gold sentences in random order, 200-2000 characters)
+to /segment over keep-alive connections for --seconds and the test reports
+requests per second and p50/p99 latency. 503 answers are counted
+separately and left out of the latencies.
+
+Usage:
+    python benchmarks/load_batching.py [--concurrency 1,4,16,64] [--seconds 10] [--method spacy]
+                                       [--pipeline sentencizer]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+
+from common import load_gold_datasets, percentile, start_server
+
+MODES = (
+    ("off", {"SEGMENT_BATCH_MAX_SIZE": "1"}),
+    ("on", {}),
+)
+
+
+def documents(count: int, seed: int = 0) -> list:
+    """
+    Build small documents from the gold sentences.
+
+    Args:
+        count: Number of documents
+        seed: Random seed, so every run sends the same documents
+
+    Returns:
+        Texts of 200-2000 characters
+    """
+    sentences = [s for dataset in load_gold_datasets() for s in dataset["sentences"]]
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        size = rng.randint(200, 2000)
+        text = ""
+        while len(text) < size:
+            text += rng.choice(sentences) + " "
+        texts.append(text.strip())
+    return texts
+
+
+def client(port: int, bodies: list, offset: int, deadline: float, latencies: list, stats: dict):
+    """Post documents to /segment until the deadline."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    index = offset
+    while time.perf_counter() < deadline:
+        body = bodies[index % len(bodies)]
+        index += 1
+        start = time.perf_counter()
+        conn.request("POST", "/segment", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            latencies.append(time.perf_counter() - start)
+        stats[response.status] = stats.get(response.status, 0) + 1
+    conn.close()
+
+
+def run_level(port: int, bodies: list, concurrency: int, seconds: float) -> dict:
+    """Run `concurrency` clients for `seconds` and summarize their requests."""
+    latencies, stats = [], {}
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=client,
+                         args=(port, bodies, i * 7, deadline, latencies, stats), daemon=True)
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "busy": stats.get(503, 0),
+    }
+
+
+def main():
+    """Run every concurrency level with coalescing off and on and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--method", default="spacy", choices=["spacy", "hybrid"])
+    parser.add_argument("--pipeline", help="spaCy pipeline profile (default: server default)")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8776)
+    args = parser.parse_args()
+
+    bodies = [json.dumps({"text": text, "method": args.method, "pipeline": args.pipeline})
+              .encode("utf-8") for text in documents(args.documents)]
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    results = {}
+    for mode, env in MODES:
+        server = start_server(args.port, env=dict(env, SEGMENT_CACHE_MAX_BYTES="0"))
+        try:
+            run_level(args.port, bodies, 4, 2)  # warm-up
+            for concurrency in levels:
+                results[mode, concurrency] = run_level(args.port, bodies, concurrency, args.seconds)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\n{len(bodies)} documents, method={args.method}, pipeline={args.pipeline or 'default'}, "
+          f"{args.seconds:g} s per level")
+    print(f"{'Clients':<9} {'Coalescing':<11} {'Req/s':<9} {'p50 ms':<9} {'p99 ms':<9} {'503s'}")
+    print("-" * 54)
+    for concurrency in levels:
+        for mode, _ in MODES:
+            result = results[mode, concurrency]
+            print(f"{concurrency:<9} {mode:<11} {result['rps']:<9.0f} {result['p50_ms']:<9.1f} "
+                  f"{result['p99_ms']:<9.1f} {result['busy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Load test: /health latency while large documents are being segmented.
+
+Starts the API (or targets --url), keeps several clients busy posting large
+documents to /segment, and meanwhile samples /health latency over a single
+keep-alive connection. Fails (exit code 1) if /health p99 exceeds the limit.
+
+Usage:
+    python benchmarks/load_health.py [--doc-mb 5] [--clients 4] [--seconds 20]
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+from common import percentile, start_server, synthetic_text
+
+
+def segment_forever(host: str, port: int, body: bytes, stop: threading.Event, stats: dict):
+    """Post the same large document to /segment until told to stop."""
+    conn = http.client.HTTPConnection(host, port, timeout=300)
+    while not stop.is_set():
+        conn.request("POST", "/segment", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        stats[response.status] = stats.get(response.status, 0) + 1
+
+
+def main():
+    """Run the load test and report /health latency percentiles."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--doc-mb", type=float, default=5)
+    parser.add_argument("--method", default="spacy", choices=["baseline", "spacy"])
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--p99-limit-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        server = start_server(port)
+
+    try:
+        text = synthetic_text(int(args.doc_mb * 1024 * 1024))
+        body = json.dumps({"text": text, "language": "en", "method": args.method}).encode()
+
+        stop = threading.Event()
+        stats = {}
+        clients = [
+            threading.Thread(target=segment_forever, args=(host, port, body, stop, stats), daemon=True)
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+
+        # Give the segment requests time to reach the server
+        time.sleep(1)
+
+        latencies = []
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        deadline = time.time() + args.seconds
+        while time.time() < deadline:
+            start = time.perf_counter()
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+        stop.set()
+
+        p99 = percentile(latencies, 99)
+        print(f"/health samples: {len(latencies)}")
+        print(f"p50: {percentile(latencies, 50):.2f} ms  p95: {percentile(latencies, 95):.2f} ms  "
+              f"p99: {p99:.2f} ms  max: {max(latencies):.2f} ms")
+        print(f"/segment responses by status: {stats}")
+
+        if p99 > args.p99_limit_ms:
+            print(f"FAIL: /health p99 {p99:.2f} ms exceeds {args.p99_limit_ms} ms")
+            sys.exit(1)
+        print(f"PASS: /health p99 under {args.p99_limit_ms} ms")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
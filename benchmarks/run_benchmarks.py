@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: speed and memory of every segmentation path, with a
+regression gate.
+
+Targets:
+    baseline       BaselineSentenceSplitter.split_spans
+    spacy-<lang>   SpacySentenceSplitter.split_spans for en, fr, de, es
+    http-baseline  POST /segment with method=baseline (server in a subprocess)
+    http-spacy     POST /segment with method=spacy
+
+Each target is measured on synthetic documents (built from the gold data, so
+everything runs offline) in size buckets from 100 B to 50 MB, and reports
+chars/s, docs/s, p50/p95/p99 latency and peak RSS. Every target runs in its
+own process so peak RSS is not shared between targets; for HTTP targets the
+server's peak RSS is reported (Linux only).
+
+Results are written as JSON. With --baseline, a run fails (exit code 1) when
+any metric is worse than the stored baseline by more than --threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Callable, Dict, List, Optional
+
+from common import (
+    PROJECT_ROOT, format_size, peak_rss_mb, percentile, start_server, synthetic_text
+)
+
+TARGETS = ("baseline", "spacy-en", "spacy-fr", "spacy-de", "spacy-es",
+           "http-baseline", "http-spacy")
+
+SIZE_BUCKETS = (100, 1024, 10 * 1024, 100 * 1024, 1024 * 1024,
+                10 * 1024 * 1024, 50 * 1024 * 1024)
+
+# Largest bucket per kind of target by default; spaCy and HTTP at 50 MB take
+# many minutes, pass --max-size to include them anyway
+DEFAULT_MAX_SIZE = {"baseline": 50 * 1024 * 1024, "spacy": 1024 * 1024,
+                    "http": 10 * 1024 * 1024}
+
+# --quick caps every target at this size
+QUICK_MAX_SIZE = 100 * 1024
+
+# Metrics checked by the regression gate and whether higher is better
+GATED_METRICS = {"chars_per_sec": True, "p95_ms": False, "peak_rss_mb": False}
+
+HTTP_PORT = 8765
+
+
+def measure(segment: Callable[[str], object], text: str, min_runs: int,
+            time_budget: float) -> Dict:
+    """
+    Time repeated calls of segment(text).
+
+    Runs at least min_runs times and keeps going until time_budget seconds
+    have been spent (small documents get many samples, large ones few).
+
+    Args:
+        segment: Function segmenting one document
+        text: Document
+        min_runs: Minimum number of timed runs
+        time_budget: Seconds to keep sampling for after min_runs
+
+    Returns:
+        Dictionary of throughput and latency metrics
+    """
+    # Warm-up (model loading, caches, connection setup)
+    segment(text)
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - started < time_budget:
+        start = time.perf_counter()
+        segment(text)
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+    return {
+        "runs": len(latencies),
+        "chars_per_sec": round(len(text) * len(latencies) / total),
+        "docs_per_sec": round(len(latencies) / total, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def server_peak_rss_mb(pid: int) -> Optional[float]:
+    """Return the peak RSS of another process from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def run_target(target: str, sizes: List[int], min_runs: int, time_budget: float) -> Dict:
+    """
+    Measure one target on all sizes. Called inside a dedicated process.
+
+    Args:
+        target: Name from TARGETS
+        sizes: Document sizes in characters
+        min_runs: See measure()
+        time_budget: See measure()
+
+    Returns:
+        Dictionary with "info" about the target and one result per size
+    """
+    info = {}
+    server = None
+
+    if target == "baseline":
+        from backend.baseline_splitter import BaselineSentenceSplitter
+        splitter = BaselineSentenceSplitter()
+        segment = splitter.split_spans
+        info["version"] = splitter.version
+    elif target.startswith("spacy-"):
+        from backend.spacy_splitter import SpacySentenceSplitter
+        language = target.split("-", 1)[1]
+        splitter = SpacySentenceSplitter(preload=[language])
+        segment = lambda text: splitter.split_spans(text, language)
+        info["version"] = splitter.model_version(language)
+    else:
+        method = target.split("-", 1)[1]
+        url = f"http://127.0.0.1:{HTTP_PORT}/segment"
+        # The result cache would turn every repeated request into a hit
+        server = start_server(HTTP_PORT, {"SEGMENT_CACHE_MAX_BYTES": "0"})
+
+        def segment(text):
+            body = json.dumps({"text": text, "language": "en", "method": method,
+                               "output": "spans"}).encode("utf-8")
+            request = urllib.request.Request(url, data=body,
+                                             headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request, timeout=3600) as response:
+                return response.read()
+
+    results = {}
+    try:
+        for size in sizes:
+            text = synthetic_text(size)
+            result = measure(segment, text, min_runs, time_budget)
+            if server is not None:
+                result["peak_rss_mb"] = server_peak_rss_mb(server.pid)
+            else:
+                result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+            results[str(size)] = result
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return {"info": info, "sizes": results}
+
+
+def run_in_subprocess(target: str, sizes: List[int], args: argparse.Namespace) -> Dict:
+    """Run one target in a fresh interpreter and return its results."""
+    command = [sys.executable, os.path.abspath(__file__), "--run-target", target,
+               "--min-runs", str(args.min_runs), "--time-budget", str(args.time_budget),
+               "--sizes", *map(str, sizes)]
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout.decode("utf-8").strip().splitlines()[-1])
+
+
+def target_sizes(target: str, args: argparse.Namespace) -> List[int]:
+    """Size buckets to run for a target."""
+    kind = target.split("-", 1)[0]
+    limit = args.max_size or DEFAULT_MAX_SIZE[kind]
+    if args.quick:
+        limit = min(limit, QUICK_MAX_SIZE)
+    return [size for size in SIZE_BUCKETS if size <= limit]
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Find metrics that regressed against a stored baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of a previous run
+        threshold: Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for target, current in results["targets"].items():
+        previous = baseline.get("targets", {}).get(target)
+        if previous is None:
+            continue
+        for size, metrics in current["sizes"].items():
+            old_metrics = previous["sizes"].get(size)
+            if old_metrics is None:
+                continue
+            for metric, higher_is_better in GATED_METRICS.items():
+                new, old = metrics.get(metric), old_metrics.get(metric)
+                if not new or not old:
+                    continue
+                change = (new - old) / old
+                if (higher_is_better and change < -threshold) or \
+                        (not higher_is_better and change > threshold):
+                    regressions.append(
+                        f"{target} @ {format_size(int(size))}: {metric} {old} -> {new} ({change:+.1%})"
+                    )
+    return regressions
+
+
+def print_results(results: Dict):
+    """Print all targets as one table."""
+    print(f"\n{'Target':<14} {'Size':<8} {'Runs':<6} {'chars/s':<12} {'docs/s':<10} "
+          f"{'p50 ms':<10} {'p95 ms':<10} {'p99 ms':<10} {'RSS MB'}")
+    print("-" * 92)
+    for target, result in results["targets"].items():
+        for size, m in result["sizes"].items():
+            print(f"{target:<14} {format_size(int(size)):<8} {m['runs']:<6} {m['chars_per_sec']:<12} "
+                  f"{m['docs_per_sec']:<10} {m['p50_ms']:<10} {m['p95_ms']:<10} {m['p99_ms']:<10} "
+                  f"{m['peak_rss_mb']}")
+
+
+def main():
+    """Run the suite, write results and apply the regression gate."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--max-size", type=int, default=None,
+                        help="Largest document size in characters for every target")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"Only sizes up to {format_size(QUICK_MAX_SIZE)}")
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--time-budget", type=float, default=2.0,
+                        help="Seconds of sampling per target and size")
+    parser.add_argument("--output", default=None,
+                        help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Stored results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed relative regression (default: 0.10)")
+    parser.add_argument("--save-baseline", default=None,
+                        help="Also store this run as the baseline at the given path")
+    # Internal: measure a single target in this process
+    parser.add_argument("--run-target", choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument("--sizes", type=int, nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_target:
+        print(json.dumps(run_target(args.run_target, args.sizes, args.min_runs, args.time_budget)))
+        return 0
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "targets": {},
+    }
+    for target in args.targets:
+        sizes = target_sizes(target, args)
+        print(f"Running {target} ({', '.join(format_size(s) for s in sizes)})...", file=sys.stderr)
+        results["targets"][target] = run_in_subprocess(target, sizes, args)
+
+    print_results(results)
+
+    output = args.output or os.path.join(
+        PROJECT_ROOT, "benchmarks", "results", time.strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    for path in filter(None, (output, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
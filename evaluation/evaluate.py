@@ -42,14 +42,125 @@ Common error types identified in sentence segmentation:
 import sys
 import os
 import json
-from typing import List, Set, Tuple, Dict
-from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.baseline_splitter import BaselineSentenceSplitter
 from backend.spacy_splitter import SpacySentenceSplitter
+from backend.spans import SentenceSpans
+
+# Predicted boundaries within this many characters of a gold boundary count
+# as correct
+BOUNDARY_TOLERANCE = 5
+
+
+def match_boundaries(gold_boundaries: Iterable[int], predicted_boundaries: Iterable[int],
+                     tolerance: int = BOUNDARY_TOLERANCE) -> int:
+    """
+    Count gold/predicted boundary pairs that match within the tolerance.
+    
+    Matching is strictly one-to-one: every boundary is used at most once.
+    Both lists are walked once in ascending order (two pointers), pairing
+    each gold boundary with the earliest unused prediction in its window,
+    which gives the maximum number of matches in O(n + m) after sorting.
+    Sorting is nearly free when the inputs are already sorted, as the
+    boundary helpers of SegmentationEvaluator return them.
+    
+    Args:
+        gold_boundaries: Gold standard boundary positions
+        predicted_boundaries: Predicted boundary positions
+        tolerance: Maximum distance between matching boundaries
+        
+    Returns:
+        Number of matched pairs (true positives)
+    """
+    gold = sorted(gold_boundaries)
+    predicted = sorted(predicted_boundaries)
+    
+    tp = 0
+    j = 0
+    n = len(predicted)
+    for gold_pos in gold:
+        # Predictions left of this window cannot match any later gold boundary
+        low = gold_pos - tolerance
+        while j < n and predicted[j] < low:
+            j += 1
+        if j == n:
+            break
+        if predicted[j] <= gold_pos + tolerance:
+            tp += 1
+            j += 1
+    return tp
+
+
+class CorpusMetrics:
+    """
+    Running micro and macro averages over per-document metrics.
+    
+    The state is a plain dictionary, so long evaluations can save it and
+    continue accumulating after a restart.
+    """
+    
+    def __init__(self, state: dict = None):
+        """
+        Initialize the accumulator.
+        
+        Args:
+            state: Dictionary from a previous state(), or None to start empty
+        """
+        state = state or {}
+        self.totals = dict(state.get("totals") or {
+            "true_positives": 0, "false_positives": 0, "false_negatives": 0,
+            "gold_count": 0, "predicted_count": 0
+        })
+        self.sums = dict(state.get("sums") or {"precision": 0.0, "recall": 0.0, "f1_score": 0.0})
+        self.documents = state.get("documents", 0)
+    
+    def add(self, metrics: dict, gold_count: int, predicted_count: int):
+        """
+        Add one document.
+        
+        Args:
+            metrics: Result of SegmentationEvaluator._calculate_metrics()
+            gold_count: Number of gold standard sentences
+            predicted_count: Number of predicted sentences
+        """
+        for key in ("true_positives", "false_positives", "false_negatives"):
+            self.totals[key] += metrics[key]
+        self.totals["gold_count"] += gold_count
+        self.totals["predicted_count"] += predicted_count
+        for key in self.sums:
+            self.sums[key] += metrics[key]
+        self.documents += 1
+    
+    def state(self) -> dict:
+        """Return the accumulated counts as a JSON-serializable dictionary."""
+        return {"totals": dict(self.totals), "sums": dict(self.sums),
+                "documents": self.documents}
+    
+    def result(self) -> dict:
+        """
+        Compute the averages.
+        
+        Micro averages pool the boundary counts of all documents before
+        computing precision/recall/F1 (large documents weigh more); macro
+        averages are the mean of the per-document scores (every document
+        weighs the same).
+        
+        Returns:
+            Dictionary with "micro" and "macro" metrics and the number of
+            "documents"
+        """
+        micro = _precision_recall_f1(
+            self.totals["true_positives"], self.totals["false_positives"],
+            self.totals["false_negatives"]
+        )
+        micro.update(self.totals)
+        macro = {key: round(value / self.documents, 4) if self.documents else 0.0
+                 for key, value in self.sums.items()}
+        return {"micro": micro, "macro": macro, "documents": self.documents}
 
 
 class SegmentationEvaluator:
@@ -65,7 +176,7 @@ class SegmentationEvaluator:
         self.baseline_splitter = BaselineSentenceSplitter()
         self.spacy_splitter = SpacySentenceSplitter()
     
-    def _get_sentence_boundaries(self, text: str, sentences: List[str]) -> Set[int]:
+    def _get_sentence_boundaries(self, text: str, sentences: List[str]) -> List[int]:
         """
         Extract sentence boundary positions from segmented sentences.
         
@@ -74,7 +185,7 @@ class SegmentationEvaluator:
             sentences: List of segmented sentences
             
         Returns:
-            Set of character positions where sentences end
+            Sorted list of distinct character positions where sentences end
         """
         boundaries = set()
         current_pos = 0
@@ -92,7 +203,25 @@ class SegmentationEvaluator:
             
             current_pos = sentence_end
         
-        return boundaries
+        return sorted(boundaries)
+    
+    def _get_span_boundaries(self, spans: SentenceSpans) -> List[int]:
+        """
+        Extract sentence boundary positions from predicted sentence offsets.
+        
+        The splitters report offsets into the original text, so no
+        re-alignment with text.find() is needed.
+        
+        Args:
+            spans: Sentence spans returned by a splitter's split_spans()
+            
+        Returns:
+            Sorted list of character positions where sentences end
+        """
+        # The end of the last sentence is not a boundary; spans are in
+        # document order and do not overlap, so the ends are already sorted
+        # and distinct
+        return list(spans.ends[:-1])
     
     def evaluate(self, text: str, gold_sentences: List[str], 
                  language: str = "en") -> dict:
@@ -102,21 +231,23 @@ class SegmentationEvaluator:
         Args:
             text: Original input text
             gold_sentences: Gold standard sentence segmentation
-            language: Language code for spaCy model
+            language: Language code for both systems
             
         Returns:
             Dictionary containing evaluation metrics for both systems
         """
-        # Get predictions from both systems
-        baseline_sentences = self.baseline_splitter.split(text)
-        spacy_sentences = self.spacy_splitter.split(text, language)
+        # Get predictions from both systems as offsets into the text
+        baseline_spans = self.baseline_splitter.split_spans(text, language)
+        spacy_spans = self.spacy_splitter.split_spans(text, language)
+        baseline_sentences = baseline_spans.texts(text)
+        spacy_sentences = spacy_spans.texts(text)
         
         # Get gold standard boundaries
         gold_boundaries = self._get_sentence_boundaries(text, gold_sentences)
         
         # Get predicted boundaries
-        baseline_boundaries = self._get_sentence_boundaries(text, baseline_sentences)
-        spacy_boundaries = self._get_sentence_boundaries(text, spacy_sentences)
+        baseline_boundaries = self._get_span_boundaries(baseline_spans)
+        spacy_boundaries = self._get_span_boundaries(spacy_spans)
         
         # Calculate metrics for baseline
         baseline_metrics = self._calculate_metrics(
@@ -152,59 +283,90 @@ class SegmentationEvaluator:
             "text": text
         }
     
-    def _calculate_metrics(self, gold_boundaries: Set[int], 
-                          predicted_boundaries: Set[int],
+    def _calculate_metrics(self, gold_boundaries: Sequence[int], 
+                          predicted_boundaries: Sequence[int],
                           gold_count: int, predicted_count: int) -> dict:
         """
         Calculate Precision, Recall, and F1-score.
         
+        The scores are computed from boundary counts, so a segmentation
+        identical to the gold standard scores 1.0.
+        
         Args:
-            gold_boundaries: Set of gold standard boundary positions
-            predicted_boundaries: Set of predicted boundary positions
-            gold_count: Number of gold standard sentences
-            predicted_count: Number of predicted sentences
+            gold_boundaries: Gold standard boundary positions
+            predicted_boundaries: Predicted boundary positions
+            gold_count: Number of gold standard sentences (not used in the
+                scores)
+            predicted_count: Number of predicted sentences (not used in the
+                scores)
             
         Returns:
             Dictionary with precision, recall, f1_score
         """
-        # True Positives: boundaries that match exactly
+        # True Positives: one-to-one boundary matches
         # We allow small tolerance (±5 characters) for boundary matching
-        tp = 0
-        matched_gold = set()
-        matched_pred = set()
-        
-        for gold_pos in gold_boundaries:
-            for pred_pos in predicted_boundaries:
-                if abs(gold_pos - pred_pos) <= 5:  # Tolerance window
-                    tp += 1
-                    matched_gold.add(gold_pos)
-                    matched_pred.add(pred_pos)
-                    break
+        tp = match_boundaries(gold_boundaries, predicted_boundaries)
         
         # False Positives: predicted boundaries not in gold
-        fp = len(predicted_boundaries) - len(matched_pred)
+        fp = len(predicted_boundaries) - tp
         
         # False Negatives: gold boundaries not in predictions
-        fn = len(gold_boundaries) - len(matched_gold)
-        
-        # Calculate metrics
-        precision = tp / predicted_count if predicted_count > 0 else 0.0
-        recall = tp / gold_count if gold_count > 0 else 0.0
-        
-        if precision + recall > 0:
-            f1_score = 2 * (precision * recall) / (precision + recall)
-        else:
-            f1_score = 0.0
+        fn = len(gold_boundaries) - tp
         
         return {
-            "precision": round(precision, 4),
-            "recall": round(recall, 4),
-            "f1_score": round(f1_score, 4),
+            **_precision_recall_f1(tp, fp, fn),
             "true_positives": tp,
             "false_positives": fp,
             "false_negatives": fn
         }
     
+    def calculate_corpus_metrics(self, documents: Iterable[Tuple[Sequence[int], Sequence[int], int, int]]) -> dict:
+        """
+        Score many documents in one call (see CorpusMetrics for the averages).
+        
+        Args:
+            documents: (gold_boundaries, predicted_boundaries, gold_count,
+                predicted_count) per document, as for _calculate_metrics()
+            
+        Returns:
+            Dictionary with "micro" and "macro" metrics and the number of
+            "documents"
+        """
+        corpus = CorpusMetrics()
+        for gold_boundaries, predicted_boundaries, gold_count, predicted_count in documents:
+            metrics = self._calculate_metrics(
+                gold_boundaries, predicted_boundaries, gold_count, predicted_count
+            )
+            corpus.add(metrics, gold_count, predicted_count)
+        return corpus.result()
+    
+    def evaluate_corpus(self, documents: Iterable[Tuple[str, List[str]]],
+                        system: str = "proposed", language: str = "en") -> dict:
+        """
+        Segment and score a corpus with one system.
+        
+        Args:
+            documents: (text, gold_sentences) pairs
+            system: "baseline" or "proposed"
+            language: Language code for both systems
+            
+        Returns:
+            Corpus metrics as returned by calculate_corpus_metrics()
+        """
+        if system not in ("baseline", "proposed"):
+            raise ValueError(f"Unknown system '{system}', expected 'baseline' or 'proposed'")
+        
+        def scored():
+            for text, gold_sentences in documents:
+                if system == "baseline":
+                    spans = self.baseline_splitter.split_spans(text, language)
+                else:
+                    spans = self.spacy_splitter.split_spans(text, language)
+                yield (self._get_sentence_boundaries(text, gold_sentences),
+                       self._get_span_boundaries(spans), len(gold_sentences), len(spans))
+        
+        return self.calculate_corpus_metrics(scored())
+    
     def evaluate_file(self, input_file: str, gold_file: str, 
                      language: str = "en") -> dict:
         """
@@ -311,6 +473,35 @@ class SegmentationEvaluator:
         return errors
 
 
+def _precision_recall_f1(tp: int, fp: int, fn: int) -> dict:
+    """
+    Compute rounded precision, recall and F1 from boundary counts.
+    
+    Precision is TP / (TP + FP) and recall TP / (TP + FN). A document with
+    no gold and no predicted boundaries (a single sentence, segmented as
+    one) is scored 1.0; otherwise an empty denominator gives 0.0.
+    """
+    if tp + fp > 0:
+        precision = tp / (tp + fp)
+    else:
+        precision = 1.0 if fn == 0 else 0.0
+    if tp + fn > 0:
+        recall = tp / (tp + fn)
+    else:
+        recall = 1.0 if fp == 0 else 0.0
+    
+    if precision + recall > 0:
+        f1_score = 2 * (precision * recall) / (precision + recall)
+    else:
+        f1_score = 0.0
+    
+    return {
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1_score": round(f1_score, 4)
+    }
+
+
 def print_evaluation_results(results: dict, format_type: str = "table"):
     """
     Print evaluation results in a readable format.
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Large-Scale Evaluation Harness
+
+run_evaluation.py scores the handful of paragraphs in gold_standard_data.json
+in memory. This runner is meant for real treebanks and corpora:
+
+- Gold data is streamed from JSONL or CoNLL-U files of any size
+- Documents are scored in batches by a process pool; every worker holds one
+  SegmentationEvaluator (and so one loaded splitter per system)
+- Per-document metrics are appended to documents.jsonl as batches finish,
+  and aggregate metrics are checkpointed, so an interrupted run continues
+  with --resume
+- summary.json reports micro/macro precision/recall/F1 and throughput for
+  every system
+
+Input formats:
+    JSONL    One document per line: {"id": ..., "text": ..., "sentences": [...]}
+             "text" is optional; sentences joined by spaces are used instead
+    CoNLL-U  Sentences are read from "# text =" comments (or rebuilt from the
+             token forms); documents start at "# newdoc" comments, or every
+             --sentences-per-doc sentences when there are none
+
+Usage:
+    python evaluation/harness.py treebank.conllu -o results/ --workers 4
+    python evaluation/harness.py gold.jsonl -o results/ --systems baseline --resume
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluation.evaluate import CorpusMetrics, SegmentationEvaluator
+
+SYSTEMS = ("baseline", "proposed")
+
+# Recorded in checkpoints so a run is never resumed on top of per-document
+# metrics from an earlier scoring method
+SCORING = "boundaries"
+
+# Seconds between progress lines on stderr
+_PROGRESS_INTERVAL = 5.0
+
+# Evaluator of the current worker process; set by _init_worker
+_worker_evaluator: Optional[SegmentationEvaluator] = None
+_worker_options: Dict = {}
+
+
+def iter_jsonl_documents(path: str) -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Stream gold documents from a JSONL file.
+
+    Args:
+        path: JSONL file, one document per line
+
+    Yields:
+        (document id, text, gold sentences) tuples
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            sentences = record["sentences"]
+            text = record.get("text") or " ".join(sentences)
+            yield str(record.get("id", f"{path}:{line_number}")), text, sentences
+
+
+def iter_conllu_documents(path: str, sentences_per_doc: int = 100) -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Stream gold documents from a CoNLL-U file.
+
+    Args:
+        path: CoNLL-U file
+        sentences_per_doc: Sentences grouped into one document when the file
+            has no "# newdoc" markers
+
+    Yields:
+        (document id, text, gold sentences) tuples
+    """
+    doc_id = None
+    doc_number = 0
+    sentences: List[str] = []
+    sentence_text = None
+    tokens: List[str] = []
+    has_newdoc = False
+
+    def finish_sentence():
+        nonlocal sentence_text, tokens
+        text = sentence_text if sentence_text is not None else "".join(tokens).strip()
+        if text:
+            sentences.append(text)
+        sentence_text, tokens = None, []
+
+    def make_document():
+        nonlocal doc_number
+        doc_number += 1
+        identifier = doc_id or f"{path}#{doc_number}"
+        return identifier, " ".join(sentences), list(sentences)
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("#"):
+                key, _, value = line[1:].partition("=")
+                key = key.strip()
+                if key in ("newdoc", "newdoc id"):
+                    if sentences:
+                        yield make_document()
+                        sentences.clear()
+                    has_newdoc = True
+                    doc_id = value.strip() or None
+                elif key == "text":
+                    sentence_text = value.strip()
+            elif not line.strip():
+                if sentence_text is not None or tokens:
+                    finish_sentence()
+                    if not has_newdoc and len(sentences) >= sentences_per_doc:
+                        yield make_document()
+                        sentences.clear()
+            else:
+                columns = line.split("\t")
+                # Skip multiword token ranges ("1-2") and empty nodes ("1.1")
+                if len(columns) >= 10 and columns[0].isdigit():
+                    space = "" if "SpaceAfter=No" in columns[9] else " "
+                    tokens.append(columns[1] + space)
+
+    if sentence_text is not None or tokens:
+        finish_sentence()
+    if sentences:
+        yield make_document()
+
+
+def iter_gold_documents(paths: Iterable[str], input_format: str = "auto",
+                        sentences_per_doc: int = 100) -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Stream gold documents from several files.
+
+    Args:
+        paths: Input files
+        input_format: "jsonl", "conllu", or "auto" to decide by extension
+        sentences_per_doc: See iter_conllu_documents()
+
+    Yields:
+        (document id, text, gold sentences) tuples
+    """
+    for path in paths:
+        file_format = input_format
+        if file_format == "auto":
+            file_format = "conllu" if path.endswith((".conllu", ".conll")) else "jsonl"
+        if file_format == "conllu":
+            yield from iter_conllu_documents(path, sentences_per_doc)
+        else:
+            yield from iter_jsonl_documents(path)
+
+
+def _init_worker(systems: List[str], language: str, profile: Optional[str]):
+    """Create the evaluator (and its splitters) used by this process."""
+    global _worker_evaluator, _worker_options
+    _worker_evaluator = SegmentationEvaluator()
+    # Documents are already spread over processes
+    _worker_evaluator.spacy_splitter.parallel_threshold = 0
+    _worker_options = {"systems": systems, "language": language, "profile": profile}
+
+
+def _score_batch(batch: List[Tuple[str, str, List[str]]]) -> List[Dict]:
+    """
+    Segment and score a batch of documents in a worker process.
+
+    Args:
+        batch: (document id, text, gold sentences) tuples
+
+    Returns:
+        One record per document with the metrics and timing of every system
+    """
+    evaluator = _worker_evaluator
+    language = _worker_options["language"]
+    records = []
+    for doc_id, text, gold_sentences in batch:
+        gold = evaluator._get_sentence_boundaries(text, gold_sentences)
+        record = {"id": doc_id, "chars": len(text), "gold_count": len(gold_sentences),
+                  "systems": {}}
+        for system in _worker_options["systems"]:
+            start = time.perf_counter()
+            if system == "baseline":
+                spans = evaluator.baseline_splitter.split_spans(text, language)
+            else:
+                spans = evaluator.spacy_splitter.split_spans(
+                    text, language, _worker_options["profile"]
+                )
+            seconds = time.perf_counter() - start
+            metrics = evaluator._calculate_metrics(
+                gold, evaluator._get_span_boundaries(spans), len(gold_sentences), len(spans)
+            )
+            record["systems"][system] = {
+                "predicted_count": len(spans), "seconds": round(seconds, 6), **metrics
+            }
+        records.append(record)
+    return records
+
+
+class _RunState:
+    """
+    Aggregates of a run plus how much of documents.jsonl they cover.
+
+    Saved atomically to checkpoint.json after every batch.
+    """
+
+    def __init__(self, path: str, settings: Dict, systems: List[str]):
+        self.path = path
+        self.settings = settings
+        self.documents = 0
+        self.output_bytes = 0
+        self.chars = 0
+        self.sentences = 0
+        self.wall_seconds = 0.0
+        self.metrics = {system: CorpusMetrics() for system in systems}
+        self.seconds = {system: 0.0 for system in systems}
+
+    def load(self):
+        """Restore a saved state, refusing checkpoints with other settings."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("settings") != self.settings:
+            raise ValueError(
+                f"Checkpoint {self.path} was written with different settings: {state.get('settings')}"
+            )
+        self.documents = state["documents"]
+        self.output_bytes = state["output_bytes"]
+        self.chars = state["chars"]
+        self.sentences = state["sentences"]
+        self.wall_seconds = state["wall_seconds"]
+        self.metrics = {system: CorpusMetrics(value) for system, value in state["metrics"].items()}
+        self.seconds = state["seconds"]
+
+    def save(self):
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({
+                "settings": self.settings, "documents": self.documents,
+                "output_bytes": self.output_bytes, "chars": self.chars,
+                "sentences": self.sentences, "wall_seconds": self.wall_seconds,
+                "seconds": self.seconds,
+                "metrics": {system: metrics.state() for system, metrics in self.metrics.items()},
+            }, f)
+        os.replace(temporary, self.path)
+
+    def add(self, record: Dict):
+        self.documents += 1
+        self.chars += record["chars"]
+        self.sentences += record["gold_count"]
+        for system, result in record["systems"].items():
+            self.metrics[system].add(result, record["gold_count"], result["predicted_count"])
+            self.seconds[system] += result["seconds"]
+
+    def summary(self) -> Dict:
+        """
+        Build the aggregate report.
+
+        Throughput per system is based on the time spent inside that
+        system's splitter, summed over all workers (i.e. per core).
+        """
+        systems = {}
+        for system, metrics in self.metrics.items():
+            seconds = max(self.seconds[system], 1e-9)
+            systems[system] = {
+                **metrics.result(),
+                "seconds": round(self.seconds[system], 3),
+                "chars_per_second": round(self.chars / seconds),
+                "sentences_per_second": round(self.sentences / seconds),
+                "docs_per_second": round(self.documents / seconds, 1),
+            }
+        return {
+            "documents": self.documents,
+            "gold_sentences": self.sentences,
+            "chars": self.chars,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "docs_per_second": round(self.documents / max(self.wall_seconds, 1e-9), 1),
+            "systems": systems,
+        }
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """
+    Run an evaluation.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        The summary that is also written to summary.json
+    """
+    os.makedirs(args.output, exist_ok=True)
+    documents_path = os.path.join(args.output, "documents.jsonl")
+    state = _RunState(os.path.join(args.output, "checkpoint.json"), {
+        "inputs": list(args.inputs), "format": args.format, "systems": list(args.systems),
+        "language": args.language, "pipeline": args.pipeline,
+        "sentences_per_doc": args.sentences_per_doc, "scoring": SCORING,
+    }, args.systems)
+
+    documents = iter_gold_documents(args.inputs, args.format, args.sentences_per_doc)
+    if args.resume and os.path.exists(state.path):
+        state.load()
+        print(f"Resuming after {state.documents} documents", file=sys.stderr)
+        # Drop per-document lines written after the last checkpoint
+        output = open(documents_path, "r+b")
+        output.truncate(state.output_bytes)
+        output.seek(state.output_bytes)
+        documents = islice(documents, state.documents, None)
+    else:
+        output = open(documents_path, "wb")
+
+    start = time.perf_counter()
+    elapsed_before = state.wall_seconds
+    documents_before = state.documents
+    last_report = start
+
+    def write(records: List[Dict]):
+        nonlocal last_report
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        data = data.encode("utf-8")
+        output.write(data)
+        output.flush()
+        for record in records:
+            state.add(record)
+        now = time.perf_counter()
+        state.output_bytes += len(data)
+        state.wall_seconds = elapsed_before + now - start
+        state.save()
+
+        if now - last_report >= _PROGRESS_INTERVAL:
+            last_report = now
+            print(f"[progress] {state.documents} docs, {state.sentences} sentences, "
+                  f"{(state.documents - documents_before) / (now - start):.1f} docs/s",
+                  file=sys.stderr)
+
+    def batches():
+        while True:
+            batch = list(islice(documents, args.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    worker_args = (list(args.systems), args.language, args.pipeline)
+    try:
+        if args.workers <= 1:
+            _init_worker(*worker_args)
+            for batch in batches():
+                write(_score_batch(batch))
+        else:
+            with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                                     initargs=worker_args) as pool:
+                # Bounded number of batches in flight, written in input order
+                in_flight = deque()
+                for batch in batches():
+                    in_flight.append(pool.submit(_score_batch, batch))
+                    if len(in_flight) >= args.workers * 2:
+                        write(in_flight.popleft().result())
+                while in_flight:
+                    write(in_flight.popleft().result())
+    finally:
+        output.close()
+
+    summary = state.summary()
+    with open(os.path.join(args.output, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def print_summary(summary: Dict):
+    """Print the aggregate metrics as a table."""
+    print(f"\nDocuments: {summary['documents']}  Gold sentences: {summary['gold_sentences']}  "
+          f"Characters: {summary['chars']}  Wall time: {summary['wall_seconds']}s")
+    print("-" * 96)
+    print(f"{'System':<10} {'P (micro)':<10} {'R (micro)':<10} {'F1 (micro)':<11} "
+          f"{'F1 (macro)':<11} {'chars/s':<12} {'sents/s':<10} {'docs/s'}")
+    print("-" * 96)
+    for system, result in summary["systems"].items():
+        micro, macro = result["micro"], result["macro"]
+        print(f"{system:<10} {micro['precision']:<10.4f} {micro['recall']:<10.4f} "
+              f"{micro['f1_score']:<11.4f} {macro['f1_score']:<11.4f} "
+              f"{result['chars_per_second']:<12} {result['sentences_per_second']:<10} "
+              f"{result['docs_per_second']}")
+    print("-" * 96)
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Evaluate sentence segmentation on large gold corpora")
+    parser.add_argument("inputs", nargs="+", help="Gold JSONL or CoNLL-U files")
+    parser.add_argument("-o", "--output", default="evaluation_results",
+                        help="Directory for documents.jsonl, checkpoint.json and summary.json")
+    parser.add_argument("--format", choices=("auto", "jsonl", "conllu"), default="auto")
+    parser.add_argument("--systems", nargs="+", choices=SYSTEMS, default=list(SYSTEMS))
+    parser.add_argument("--language", default="en", choices=("en", "fr", "de", "es"))
+    parser.add_argument("--pipeline", default=None, help="spaCy pipeline profile")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=32,
+                        help="Documents sent to a worker at a time")
+    parser.add_argument("--sentences-per-doc", type=int, default=100,
+                        help="CoNLL-U sentences per document when there are no # newdoc markers")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint")
+    args = parser.parse_args()
+
+    print_summary(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 // Sentence Segmentation Tool - Frontend JavaScript
 
 const API_BASE_URL = 'http://localhost:8000';
+const LIVE_URL = API_BASE_URL.replace(/^http/, 'ws') + '/segment/live';
+
+// Characters outside the Basic Multilingual Plane are two UTF-16 code units
+// in JavaScript but one character in the offsets the server uses
+const SURROGATE_PAIRS = /[\uD800-\uDBFF][\uDC00-\uDFFF]/g;
+const HAS_SURROGATE_PAIR = /[\uD800-\uDBFF][\uDC00-\uDFFF]/;
 
 // DOM elements
 const textInput = document.getElementById('text-input');
@@ -14,6 +20,17 @@ const sentenceCount = document.getElementById('sentence-count');
 const methodInfo = document.getElementById('method-info');
 const errorMessage = document.getElementById('error-message');
 
+// Live segmentation state: the connection, the text and sentences the server
+// holds, whether an edit is waiting for its diff and whether more edits were
+// made meanwhile
+let liveSocket = null;
+let liveText = '';
+let liveSentences = [];
+let liveAstral = false;
+let liveWaiting = false;
+let livePending = false;
+let liveStale = false;
+
 /**
  * Handle sentence segmentation request
  */
@@ -26,16 +43,17 @@ async function segmentSentences() {
         return;
     }
     
+    // With a live connection the server re-segments the whole document
+    if (liveSocket) {
+        hideError();
+        sendLiveReset();
+        return;
+    }
+    
     // Get selected options
     const language = languageSelect.value;
     const method = methodSelect.value;
     
-    // Validate method-language combination
-    if (method === 'baseline' && language !== 'en') {
-        showError('Baseline method only supports English. Please select English or use spaCy method.');
-        return;
-    }
-    
     // Show loading state
     setLoadingState(true);
     hideError();
@@ -83,8 +101,11 @@ function displayResults(data) {
     const language = data.language || 'en';
     
     // Update info
-    sentenceCount.textContent = `${count} sentence${count !== 1 ? 's' : ''} found`;
-    methodInfo.textContent = `Method: ${method.toUpperCase()} | Language: ${language.toUpperCase()}`;
+    describeResult(count, method, language);
+    if (data.spacy_fraction !== undefined) {
+        // Hybrid method: share of the text that needed the spaCy model
+        methodInfo.textContent += ` | spaCy on ${(data.spacy_fraction * 100).toFixed(1)}% of text`;
+    }
     
     // Clear previous output
     sentencesOutput.innerHTML = '';
@@ -93,14 +114,8 @@ function displayResults(data) {
     if (sentences.length === 0) {
         sentencesOutput.innerHTML = '<p style="color: #666; text-align: center; padding: 20px;">No sentences found.</p>';
     } else {
-        sentences.forEach((sentence, index) => {
-            const sentenceElement = document.createElement('div');
-            sentenceElement.className = 'sentence-item';
-            sentenceElement.innerHTML = `
-                <span class="sentence-number">${index + 1}.</span>
-                <span class="sentence-text">${escapeHtml(sentence)}</span>
-            `;
-            sentencesOutput.appendChild(sentenceElement);
+        sentences.forEach((sentence) => {
+            sentencesOutput.appendChild(createSentenceElement(sentence));
         });
     }
     
@@ -111,6 +126,220 @@ function displayResults(data) {
     outputSection.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
 }
 
+/**
+ * Show the sentence count and settings of a result
+ */
+function describeResult(count, method, language) {
+    sentenceCount.textContent = `${count} sentence${count !== 1 ? 's' : ''} found`;
+    methodInfo.textContent = `Method: ${method.toUpperCase()} | Language: ${language.toUpperCase()}`;
+}
+
+/**
+ * Create the element for one sentence; numbers come from a CSS counter, so
+ * sentences can be inserted and removed without renumbering the others
+ */
+function createSentenceElement(sentence) {
+    const sentenceElement = document.createElement('div');
+    sentenceElement.className = 'sentence-item';
+    sentenceElement.innerHTML = `
+        <span class="sentence-number"></span>
+        <span class="sentence-text">${escapeHtml(sentence)}</span>
+    `;
+    return sentenceElement;
+}
+
+/**
+ * Open the live segmentation WebSocket, reconnecting when it closes
+ */
+function connectLive() {
+    const socket = new WebSocket(LIVE_URL);
+    
+    socket.addEventListener('open', () => {
+        liveSocket = socket;
+        liveText = '';
+        liveSentences = [];
+        liveWaiting = false;
+        livePending = false;
+        liveStale = false;
+        if (textInput.value.trim()) {
+            sendLiveReset();
+        }
+    });
+    
+    socket.addEventListener('message', (event) => {
+        handleLiveMessage(JSON.parse(event.data));
+    });
+    
+    socket.addEventListener('close', () => {
+        // The Segment button falls back to /segment until the server is back
+        liveSocket = null;
+        setTimeout(connectLive, 5000);
+    });
+}
+
+/**
+ * Send the whole textarea to the live connection
+ */
+function sendLiveReset() {
+    liveText = textInput.value;
+    liveAstral = HAS_SURROGATE_PAIR.test(liveText);
+    liveWaiting = true;
+    livePending = false;
+    liveStale = false;
+    liveSocket.send(JSON.stringify({
+        type: 'reset',
+        text: liveText,
+        language: languageSelect.value,
+        method: methodSelect.value
+    }));
+}
+
+/**
+ * Send the change between the server's text and the textarea as one edit
+ */
+function sendLiveEdit() {
+    if (!liveSocket) {
+        return;
+    }
+    if (liveStale) {
+        sendLiveReset();
+        return;
+    }
+    
+    // One edit at a time: changes made while the server works are sent
+    // together once its diff arrives
+    if (liveWaiting) {
+        livePending = true;
+        return;
+    }
+    
+    const text = textInput.value;
+    const edit = findEdit(liveText, text, textInput.selectionEnd);
+    if (!edit) {
+        return;
+    }
+    
+    const inserted = text.slice(edit.start, edit.newEnd);
+    const message = {
+        type: 'replace',
+        offset: countCharacters(liveText.slice(0, edit.start)),
+        length: countCharacters(liveText.slice(edit.start, edit.oldEnd)),
+        text: inserted
+    };
+    liveAstral = liveAstral || HAS_SURROGATE_PAIR.test(inserted);
+    liveText = text;
+    liveWaiting = true;
+    liveSocket.send(JSON.stringify(message));
+}
+
+/**
+ * Find the single replacement that turns oldText into newText.
+ * The caret sits right after the edit, so the text before and after it is
+ * compared in one step and only the edit itself character by character.
+ */
+function findEdit(oldText, newText, caret) {
+    if (oldText === newText) {
+        return null;
+    }
+    const limit = Math.min(oldText.length, newText.length);
+    
+    let start = Math.max(0, Math.min(caret - Math.max(newText.length - oldText.length, 0), limit));
+    if (oldText.slice(0, start) !== newText.slice(0, start)) {
+        start = 0;
+    }
+    while (start < limit && oldText[start] === newText[start]) {
+        start++;
+    }
+    
+    let suffix = Math.max(0, Math.min(newText.length - caret, limit - start));
+    if (oldText.slice(oldText.length - suffix) !== newText.slice(newText.length - suffix)) {
+        suffix = 0;
+    }
+    while (suffix < limit - start &&
+           oldText[oldText.length - 1 - suffix] === newText[newText.length - 1 - suffix]) {
+        suffix++;
+    }
+    
+    // Never cut a surrogate pair in half
+    if (start > 0 && /[\uD800-\uDBFF]/.test(newText[start - 1])) {
+        start--;
+    }
+    if (suffix > 0 && /[\uDC00-\uDFFF]/.test(newText[newText.length - suffix])) {
+        suffix--;
+    }
+    return { start: start, oldEnd: oldText.length - suffix, newEnd: newText.length - suffix };
+}
+
+/**
+ * Length of text in characters (code points), as the server counts offsets
+ */
+function countCharacters(text) {
+    if (!liveAstral) {
+        return text.length;
+    }
+    return text.length - (text.match(SURROGATE_PAIRS) || []).length;
+}
+
+/**
+ * Handle a diff or an error from the live connection
+ */
+function handleLiveMessage(message) {
+    liveWaiting = false;
+    
+    if (message.type === 'error') {
+        if (message.status === 409) {
+            // The server's copy of the text differs from ours: start over
+            sendLiveReset();
+        } else if (message.status === 503) {
+            // Busy or still loading models: try again shortly
+            liveWaiting = true;
+            setTimeout(() => liveSocket && sendLiveReset(), (message.retry_after || 1) * 1000);
+        } else {
+            liveStale = true;
+            showError(`Error: ${message.detail}`);
+        }
+        return;
+    }
+    
+    applyLiveDiff(message);
+    if (livePending) {
+        livePending = false;
+        sendLiveEdit();
+    }
+}
+
+/**
+ * Apply a sentence diff to the sentence list and the page
+ */
+function applyLiveDiff(diff) {
+    const items = sentencesOutput.children;
+    if (diff.start === 0 && diff.delete === liveSentences.length) {
+        liveSentences = diff.sentences.slice();
+        sentencesOutput.innerHTML = '';
+        diff.sentences.forEach((sentence) => {
+            sentencesOutput.appendChild(createSentenceElement(sentence));
+        });
+    } else {
+        liveSentences.splice(diff.start, diff.delete, ...diff.sentences);
+        for (let i = 0; i < diff.delete; i++) {
+            items[diff.start].remove();
+        }
+        const next = items[diff.start] || null;
+        diff.sentences.forEach((sentence) => {
+            sentencesOutput.insertBefore(createSentenceElement(sentence), next);
+        });
+    }
+    
+    hideError();
+    if (liveSentences.length === 0) {
+        hideOutput();
+        return;
+    }
+    describeResult(diff.count, methodSelect.value, languageSelect.value);
+    methodInfo.textContent += ` | Live, updated in ${diff.elapsed_ms.toFixed(1)} ms`;
+    outputSection.style.display = 'block';
+}
+
 /**
  * Show error message
  */
@@ -160,27 +389,14 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-/**
- * Handle method change - disable non-English languages for baseline
- */
-function handleMethodChange() {
-    const method = methodSelect.value;
-    const language = languageSelect.value;
-    
-    if (method === 'baseline' && language !== 'en') {
-        languageSelect.value = 'en';
-        // Show a brief notification
-        const notification = document.createElement('div');
-        notification.style.cssText = 'position: fixed; top: 20px; right: 20px; background: #667eea; color: white; padding: 15px 20px; border-radius: 6px; box-shadow: 0 4px 15px rgba(0,0,0,0.2); z-index: 1000;';
-        notification.textContent = 'Baseline method only supports English. Language switched to English.';
-        document.body.appendChild(notification);
-        setTimeout(() => notification.remove(), 3000);
-    }
-}
-
 // Event listeners
 segmentBtn.addEventListener('click', segmentSentences);
 
+// Live segmentation while typing, and again whenever the settings change
+textInput.addEventListener('input', sendLiveEdit);
+languageSelect.addEventListener('change', () => liveSocket && sendLiveReset());
+methodSelect.addEventListener('change', () => liveSocket && sendLiveReset());
+
 // Allow Enter key (Ctrl+Enter or Cmd+Enter) to segment
 textInput.addEventListener('keydown', (e) => {
     if ((e.ctrlKey || e.metaKey) && e.key === 'Enter') {
@@ -188,16 +404,6 @@ textInput.addEventListener('keydown', (e) => {
     }
 });
 
-// Handle method change
-methodSelect.addEventListener('change', handleMethodChange);
-
-// Handle language change when baseline is selected
-languageSelect.addEventListener('change', () => {
-    if (methodSelect.value === 'baseline' && languageSelect.value !== 'en') {
-        handleMethodChange();
-    }
-});
-
 // Check API health on load
 window.addEventListener('load', async () => {
     try {
@@ -208,4 +414,5 @@ window.addEventListener('load', async () => {
     } catch (error) {
         console.warn('⚠ Backend API not reachable. Make sure the server is running.');
     }
+    connectLive();
 });
@@ -2,10 +2,19 @@
 """
 Convenience script to run the FastAPI server.
 
+Without --workers this starts a single server process; add --reload during
+development to restart it on code changes. With --workers N the models are
+loaded once and N worker processes are forked from that process, sharing
+the model memory (see backend/prefork.py).
+
 Usage:
-    python run_server.py
+    python run_server.py [--reload]
+    python run_server.py --workers 4 [--max-requests 10000] [--port 8000]
+
+Send SIGHUP to the pre-fork server for a rolling restart of the workers.
 """
 
+import argparse
 import uvicorn
 import sys
 import os
@@ -13,18 +22,56 @@ import os
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+
+def parse_args():
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description="Run the Sentence Segmentation API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Fork this many workers that share the loaded models "
+                             "(default: $SEGMENT_WORKERS, or a single server "
+                             "process if that is unset)")
+    parser.add_argument("--max-requests", type=int, default=None,
+                        help="Recycle a worker after this many requests, 0 for never")
+    parser.add_argument("--max-requests-jitter", type=int, default=None,
+                        help="Random extra requests per worker before recycling")
+    parser.add_argument("--graceful-timeout", type=int, default=None,
+                        help="Seconds workers get to finish requests when stopping")
+    parser.add_argument("--reload", action="store_true",
+                        help="Restart on code changes (development, single process only)")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+
     print("="*70)
     print("Starting Sentence Segmentation API Server")
     print("="*70)
-    print("\nServer will be available at: http://localhost:8000")
-    print("API documentation: http://localhost:8000/docs")
+    print(f"\nServer will be available at: http://localhost:{args.port}")
+    print(f"API documentation: http://localhost:{args.port}/docs")
     print("\nPress Ctrl+C to stop the server.\n")
-    
+
+    if args.workers is not None or os.environ.get("SEGMENT_WORKERS"):
+        from backend.prefork import PreforkServer
+
+        server = PreforkServer(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            graceful_timeout=args.graceful_timeout,
+            log_level=args.log_level
+        )
+        sys.exit(server.run())
+
     uvicorn.run(
         "backend.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        log_level=args.log_level
     )
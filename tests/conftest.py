@@ -0,0 +1,32 @@
+"""
+Shared pytest setup: makes the backend and evaluation packages importable
+when the tests are run from any directory, and keeps every database a test
+creates inside its tmp_path.
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolated_databases(tmp_path, monkeypatch):
+    """Point the job queue and the disk cache at the test's own directory."""
+    monkeypatch.setenv("SEGMENT_JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.delenv("SEGMENT_CACHE_DB", raising=False)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Test client for the API app, started and stopped around the test."""
+    # The app serves frontend/ relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,105 @@
+"""
+Regression tests for the rule-based splitter (backend/baseline_splitter.py).
+
+The expected sentences on the gold data are those of the original
+character-by-character splitter, with two deliberate changes: the final
+sentence is no longer emitted twice, and "Prof." is an abbreviation since
+abbreviations are no longer limited to three letters.
+"""
+
+import json
+import os
+
+import pytest
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+
+EVALUATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "evaluation")
+
+GOLD_EXPECTED = {
+    "dataset_1": [
+        "Dr. Smith went to the U.S.A. in 2020.",
+        "He visited New York, N.Y. and Los Angeles, Calif.",
+        "The weather was great!",
+        "He said, \"This is amazing.\" Then he returned home.",
+    ],
+    "dataset_2": [
+        "The temperature was 98.6 degrees.",
+        "The price is $19.99.",
+        "The value of pi is approximately 3.14159.",
+        "We measured 2.5 meters.",
+    ],
+    "dataset_3": [
+        "Prof. Johnson asked, \"What time is it?\" The student replied, \"It's 3:00 p.m.\" "
+        "They discussed the topic at length.",
+        "Finally, they agreed!",
+    ],
+    "dataset_4": [
+        "Mr. and Mrs. Brown live on Main St. They work for ABC Inc. "
+        "Their address is 123 Oak Ave., Suite 4B.",
+        "They moved there in Jan. 2021.",
+    ],
+    "dataset_5": [
+        "She thought about it... then decided. \"Wait!\" he exclaimed. \"Are you sure?\" "
+        "She nodded. \"Yes, I'm certain.\"",
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def splitter():
+    return BaselineSentenceSplitter()
+
+
+def load_datasets():
+    with open(os.path.join(EVALUATION_DIR, "gold_standard_data.json"), encoding="utf-8") as f:
+        return json.load(f)["datasets"]
+
+
+@pytest.mark.parametrize("dataset", load_datasets(), ids=lambda dataset: dataset["id"])
+def test_gold_data_output_is_unchanged(splitter, dataset):
+    assert splitter.split(dataset["text"]) == GOLD_EXPECTED[dataset["id"]]
+
+
+def test_sample_data_output_is_unchanged(splitter):
+    with open(os.path.join(EVALUATION_DIR, "sample_data.json"), encoding="utf-8") as f:
+        sample = json.load(f)
+    assert splitter.split(sample["text"]) == GOLD_EXPECTED["dataset_1"]
+
+
+@pytest.mark.parametrize("language, text, expected", [
+    # Abbreviations, including multi-dot forms, never end a sentence
+    ("en", "I met Mr. Smith. He smiled.", ["I met Mr. Smith.", "He smiled."]),
+    ("en", "He left at 5 p.m. Then he slept.", ["He left at 5 p.m. Then he slept."]),
+    ("en", "The U.S. Army arrived. They left.", ["The U.S. Army arrived.", "They left."]),
+    ("en", "He works at Acme Corp. Inc. Ltd. Really.", ["He works at Acme Corp. Inc. Ltd. Really."]),
+    # Decimals, punctuation runs and lowercase starts
+    ("en", "The value is 3.14. It is pi.", ["The value is 3.14.", "It is pi."]),
+    ("en", "Wait... What happened? Nothing!", ["Wait...", "What happened?", "Nothing!"]),
+    ("en", "Really?! Yes. OK!!! Fine.", ["Really?!", "Yes.", "OK!!!", "Fine."]),
+    ("en", "see the docs. then continue. Then stop.", ["see the docs. then continue.", "Then stop."]),
+    # Whitespace is normalized, and a missing final period is fine
+    ("en", "Hello   world.\n\nNext\tline here.", ["Hello world.", "Next line here."]),
+    ("en", "No punctuation at the end", ["No punctuation at the end"]),
+    ("en", "", []),
+    ("en", "   \n ", []),
+    # Each language uses its own lexicon
+    ("fr", "M. Dupont est arrivé. Il est parti.", ["M. Dupont est arrivé.", "Il est parti."]),
+    ("en", "M. Dupont est arrivé. Il est parti.", ["M.", "Dupont est arrivé.", "Il est parti."]),
+    ("de", "Das ist z.B. ein Test. Er geht.", ["Das ist z.B. ein Test.", "Er geht."]),
+    ("es", "La Sra. García llegó. Se fue.", ["La Sra. García llegó.", "Se fue."]),
+    ("es", "Viven en EE.UU. Desde 2010.", ["Viven en EE.UU. Desde 2010."]),
+])
+def test_edge_cases(splitter, language, text, expected):
+    assert splitter.split(text, language) == expected
+
+
+@pytest.mark.parametrize("dataset", load_datasets(), ids=lambda dataset: dataset["id"])
+def test_spans_match_split(splitter, dataset):
+    text = dataset["text"]
+    assert splitter.span_texts(text, splitter.split_spans(text)) == splitter.split(text)
+
+
+def test_unsupported_language(splitter):
+    with pytest.raises(ValueError):
+        splitter.split("Hello.", "xx")
@@ -0,0 +1,188 @@
+"""
+Tests for the request coalescer (backend/batching.py), with a fake executor
+whose spaCy calls wait until the test releases them.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.batching import RequestCoalescer
+from backend.executor import ExecutorSaturated
+
+
+class FakePool:
+    name = "spacy"
+    retry_after = 1
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+
+
+class FakeExecutor:
+    """Records every batch; a batch returns its texts upper-cased as "spans"."""
+
+    def __init__(self, workers=1, max_pending=64, fail_on=None):
+        self.spacy_workers = workers
+        self.spacy_pool = FakePool(max_pending)
+        self.fail_on = fail_on
+        self.batches = []
+        self.running = 0
+        self.most_running = 0
+        self.release = asyncio.Event()
+
+    async def run_spacy(self, func, texts, language, profile, batch_size):
+        self.batches.append(list(texts))
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        try:
+            await self.release.wait()
+            if self.fail_on in texts:
+                raise ValueError(f"cannot segment {self.fail_on}")
+            return [text.upper() for text in texts]
+        finally:
+            self.running -= 1
+
+
+def start(coalescer, text):
+    return asyncio.ensure_future(coalescer.split_spans("spacy", text, "en", None))
+
+
+async def settle():
+    """Let scheduled callbacks and tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_single_request_is_not_delayed():
+    async def scenario():
+        executor = FakeExecutor()
+        executor.release.set()
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=1000)
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        result = await coalescer.split_spans("spacy", "alone", "en", None)
+        assert result == ("ALONE", None)
+        # No batch was in flight, so the window was zero
+        assert loop.time() - began < 0.5
+        assert executor.batches == [["alone"]]
+
+    asyncio.run(scenario())
+
+
+def test_requests_wait_for_the_window_under_load():
+    async def scenario():
+        executor = FakeExecutor(workers=2)
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=50)
+        loop = asyncio.get_running_loop()
+        first = start(coalescer, "a")
+        await settle()
+        assert executor.batches == [["a"]]
+
+        # A batch is running and requests arrive close together: they wait
+        # for the window although a worker is free
+        began = loop.time()
+        others = [start(coalescer, text) for text in ("b", "c")]
+        await settle()
+        assert executor.batches == [["a"]]
+        while len(executor.batches) < 2:
+            await asyncio.sleep(0.005)
+        assert loop.time() - began >= 0.04
+        assert executor.batches == [["a"], ["b", "c"]]
+
+        executor.release.set()
+        assert [(await task)[0] for task in [first] + others] == ["A", "B", "C"]
+
+    asyncio.run(scenario())
+
+
+def test_in_flight_batches_are_capped_by_workers():
+    async def scenario():
+        executor = FakeExecutor(workers=1)
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=1)
+        first = start(coalescer, "a")
+        await settle()
+        tasks = [start(coalescer, text) for text in ("b", "c", "d")]
+        await asyncio.sleep(0.02)
+        # The window has ended, but the only worker is busy
+        assert executor.batches == [["a"]]
+
+        executor.release.set()
+        results = await asyncio.gather(first, *tasks)
+        assert [spans for spans, _ in results] == ["A", "B", "C", "D"]
+        assert executor.batches == [["a"], ["b", "c", "d"]]
+        assert executor.most_running == 1
+
+    asyncio.run(scenario())
+
+
+def test_groups_are_split_at_max_batch():
+    async def scenario():
+        executor = FakeExecutor(workers=1)
+        coalescer = RequestCoalescer(executor, max_batch=2, max_wait_ms=1)
+        first = start(coalescer, "t0")
+        await settle()
+        tasks = [start(coalescer, f"t{index}") for index in range(1, 6)]
+        await settle()
+
+        executor.release.set()
+        results = await asyncio.gather(first, *tasks)
+        assert [spans for spans, _ in results] == [f"T{index}" for index in range(6)]
+        assert [len(batch) for batch in executor.batches] == [1, 2, 2, 1]
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_is_retried_singly():
+    async def scenario():
+        executor = FakeExecutor(workers=1, fail_on="bad")
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=1)
+        first = start(coalescer, "a")
+        await settle()
+        tasks = [start(coalescer, text) for text in ("b", "bad", "c")]
+        await settle()
+
+        executor.release.set()
+        results = await asyncio.gather(first, *tasks, return_exceptions=True)
+        assert results[0] == ("A", None)
+        assert results[1] == ("B", None)
+        assert isinstance(results[2], ValueError)
+        assert results[3] == ("C", None)
+        assert executor.batches == [["a"], ["b", "bad", "c"], ["b"], ["bad"], ["c"]]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_callers_are_skipped():
+    async def scenario():
+        executor = FakeExecutor(workers=1)
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=1)
+        first = start(coalescer, "a")
+        await settle()
+        gone, kept = start(coalescer, "gone"), start(coalescer, "kept")
+        await settle()
+        gone.cancel()
+
+        executor.release.set()
+        assert (await kept)[0] == "KEPT"
+        await first
+        assert executor.batches == [["a"], ["kept"]]
+
+    asyncio.run(scenario())
+
+
+def test_waiting_requests_count_against_max_pending():
+    async def scenario():
+        executor = FakeExecutor(workers=1, max_pending=2)
+        coalescer = RequestCoalescer(executor, max_batch=32, max_wait_ms=1)
+        first = start(coalescer, "a")
+        await settle()
+        waiting = [start(coalescer, text) for text in ("b", "c")]
+        await settle()
+        with pytest.raises(ExecutorSaturated):
+            await coalescer.split_spans("spacy", "d", "en", None)
+
+        executor.release.set()
+        await asyncio.gather(first, *waiting)
+
+    asyncio.run(scenario())
@@ -0,0 +1,24 @@
+"""
+Tests for the result cache (backend/cache.py).
+"""
+
+import sqlite3
+
+from backend.cache import ResultCache
+
+
+def test_disk_hits_do_not_commit_but_keep_lru_order(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(max_bytes=0, db_path=path, db_max_bytes=3000)
+    for index in range(3):
+        cache.put(f"k{index}", b"x" * 1000)
+
+    assert cache.get("k0") == b"x" * 1000
+    assert not cache._db.in_transaction
+
+    # The pending access time of k0 is written with the next store, so the
+    # least recently used k1 is the one evicted
+    cache.put("k3", b"y" * 1000)
+    keys = [row[0] for row in sqlite3.connect(path).execute("SELECT key FROM results ORDER BY key")]
+    assert keys == ["k0", "k2", "k3"]
+    assert cache.stats()["disk_evictions"] == 1
@@ -0,0 +1,23 @@
+"""
+Tests for the bulk segmentation CLI (backend/cli.py).
+"""
+
+import json
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.cli import main
+
+TEXT = "Hello\n   world is here. Next\tone\nfollows. Dr. Smith left at 5 p.m. and came back."
+
+
+def test_baseline_with_text_matches_split(tmp_path):
+    source = tmp_path / "docs.jsonl"
+    source.write_text(json.dumps({"id": "a", "text": TEXT}) + "\n", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+
+    assert main(["segment", str(source), "-o", str(output), "--with-text", "--workers", "1"]) == 0
+
+    record = json.loads(output.read_text(encoding="utf-8"))
+    splitter = BaselineSentenceSplitter()
+    assert record["sentences"] == splitter.split(TEXT)
+    assert record["spans"] == splitter.split_spans(TEXT).to_list()
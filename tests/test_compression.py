@@ -0,0 +1,56 @@
+"""
+Tests for compressed request bodies (backend/compression.py).
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.compression import RequestDecompressionMiddleware
+
+BODY = ("The quick brown fox jumps over the lazy dog. " * 5000).encode("utf-8")
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data)
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(RequestDecompressionMiddleware(app))
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_compressed_body(client, encoding):
+    response = client.post("/echo", content=compress(encoding, BODY),
+                           headers={"Content-Encoding": encoding})
+    assert response.status_code == 200
+    assert response.json() == {"size": len(BODY)}
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+@pytest.mark.parametrize("keep", [0.5, 0.99])
+def test_truncated_body_is_rejected(client, encoding, keep):
+    data = compress(encoding, BODY)
+    response = client.post("/echo", content=data[:int(len(data) * keep)],
+                           headers={"Content-Encoding": encoding})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith(f"Invalid {encoding} request body: truncated")
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_concatenated_streams(client, encoding):
+    data = compress(encoding, BODY) + compress(encoding, b"Tail.")
+    response = client.post("/echo", content=data, headers={"Content-Encoding": encoding})
+    assert response.json() == {"size": len(BODY) + 5}
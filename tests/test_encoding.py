@@ -0,0 +1,109 @@
+"""
+Tests for the /segment response encodings (backend/encoding.py).
+"""
+
+import json
+
+import pytest
+
+from backend import encoding
+from backend.spans import SentenceSpans
+
+TEXT = "Dr. Smith went home. \U0001F600 It rained!\n\nThe end."
+
+
+def make_spans(pairs):
+    spans = SentenceSpans()
+    for start, end in pairs:
+        spans.append(start, end)
+    return spans
+
+
+@pytest.mark.parametrize("pairs", [
+    [],
+    [(0, 5)],
+    [(0, 127), (127, 255), (383, 16384 + 383)],
+    # Gaps and lengths across the one-, two- and three-byte varint limits
+    [(127, 128), (256, 16639), (16640 + 16384, 16640 + 16384 + 2 ** 21)],
+    [(0, 0), (0, 2 ** 35)],
+])
+def test_offsets_round_trip(pairs):
+    data = encoding.encode_offsets(make_spans(pairs))
+    assert data.startswith(encoding.OFFSETS_MAGIC)
+    assert encoding.decode_offsets(data).to_list() == [list(pair) for pair in pairs]
+
+
+def test_offsets_are_compact():
+    spans = make_spans([(index * 50 + 1, index * 50 + 50) for index in range(1000)])
+    data = encoding.encode_offsets(spans)
+    # Magic, a two-byte count and one byte per gap and length
+    assert len(data) == 3 + 2 + 2000
+
+
+@pytest.mark.parametrize("data", [
+    b"XX1\x01\x00\x05",
+    encoding.OFFSETS_MAGIC + b"\x02\x00\x05\x01",
+    encoding.OFFSETS_MAGIC + b"\x01\x00\x85",
+])
+def test_corrupt_offsets_are_rejected(data):
+    with pytest.raises(ValueError):
+        encoding.decode_offsets(data)
+
+
+def test_overlapping_spans_cannot_be_encoded():
+    with pytest.raises(ValueError):
+        encoding.encode_offsets(make_spans([(0, 10), (5, 12)]))
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    spans = make_spans([(0, 20), (21, 34), (36, 44)])
+    fields = {"spans": spans, "method": "baseline", "language": "en", "pipeline": None,
+              "count": 3, "spacy_fraction": None}
+
+    decoded = msgpack.unpackb(encoding.encode_response(encoding.MSGPACK, fields), raw=False)
+    assert decoded == {"spans": spans.to_list(), "method": "baseline", "language": "en",
+                       "count": 3}
+    assert json.loads(encoding.encode_response(encoding.JSON, fields)) == decoded
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, encoding.JSON),
+    ("*/*", encoding.JSON),
+    ("application/x-sentence-offsets", encoding.OFFSETS),
+    ("application/json;q=0.5, application/x-sentence-offsets", encoding.OFFSETS),
+    ("application/x-sentence-offsets;q=0, application/json", encoding.JSON),
+    ("text/html, application/*;q=0.1", encoding.JSON),
+])
+def test_negotiate(accept, expected):
+    assert encoding.negotiate(accept) == expected
+
+
+def test_negotiate_unavailable_type():
+    with pytest.raises(ValueError):
+        encoding.negotiate("text/html")
+
+
+@pytest.mark.parametrize("accept", ["application/x-sentence-offsets", "application/msgpack"])
+def test_segment_encodings_match_json(api, accept):
+    if accept == encoding.MSGPACK:
+        msgpack = pytest.importorskip("msgpack")
+    request = {"text": TEXT, "method": "baseline", "output": "spans"}
+    expected = api.post("/segment", json=request).json()["spans"]
+
+    response = api.post("/segment", json=request, headers={"Accept": accept})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(accept)
+    if accept == encoding.OFFSETS:
+        spans = encoding.decode_offsets(response.content).to_list()
+    else:
+        spans = msgpack.unpackb(response.content, raw=False)["spans"]
+    assert spans == expected
+    # Offsets count code points, so the emoji is one character
+    assert [TEXT[start:end] for start, end in spans][-1] == "The end."
+
+
+def test_segment_rejects_unavailable_encoding(api):
+    response = api.post("/segment", json={"text": TEXT, "method": "baseline"},
+                        headers={"Accept": "text/html"})
+    assert response.status_code == 406
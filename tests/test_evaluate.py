@@ -0,0 +1,93 @@
+"""
+Tests for the boundary matcher and metrics in evaluation/evaluate.py.
+"""
+
+import json
+import os
+
+import pytest
+
+from evaluation.evaluate import SegmentationEvaluator, _precision_recall_f1, match_boundaries
+
+EVALUATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "evaluation")
+
+
+def nested_loop_metrics(gold_boundaries, predicted_boundaries):
+    """The matcher as it was before the two-pointer rewrite, for comparison."""
+    tp = 0
+    for gold_pos in gold_boundaries:
+        for pred_pos in predicted_boundaries:
+            if abs(gold_pos - pred_pos) <= 5:
+                tp += 1
+                break
+    precision = tp / len(predicted_boundaries) if predicted_boundaries else 0.0
+    recall = tp / len(gold_boundaries) if gold_boundaries else 0.0
+    return round(precision, 4), round(recall, 4)
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    return SegmentationEvaluator()
+
+
+@pytest.mark.parametrize("gold, predicted, expected", [
+    ([10, 10, 20], [10], 1),        # duplicate gold boundaries share one prediction
+    ([10], [9, 10, 11], 1),         # duplicate predictions match one gold boundary
+    ([10, 12], [11], 1),            # one prediction in two windows counts once
+    ([0, 6], [5, 7], 2),            # the earliest unused prediction leaves 7 for 6
+    ([20, 10], [11, 21], 2),        # unsorted input
+    ([10], [15], 1),                # the window includes the tolerance
+    ([10], [16], 0),
+    ([], [1, 2], 0),
+    ([1, 2], [], 0),
+])
+def test_match_boundaries_is_one_to_one(gold, predicted, expected):
+    assert match_boundaries(gold, predicted) == expected
+
+
+def test_duplicate_predictions_are_false_positives(evaluator):
+    metrics = evaluator._calculate_metrics([10, 30], [10, 10, 30], 3, 4)
+    assert (metrics["true_positives"], metrics["false_positives"], metrics["false_negatives"]) == (2, 1, 0)
+
+
+def test_gold_data_scores_are_unchanged(evaluator):
+    with open(os.path.join(EVALUATION_DIR, "gold_standard_data.json"), encoding="utf-8") as f:
+        datasets = json.load(f)["datasets"]
+
+    for dataset in datasets:
+        text, gold_sentences = dataset["text"], dataset["sentences"]
+        gold = evaluator._get_sentence_boundaries(text, gold_sentences)
+        spans = evaluator.baseline_splitter.split_spans(text)
+        predicted = evaluator._get_span_boundaries(spans)
+
+        metrics = evaluator._calculate_metrics(gold, predicted, len(gold_sentences), len(spans))
+        expected = nested_loop_metrics(gold, predicted)
+        assert (metrics["precision"], metrics["recall"]) == expected, dataset["id"]
+
+        perfect = evaluator._calculate_metrics(gold, gold, len(gold_sentences), len(gold_sentences))
+        assert perfect["false_positives"] == perfect["false_negatives"] == 0
+        assert perfect["precision"] == perfect["recall"] == perfect["f1_score"] == 1.0
+
+
+def test_perfect_segmentation_scores_one(evaluator):
+    documents = [
+        ("One sentence here. Another one. A third.", ["One sentence here.", "Another one.", "A third."]),
+        ("Just one sentence.", ["Just one sentence."]),
+    ]
+    result = evaluator.evaluate_corpus(documents, system="baseline")
+    for averages in (result["micro"], result["macro"]):
+        assert (averages["precision"], averages["recall"], averages["f1_score"]) == (1.0, 1.0, 1.0)
+    assert result["micro"]["false_positives"] == result["micro"]["false_negatives"] == 0
+
+
+@pytest.mark.parametrize("tp, fp, fn, expected", [
+    (2, 0, 0, (1.0, 1.0, 1.0)),
+    (0, 0, 0, (1.0, 1.0, 1.0)),     # one sentence, segmented as one
+    (1, 1, 0, (0.5, 1.0, 0.6667)),
+    (1, 0, 3, (1.0, 0.25, 0.4)),
+    (0, 2, 0, (0.0, 0.0, 0.0)),     # one gold sentence, split in three
+    (0, 0, 2, (0.0, 0.0, 0.0)),
+])
+def test_scores_use_boundary_counts(tp, fp, fn, expected):
+    metrics = _precision_recall_f1(tp, fp, fn)
+    assert (metrics["precision"], metrics["recall"], metrics["f1_score"]) == expected
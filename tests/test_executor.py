@@ -0,0 +1,100 @@
+"""
+Tests for the executor layer (backend/executor.py).
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from backend.executor import ExecutorSaturated, PoolRestarting, SegmentationExecutor
+from backend.spacy_splitter import SpacySentenceSplitter
+
+
+def test_process_pool_recovers_from_dead_worker():
+    executor = SegmentationExecutor(SpacySentenceSplitter(), process_workers=1,
+                                    spacy_mode="process")
+
+    async def scenario():
+        await executor.run_spacy(os.getpid)
+        with pytest.raises(PoolRestarting):
+            await executor.run_spacy(os._exit, 1)
+        assert executor.spacy_pool.pending == 0
+        # The next task gets a fresh pool instead of BrokenProcessPool
+        return await executor.run_spacy(os.getpid)
+
+    try:
+        worker_pid = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert worker_pid != os.getpid()
+
+
+def test_cancelled_waiter_keeps_task_pending_until_it_finishes():
+    executor = SegmentationExecutor(SpacySentenceSplitter(), thread_workers=1, max_pending=2)
+    pool = executor.baseline_pool
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(blocking))
+        queued = asyncio.ensure_future(pool.run(blocking))
+        await asyncio.to_thread(started.wait, 5)
+
+        # The caller went away, but the thread is still busy
+        running.cancel()
+        await asyncio.sleep(0.05)
+        assert pool.pending == 2
+        with pytest.raises(ExecutorSaturated):
+            pool.submit(blocking)
+
+        release.set()
+        await queued
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_cancelled_queued_task_is_not_counted():
+    executor = SegmentationExecutor(SpacySentenceSplitter(), thread_workers=1, max_pending=4)
+    pool = executor.baseline_pool
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(blocking))
+        await asyncio.to_thread(started.wait, 5)
+        queued = asyncio.ensure_future(pool.run(os.getpid))
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+
+        # A task that never started is dropped with its waiter
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert pool.pending == 1
+
+        release.set()
+        await running
+        await asyncio.sleep(0.05)
+        assert pool.pending == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,77 @@
+"""
+Tests for the evaluation harness (evaluation/harness.py).
+"""
+
+import argparse
+import json
+
+import pytest
+
+from evaluation import harness
+
+DOCUMENTS = [
+    ["The cat sat on the mat.", "It was warm.", "Then it left."],
+    ["Dr. Smith arrived at 5 p.m. today.", "He was late."],
+    ["A single sentence."],
+]
+
+
+def run_harness(tmp_path, source, **options):
+    args = argparse.Namespace(
+        inputs=[str(source)], output=str(tmp_path / "results"), format="auto",
+        systems=["baseline"], language="en", pipeline=None, workers=1, batch_size=2,
+        sentences_per_doc=2, resume=False,
+    )
+    for key, value in options.items():
+        setattr(args, key, value)
+    summary = harness.run(args)
+    with open(tmp_path / "results" / "documents.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return summary, records
+
+
+def assert_perfect(summary, records):
+    for record in records:
+        result = record["systems"]["baseline"]
+        assert (result["precision"], result["recall"], result["f1_score"]) == (1.0, 1.0, 1.0)
+        assert result["false_positives"] == result["false_negatives"] == 0
+    metrics = summary["systems"]["baseline"]
+    for averages in (metrics["micro"], metrics["macro"]):
+        assert averages["f1_score"] == 1.0
+
+
+def test_perfect_jsonl_corpus_scores_one(tmp_path):
+    source = tmp_path / "gold.jsonl"
+    source.write_text("".join(json.dumps({"id": str(index), "sentences": sentences}) + "\n"
+                              for index, sentences in enumerate(DOCUMENTS)), encoding="utf-8")
+
+    summary, records = run_harness(tmp_path, source)
+
+    assert summary["documents"] == len(records) == 3
+    assert summary["gold_sentences"] == 6
+    assert_perfect(summary, records)
+
+
+def test_perfect_conllu_corpus_scores_one(tmp_path):
+    source = tmp_path / "gold.conllu"
+    lines = []
+    for sentences in DOCUMENTS:
+        for sentence in sentences:
+            lines += [f"# text = {sentence}", f"1\t{sentence}\t_\t_\t_\t_\t0\troot\t_\t_", ""]
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    summary, records = run_harness(tmp_path, source)
+
+    # Grouped by --sentences-per-doc
+    assert [record["gold_count"] for record in records] == [2, 2, 2]
+    assert_perfect(summary, records)
+
+
+def test_resume_refuses_other_scoring(tmp_path, monkeypatch):
+    source = tmp_path / "gold.jsonl"
+    source.write_text(json.dumps({"sentences": DOCUMENTS[0]}) + "\n", encoding="utf-8")
+    run_harness(tmp_path, source)
+
+    monkeypatch.setattr(harness, "SCORING", "sentences")
+    with pytest.raises(ValueError, match="different settings"):
+        run_harness(tmp_path, source, resume=True)
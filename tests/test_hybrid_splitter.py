@@ -0,0 +1,117 @@
+"""
+Tests for the rules-first hybrid splitter (backend/hybrid_splitter.py), with
+a fake spaCy splitter that records the stretches it is given.
+"""
+
+import pytest
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.hybrid_splitter import HybridSentenceSplitter
+from backend.spans import SentenceSpans
+
+
+class FakeSpacy:
+    """Segments stretches with the baseline rules and records every call."""
+
+    def __init__(self):
+        self.baseline = BaselineSentenceSplitter()
+        self.calls = []
+
+    def split_spans_many(self, texts, language, profile, batch_size):
+        self.calls.append(list(texts))
+        return [self.baseline.split_spans(text, language) for text in texts]
+
+
+def make_splitter(max_spacy_fraction=0.5):
+    spacy = FakeSpacy()
+    return HybridSentenceSplitter(spacy, max_spacy_fraction=max_spacy_fraction), spacy
+
+
+def segment_texts(text, plan):
+    return [(text[start:end], ambiguous) for start, end, ambiguous in plan.segments]
+
+
+def test_plan_keeps_certain_boundaries_and_groups_ambiguous_ones():
+    splitter, _ = make_splitter()
+    text = "The cat sat. It was warm. Dr. Smith came in. He left.\n\nNo punctuation\n\nEnd here."
+    plan = splitter._plan(text, "en")
+
+    assert segment_texts(text, plan) == [
+        ("The cat sat.", False),
+        ("It was warm.", False),
+        # "Dr." is ambiguous, so the stretch runs to the next certain boundary
+        ("Dr. Smith came in.", True),
+        ("He left.", False),
+        ("No punctuation", False),
+        ("End here.", False),
+    ]
+    assert plan.ambiguous == [(text.index("Dr."), text.index(" He left."))]
+    assert plan.counts["abbreviation"] == 1
+    assert plan.counts["certain"] == 5
+
+
+@pytest.mark.parametrize("text, category", [
+    ('He said "Stop." Then he left.', "quotation"),
+    ("See the docs. then go on.", "lowercase"),
+    ("Wait... Then it happened.", "ellipsis"),
+    ("The year was 2020. It was cold.", "decimal"),
+    ("J. Smith arrived.", "abbreviation"),
+    ("The U.S. Army arrived.", "abbreviation"),
+])
+def test_plan_categories(text, category):
+    splitter, _ = make_splitter(max_spacy_fraction=1.0)
+    plan = splitter._plan(text, "en")
+    assert plan.counts[category] == 1
+    assert plan.ambiguous
+
+
+def test_merge_only_sends_ambiguous_stretches_to_spacy():
+    splitter, spacy = make_splitter()
+    text = "  One here. Mr. Brown ran. Two here.\n\nThree here. Four here. Five here.  "
+    spans, fraction = splitter.split_spans_with_fraction(text, "en")
+
+    assert spacy.calls == [["Mr. Brown ran."]]
+    assert spans.texts(text) == ["One here.", "Mr. Brown ran.", "Two here.",
+                                 "Three here.", "Four here.", "Five here."]
+    assert fraction == round(len("Mr. Brown ran.") / len(text), 4)
+
+
+def test_merge_offsets_point_into_the_document():
+    splitter, _ = make_splitter()
+    plan = splitter._plan("Aa bb. Dr. Cc dd. Ee ff.", "en")
+    # spaCy splits the ambiguous stretch "Dr. Cc dd." after "Dr."
+    stretch = SentenceSpans()
+    stretch.append(0, 3)
+    stretch.append(4, 10)
+    segmented = [stretch]
+    spans = splitter._merge("Aa bb. Dr. Cc dd. Ee ff.", plan, segmented)
+    assert spans.to_list() == [[0, 6], [7, 10], [11, 17], [18, 24]]
+
+
+def test_mostly_ambiguous_document_goes_to_spacy_whole():
+    text = "Intro here. Dr. A met Mr. B. They left. Fine."
+    splitter, spacy = make_splitter(max_spacy_fraction=0.1)
+    plan = splitter._plan(text, "en")
+    assert plan.segments == [(0, len(text), True)]
+    spans, fraction = splitter.split_spans_with_fraction(text, "en")
+    assert spacy.calls[-1] == [text]
+    assert fraction == 1.0
+
+    # Below the limit only the ambiguous stretch is sent; "B." is an initial
+    splitter, spacy = make_splitter(max_spacy_fraction=0.9)
+    splitter.split_spans_with_fraction(text, "en")
+    assert spacy.calls == [["Dr. A met Mr. B. They left."]]
+
+
+def test_documents_are_batched_into_one_spacy_call():
+    splitter, spacy = make_splitter()
+    texts = ["Plain one. Plain two.", "Hi. Dr. X came. Bye now.", "", "Mr. Y ran. Then stop."]
+    results = splitter.split_spans_many_with_fraction(texts, "en")
+
+    assert len(spacy.calls) == 1
+    assert spacy.calls[0] == ["Dr. X came.", "Mr. Y ran."]
+    assert [spans.texts(text) for text, (spans, _) in zip(texts, results)] == [
+        ["Plain one.", "Plain two."], ["Hi.", "Dr. X came.", "Bye now."], [],
+        ["Mr. Y ran.", "Then stop."],
+    ]
+    assert results[0][1] == 0.0 and results[2][1] == 0.0
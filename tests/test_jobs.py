@@ -0,0 +1,55 @@
+"""
+Tests for background segmentation jobs (backend/jobs.py).
+"""
+
+import asyncio
+import tempfile
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.executor import SegmentationExecutor
+from backend.jobs import JobRunner, JobStore
+from backend.spacy_splitter import SpacySentenceSplitter
+
+TEXT = "Hello\n   world is here. Next\tone\nfollows. Dr. Smith left at 5 p.m. and came back."
+
+
+def run_job(store: JobStore, runner: JobRunner, texts: list, batch_size: int) -> list:
+    """Submit a baseline job, run it to completion and return its sentences."""
+    job = store.submit([(str(i), text) for i, text in enumerate(texts)],
+                       "baseline", "en", None, batch_size)
+    claimed = store.claim(runner.owner)
+    assert claimed["id"] == job["id"]
+    asyncio.run(runner._run(claimed))
+    job = store.get(job["id"])
+    assert job["status"] == "done"
+    return store.results_page(job["id"], 0, job["sentences"])
+
+
+def test_single_and_batched_jobs_match_segment(tmp_path):
+    """A one-document job stores the same normalized sentences as a batched one."""
+    splitter = BaselineSentenceSplitter()
+    executor = SegmentationExecutor(SpacySentenceSplitter(), spacy_mode="thread")
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    runner = JobRunner(store, executor, splitter, workers=0)
+    try:
+        single = run_job(store, runner, [TEXT], batch_size=1)
+        batched = run_job(store, runner, [TEXT, TEXT], batch_size=2)
+    finally:
+        executor.shutdown()
+
+    expected = splitter.split(TEXT)
+    assert [item["sentence"] for item in single] == expected
+    assert [item["sentence"] for item in batched if item["document"] == 0] == expected
+    assert [item["sentence"] for item in batched if item["document"] == 1] == expected
+    assert expected[:2] == ["Hello world is here.", "Next one follows."]
+
+
+def test_default_database_is_outside_the_working_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("SEGMENT_JOBS_DB")
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    store = JobStore()
+    assert store.path == str(tmp_path / "segment-jobs.sqlite3")
+
+
+def test_tests_use_their_own_database(tmp_path):
+    assert JobStore().path == str(tmp_path / "jobs.sqlite3")
@@ -0,0 +1,182 @@
+"""
+Tests for incremental live segmentation (backend/live.py and /segment/live).
+
+Every edit is applied the way a client applies the diffs, and the result is
+compared with segmenting the edited text from scratch.
+"""
+
+import os
+import random
+
+import pytest
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.live import EditError, LiveDocument, split_blocks
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT = ("Intro line\n\nDr. Smith arrived at 5 p.m. today. He sat down.\n\n"
+        "The second paragraph is here. It has two sentences.\n\nLast one.")
+
+
+@pytest.fixture(scope="module")
+def splitter():
+    return BaselineSentenceSplitter()
+
+
+def from_scratch(splitter, text):
+    """Spans and sentences of text, every paragraph segmented on its own."""
+    spans = []
+    position = 0
+    for block in split_blocks(text):
+        spans.extend((position + start, position + end) for start, end in splitter.split_spans(block))
+        position += len(block)
+    return spans, splitter.span_texts(text, spans)
+
+
+class Client:
+    """A client's copy of the document, updated from the diffs only."""
+
+    def __init__(self, splitter):
+        self.splitter = splitter
+        self.document = LiveDocument()
+        self.spans = []
+        self.sentences = []
+
+    def send(self, edit):
+        spans = [self.splitter.split_spans(block) for block in edit.blocks]
+        diff = self.document.apply(edit, spans, self.splitter.span_texts)
+        start, end = diff["start"], diff["start"] + diff["delete"]
+        tail = [(s + diff["delta"], e + diff["delta"]) for s, e in self.spans[end:]]
+        self.spans = self.spans[:start] + [tuple(span) for span in diff["insert"]] + tail
+        self.sentences[start:end] = diff["sentences"]
+        assert diff["count"] == len(self.spans)
+        return diff
+
+    def reset(self, text, full=False):
+        return self.send(self.document.plan_reset(text, full))
+
+    def edit(self, offset, delete=0, insert=""):
+        return self.send(self.document.plan(offset, delete, insert))
+
+    def check(self):
+        text = self.document.text
+        assert (self.spans, self.sentences) == from_scratch(self.splitter, text)
+
+
+@pytest.fixture
+def client(splitter):
+    client = Client(splitter)
+    client.reset(TEXT)
+    client.check()
+    return client
+
+
+def test_deleted_blank_line_merges_paragraphs(client):
+    offset = TEXT.index("\n\n")
+    diff = client.edit(offset, 2, " ")
+    client.check()
+    assert client.sentences[0] == "Intro line Dr. Smith arrived at 5 p.m. today."
+    # The paragraphs after the merge are untouched
+    assert diff["start"] == 0 and diff["delete"] == 2
+
+
+def test_inserted_blank_line_splits_paragraph(client):
+    offset = TEXT.index("It has")
+    client.edit(offset - 1, 1, "\n\n")
+    client.check()
+    assert "The second paragraph is here." in client.sentences
+    # A paragraph without final punctuation still ends its sentence
+    client.edit(TEXT.index("is here.") + 1, 0, "\n\nBroken")
+    client.check()
+
+
+def test_edits_at_document_end(client):
+    client.edit(len(TEXT), 0, " and more text")
+    client.check()
+    assert client.sentences[-1] == "Last one. and more text"
+    client.edit(client.document.length, 0, "\n\nNew paragraph.")
+    client.check()
+    assert client.sentences[-1] == "New paragraph."
+    length = client.document.length
+    client.edit(length - len("\n\nNew paragraph."), len("\n\nNew paragraph."))
+    client.check()
+    assert client.document.text == TEXT + " and more text"
+
+
+def test_offsets_count_astral_characters_once(splitter):
+    client = Client(splitter)
+    text = "Emoji \U0001F600 here. Next one.\n\n\U0001F600\U0001F600 Start. End."
+    client.reset(text)
+    client.check()
+    offset = text.index("here")
+    client.edit(offset, 0, "\U0001F680 ")
+    client.check()
+    start, end = client.spans[0]
+    assert client.document.text[start:end] == "Emoji \U0001F600 \U0001F680 here."
+    assert end == len("Emoji \U0001F600 \U0001F680 here.")
+
+
+def test_random_edits_match_from_scratch(splitter):
+    generator = random.Random(7)
+    pieces = ["Hello there. ", "Dr. Who left. ", "\n\n", "e.g. this ", "x", " ", ".", "\n",
+              "Big \U0001F600 news! ", "3.14 is pi. "]
+    client = Client(splitter)
+    client.reset(TEXT)
+    for _ in range(300):
+        length = client.document.length
+        offset = generator.randint(0, length)
+        delete = generator.randint(0, min(length - offset, 15))
+        insert = "".join(generator.choice(pieces) for _ in range(generator.randint(0, 3)))
+        client.edit(offset, delete, insert)
+        client.check()
+
+
+def test_edit_outside_document_is_rejected(client):
+    version = client.document.version
+    with pytest.raises(EditError):
+        client.document.plan(len(TEXT), 1)
+    with pytest.raises(EditError):
+        client.document.plan(len(TEXT) + 1, 0, "x")
+    assert client.document.version == version
+    assert client.document.text == TEXT
+
+
+def test_full_reset_replaces_every_sentence(splitter):
+    client = Client(splitter)
+    client.reset(TEXT)
+    diff = client.reset(TEXT)
+    assert diff["delete"] == 0 and diff["sentences"] == []
+    diff = client.reset(TEXT, full=True)
+    assert diff["start"] == 0 and diff["delete"] == len(client.spans)
+    assert diff["sentences"] == client.sentences
+    client.check()
+
+
+@pytest.fixture
+def live_socket(monkeypatch):
+    # The app serves frontend/ relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    with TestClient(app) as http:
+        with http.websocket_connect("/segment/live") as websocket:
+            yield websocket
+
+
+def test_websocket_conflict_and_settings_reset(live_socket):
+    text = "Hello   world. Next\tone."
+    live_socket.send_json({"type": "reset", "text": text, "method": "baseline"})
+    diff = live_socket.receive_json()
+    assert diff["sentences"] == ["Hello world.", "Next one."]
+
+    live_socket.send_json({"type": "delete", "offset": len(text), "length": 1})
+    error = live_socket.receive_json()
+    assert (error["type"], error["status"], error["length"]) == ("error", 409, len(text))
+
+    # Same text, other settings: every sentence is sent again
+    live_socket.send_json({"type": "reset", "text": text, "language": "fr"})
+    diff = live_socket.receive_json()
+    assert (diff["start"], diff["delete"], diff["count"]) == (0, 2, 2)
+    assert diff["sentences"] == ["Hello world.", "Next one."]
@@ -0,0 +1,103 @@
+"""
+Tests for the Prometheus text exposition (backend/metrics.py and /metrics).
+"""
+
+import re
+
+from backend import metrics
+from backend.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+# One sample line: name, optional {label="value",...}, value
+SAMPLE = re.compile(
+    r'^([a-zA-Z_:][a-zA-Z0-9_:]*)'
+    r'(\{[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*"'
+    r'(?:,[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*")*\})?'
+    r' (-?[0-9.e+-]+|\+Inf|-Inf|NaN)$'
+)
+
+
+def check_exposition(body):
+    """Assert every line of a scrape is well formed and return the samples by metric."""
+    assert body.endswith("\n")
+    declared, samples = {}, {}
+    for line in body.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in declared, f"{name} declared twice"
+            declared[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"malformed line: {line!r}"
+        name = match.group(1)
+        family = re.sub(r"_(bucket|sum|count)$", "", name)
+        assert name in declared or family in declared, f"{name} has no TYPE"
+        samples.setdefault(name, []).append((match.group(2) or "", float(match.group(3))))
+    return declared, samples
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_total", "A counter", ("endpoint",)))
+    gauge = registry.register(Gauge("test_gauge", "A gauge"))
+    counter.inc("/b")
+    counter.inc("/a", amount=2)
+    gauge.set(3)
+    gauge.dec()
+
+    body = registry.render()
+    assert body == (
+        "# HELP test_total A counter\n"
+        "# TYPE test_total counter\n"
+        'test_total{endpoint="/a"} 2.0\n'
+        'test_total{endpoint="/b"} 1.0\n'
+        "# HELP test_gauge A gauge\n"
+        "# TYPE test_gauge gauge\n"
+        "test_gauge 2.0\n"
+    )
+    check_exposition(body)
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_total", "A counter", ("path",)))
+    counter.inc('a"b\\c\nd')
+
+    body = registry.render()
+    assert 'test_total{path="a\\"b\\\\c\\nd"} 1.0' in body.splitlines()
+    check_exposition(body)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("test_seconds", "A histogram", ("method",),
+                                            buckets=(1, 0.1)))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "spacy")
+
+    _, samples = check_exposition(registry.render())
+    assert samples["test_seconds_bucket"] == [
+        ('{method="spacy",le="0.1"}', 2),
+        ('{method="spacy",le="1.0"}', 3),
+        ('{method="spacy",le="+Inf"}', 4),
+    ]
+    assert samples["test_seconds_sum"] == [('{method="spacy"}', 2.65)]
+    assert samples["test_seconds_count"] == [('{method="spacy"}', 4)]
+
+
+def test_metrics_endpoint_exposition(api):
+    assert api.post("/segment", json={"text": "One. Two.", "method": "baseline"}).status_code == 200
+    response = api.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    declared, samples = check_exposition(response.text)
+    assert declared["segment_requests_total"] == "counter"
+    assert declared["segment_request_duration_seconds"] == "histogram"
+    assert declared["segment_jobs"] == "gauge"
+    if metrics.enabled:
+        assert any(labels == '{endpoint="/segment",status="200"}' and value >= 1
+                   for labels, value in samples["segment_requests_total"])
+        assert any('stage="segment"' in labels
+                   for labels, _ in samples["segment_stage_duration_seconds_count"])
@@ -0,0 +1,84 @@
+"""
+Tests for parallel splitting of large documents (SpacySentenceSplitter's
+_cut_points, _find_cut and _split_spans_parallel).
+"""
+
+import random
+
+import pytest
+
+from backend.spacy_splitter import SpacySentenceSplitter
+
+SENTENCES = ["Dr. Smith arrived at 5 p.m. today.", "The value was 3.14 in the U.S. report.",
+             "Was it late?", "He said \"yes.\" Then he left!", "Prices rose by 2.5 percent.",
+             "See e.g. the appendix.", "Mrs. Brown agreed... mostly."]
+
+
+def make_text(length, paragraphs=True, seed=3):
+    generator = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        part = generator.choice(SENTENCES)
+        if paragraphs and generator.random() < 0.05:
+            part += "\n\n"
+        else:
+            part += " " if generator.random() < 0.9 else "\n"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def make_splitter(workers=1, piece_size=4000):
+    pytest.importorskip("spacy")
+    # The sentencizer profile needs no model package
+    return SpacySentenceSplitter(preload=[], profile="sentencizer", parallel_threshold=1000,
+                                 parallel_workers=workers, piece_size=piece_size)
+
+
+@pytest.mark.parametrize("paragraphs", [True, False])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_split_matches_single_pass(paragraphs, workers):
+    splitter = make_splitter(workers)
+    text = make_text(50000, paragraphs)
+    try:
+        assert len(splitter._cut_points(text, "en")) >= 10
+        parallel = splitter.split_spans(text, "en")
+        single = splitter._split_spans_single(text, "en", None)
+    finally:
+        splitter.shutdown()
+    assert parallel.to_list() == single.to_list()
+
+
+def test_cut_points_stay_within_half_a_piece():
+    splitter = make_splitter(piece_size=1000)
+    text = make_text(20000)
+    cuts = splitter._cut_points(text, "en")
+    previous = 0
+    for cut in cuts:
+        assert 500 <= cut - previous <= 1500
+        previous = cut
+    # The last piece is never shorter than half a piece
+    assert len(text) - cuts[-1] <= 1500
+
+
+def test_find_cut_preferences():
+    splitter = make_splitter()
+    # A paragraph break wins over a closer sentence boundary
+    text = "Aa bb cc.\n\nDd ee ff. Gg hh ii. Jj kk ll."
+    assert splitter._find_cut(text, "en", 0, 25, len(text)) == text.index("Dd")
+    # Otherwise a baseline boundary; "Dr." is not one although it is closer
+    text = "Aa bb. Dr. Smith cc dd. Ee ff gg."
+    assert splitter._find_cut(text, "en", 0, 11, len(text)) == text.index("Dr.")
+    assert splitter._find_cut(text, "en", 0, 20, len(text)) == text.index("Ee")
+    # Otherwise whitespace, and the target itself as a last resort
+    text = "aaaa bbbb cccc dddd"
+    assert splitter._find_cut(text, "en", 2, 8, 12) == text.index("cccc")
+    assert splitter._find_cut("x" * 30, "en", 5, 15, 25) == 15
+
+
+def test_text_without_whitespace_is_stitched():
+    splitter = make_splitter(piece_size=2000)
+    text = "x" * 10000 + ". Next one."
+    spans = splitter.split_spans(text, "en")
+    assert spans.to_list() == splitter._split_spans_single(text, "en", None).to_list()
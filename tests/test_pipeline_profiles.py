@@ -0,0 +1,95 @@
+"""
+Tests for the spaCy pipeline profiles (backend/spacy_splitter.py).
+"""
+
+import sys
+import types
+
+import pytest
+
+from backend import spacy_splitter
+from backend.spacy_splitter import PIPELINE_PROFILES, SpacySentenceSplitter
+
+
+class StubPipeline:
+    def __init__(self, disabled=()):
+        self.disabled = list(disabled)
+
+    def enable_pipe(self, name):
+        self.disabled.remove(name)
+
+
+@pytest.fixture
+def stub_spacy(monkeypatch):
+    """Replace spaCy with a module that records how pipelines are loaded."""
+    calls = []
+
+    def load(name, exclude=()):
+        calls.append((name, set(exclude)))
+        return StubPipeline(disabled=[] if "senter" in exclude else ["senter"])
+
+    module = types.SimpleNamespace(load=load)
+    monkeypatch.setitem(sys.modules, "spacy", module)
+    return calls
+
+
+def test_resolve_profile():
+    splitter = SpacySentenceSplitter(preload=[], profile="senter")
+    assert splitter.resolve_profile() == "senter"
+    for profile in PIPELINE_PROFILES:
+        assert splitter.resolve_profile(profile) == profile
+    with pytest.raises(ValueError, match="not supported"):
+        splitter.resolve_profile("tagger-only")
+
+
+def test_default_profile_must_be_supported(monkeypatch):
+    with pytest.raises(ValueError, match="not supported"):
+        SpacySentenceSplitter(preload=[], profile="tiny")
+    monkeypatch.setenv("SPACY_PIPELINE_PROFILE", "tiny")
+    with pytest.raises(ValueError, match="not supported"):
+        SpacySentenceSplitter(preload=[])
+
+
+def test_full_profile_loads_everything(stub_spacy):
+    spacy_splitter._load_pipeline("en", "en_core_web_sm", "full")
+    assert stub_spacy == [("en_core_web_sm", set())]
+
+
+@pytest.mark.parametrize("profile, kept", [
+    ("parser-only", {"tok2vec", "parser"}),
+    ("senter", {"senter"}),
+])
+def test_reduced_profiles_exclude_other_components(stub_spacy, profile, kept):
+    model = spacy_splitter._load_pipeline("de", "de_core_news_sm", profile)
+
+    [(name, excluded)] = stub_spacy
+    assert name == "de_core_news_sm"
+    assert excluded == spacy_splitter._PACKAGE_COMPONENTS - kept
+    # The senter ships disabled and must be switched on when it is kept
+    if "senter" in kept:
+        assert model.disabled == []
+
+
+def test_sentencizer_profile_needs_no_package():
+    spacy = pytest.importorskip("spacy")
+    if not hasattr(spacy, "blank"):
+        pytest.skip("needs the real spaCy package")
+    splitter = SpacySentenceSplitter(preload=[], profile="sentencizer", parallel_threshold=0)
+
+    model = splitter.get_model("fr")
+    assert model.pipe_names == ["sentencizer"]
+    assert splitter.get_model("fr", "sentencizer") is model
+    assert splitter.model_version("fr").endswith("/blank-fr/sentencizer")
+    assert splitter.split("Bonjour. Au revoir.", "fr") == ["Bonjour.", "Au revoir."]
+
+
+def test_unsupported_pipeline_is_rejected(api):
+    response = api.post("/segment", json={"text": "One. Two.", "method": "spacy",
+                                          "pipeline": "tagger-only"})
+    assert response.status_code == 400
+    assert "not supported" in response.json()["detail"]
+
+    # The baseline method has no pipeline to pick
+    response = api.post("/segment", json={"text": "One. Two.", "method": "baseline",
+                                          "pipeline": "tagger-only"})
+    assert response.status_code == 200
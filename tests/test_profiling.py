@@ -0,0 +1,98 @@
+"""
+Tests for request profiling (backend/profiling.py) and its admin gating.
+"""
+
+import pstats
+
+import pytest
+
+from backend import profiling
+from backend.profiling import RequestProfiler, call_with_profile
+
+REQUEST = {"text": "One sentence. Another one.", "method": "baseline"}
+
+
+@pytest.fixture
+def no_profiler(monkeypatch):
+    """Fail the test if anything creates a cProfile profiler."""
+    def forbidden(*args, **kwargs):
+        raise AssertionError("a profiler was created")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", forbidden)
+
+
+@pytest.fixture
+def admin_api(api, monkeypatch, tmp_path):
+    """API client whose profiler accepts the token "secret" and writes dumps to tmp_path."""
+    import backend.main
+
+    monkeypatch.setattr(backend.main, "request_profiler",
+                        RequestProfiler(admin_token="secret", profile_dir=str(tmp_path)))
+    return api
+
+
+def test_disabled_without_admin_token():
+    profiler = RequestProfiler(admin_token="", profile_dir="", sample_rate=0)
+    assert not profiler.is_authorized("anything")
+    assert not profiler.is_authorized(None)
+    assert profiler.dump_path("baseline", "en") is None
+    assert not any(profiler.should_sample() for _ in range(10))
+
+
+def test_token_must_match():
+    profiler = RequestProfiler(admin_token="secret", profile_dir="", sample_rate=0)
+    assert profiler.is_authorized("secret")
+    assert not profiler.is_authorized("Secret")
+    assert not profiler.is_authorized("")
+    assert not profiler.is_authorized(None)
+
+
+def test_sampling_needs_a_profile_dir(tmp_path):
+    assert RequestProfiler(admin_token="", profile_dir="", sample_rate=2).sample_rate == 0
+
+    profiler = RequestProfiler(admin_token="", profile_dir=str(tmp_path), sample_rate=3)
+    assert [profiler.should_sample() for _ in range(6)] == [False, False, True] * 2
+    assert profiler.dump_path("spacy", "de").startswith(str(tmp_path))
+
+
+def test_call_without_dump_path_creates_no_profiler(no_profiler):
+    assert call_with_profile(sorted, ([3, 1, 2],), None) == [1, 2, 3]
+
+
+def test_call_with_dump_path_writes_stats(tmp_path):
+    dump = tmp_path / "call.prof"
+    assert call_with_profile(sorted, ([3, 1, 2],), str(dump)) == [1, 2, 3]
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+def test_profile_request_rejected_when_profiling_disabled(api):
+    response = api.post("/segment", json={**REQUEST, "profile": True},
+                        headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_profile_request_requires_admin_token(admin_api, headers):
+    response = admin_api.post("/segment", json={**REQUEST, "profile": True}, headers=headers)
+    assert response.status_code == 403
+    assert "X-Admin-Token" in response.json()["detail"]
+
+
+def test_profile_request_with_admin_token(admin_api, tmp_path):
+    plain = admin_api.post("/segment", json=REQUEST).json()
+    response = admin_api.post("/segment", json={**REQUEST, "profile": True},
+                              headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["sentences"] == plain["sentences"]
+    assert body["profile"]["total_ms"] >= 0
+    assert body["profile"]["phases_ms"]
+    assert body["profile"]["dump"].startswith(str(tmp_path))
+
+
+def test_ordinary_requests_create_no_profiler(api, no_profiler):
+    for _ in range(3):
+        response = api.post("/segment", json={**REQUEST, "output": "spans"})
+        assert response.status_code == 200
+        assert "profile" not in response.json()
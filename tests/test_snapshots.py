@@ -0,0 +1,54 @@
+"""
+Tests for model snapshots (backend/snapshots.py).
+"""
+
+import hashlib
+
+import pytest
+
+from backend import snapshots
+from backend.snapshots import SnapshotStore, build_snapshots
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    spacy = pytest.importorskip("spacy")
+    if not hasattr(spacy, "registry"):
+        pytest.skip("needs the real spaCy package")
+    # The sentencizer profile needs no model package, so it can be built anywhere
+    build_snapshots(str(tmp_path), ["en"], ["sentencizer"])
+    return str(tmp_path)
+
+
+def test_load_restores_pipeline(snapshot_dir):
+    store = SnapshotStore(snapshot_dir)
+    nlp = store.load("en", "sentencizer")
+    assert nlp.pipe_names == ["sentencizer"]
+    doc = nlp("Dr. Smith arrived. He sat down.")
+    assert len(list(doc.sents)) >= 2
+    assert store.load("en", "parser-only") is None
+    # No view of the mapping outlives load()
+    store.close()
+
+
+def test_checksum_is_verified_once(snapshot_dir, monkeypatch):
+    store = SnapshotStore(snapshot_dir)
+    calls = []
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(data):
+        calls.append(len(data))
+        return real_sha256(data)
+
+    monkeypatch.setattr(snapshots.hashlib, "sha256", counting_sha256)
+    assert store.load("en", "sentencizer") is not None
+    assert store.load("en", "sentencizer") is not None
+    assert len(calls) == 1
+    store.close()
+
+
+def test_corrupt_snapshot_is_ignored(snapshot_dir):
+    store = SnapshotStore(snapshot_dir)
+    store.pipelines["en/sentencizer"]["sha256"] = "0" * 64
+    assert store.load("en", "sentencizer") is None
+    store.close()
@@ -0,0 +1,139 @@
+"""
+Tests for streaming segmentation: iter_sentences() on chunked input and the
+SentenceStream bridge behind /segment/stream.
+"""
+
+import asyncio
+import random
+import threading
+
+import pytest
+
+from backend.baseline_splitter import BaselineSentenceSplitter
+from backend.streaming import SentenceStream
+
+SENTENCES = [
+    "Dr. Smith went to Washington.",
+    "He arrived at 5 p.m. and left at 3.14 a.m. the next day!",
+    "Was it the U.S.A. or the U.K.?",
+    '"Stop," she said. "Now."',
+    "Prices rose by 2.5% in Jan. and again in Feb.",
+    "Wait... what happened next?!",
+    "e.g. this starts lowercase.",
+    "Mr. and Mrs. Jones live on Baker St. in London.",
+]
+SEPARATORS = [" ", "  ", "\n", "\t", " \n ", "\n\n"]
+
+
+def generate_text(size: int, seed: int = 0) -> str:
+    """Build about `size` characters of prose with awkward boundaries."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(SENTENCES) + rng.choice(SEPARATORS)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def chunked(text: str, sizes):
+    """Cut text into consecutive chunks whose sizes cycle through `sizes`."""
+    position = 0
+    index = 0
+    while position < len(text):
+        size = sizes[index % len(sizes)]
+        yield text[position:position + size]
+        position += size
+        index += 1
+
+
+@pytest.fixture(scope="module")
+def large_text():
+    return generate_text(3 * 1024 * 1024)
+
+
+@pytest.mark.parametrize("sizes", [[65536], [4093, 1, 17, 8192]])
+def test_baseline_stream_matches_whole_document(large_text, sizes):
+    splitter = BaselineSentenceSplitter()
+    assert list(splitter.iter_sentences(chunked(large_text, sizes))) == splitter.split(large_text)
+
+
+def test_baseline_stream_tiny_chunks():
+    """Every chunk seam falls inside punctuation and whitespace runs somewhere."""
+    splitter = BaselineSentenceSplitter()
+    text = generate_text(20000, seed=1)
+    assert list(splitter.iter_sentences(chunked(text, [1, 2, 3]))) == splitter.split(text)
+
+
+def test_spacy_stream_matches_whole_document_across_windows():
+    pytest.importorskip("spacy")
+    from backend.spacy_splitter import SpacySentenceSplitter
+
+    splitter = SpacySentenceSplitter(parallel_threshold=0)
+    text = generate_text(300000, seed=2)
+    windowed = splitter.iter_sentences(chunked(text, [7919]), profile="sentencizer", window=20000)
+    assert list(windowed) == splitter.split(text, profile="sentencizer")
+
+
+def test_sentence_stream_yields_before_input_is_read():
+    """The first sentences arrive while most of the body is still unread."""
+    splitter = BaselineSentenceSplitter()
+    text = generate_text(1024 * 1024, seed=3)
+    chunks = list(chunked(text, [16384]))
+
+    async def scenario():
+        first_batch = asyncio.Event()
+        sent = 0
+
+        async def body():
+            nonlocal sent
+            for index, chunk in enumerate(chunks):
+                if index == 4:
+                    # Hold the rest of the body back until sentences came out
+                    await asyncio.wait_for(first_batch.wait(), 10)
+                sent += 1
+                yield chunk
+
+        stream = SentenceStream(splitter.iter_sentences)
+        worker = threading.Thread(target=stream.run)
+        worker.start()
+        sentences = []
+        sent_at_first_batch = None
+        try:
+            async for batch in stream.sentences(body()):
+                if sent_at_first_batch is None:
+                    sent_at_first_batch = sent
+                    first_batch.set()
+                sentences.extend(batch)
+        finally:
+            stream.cancel()
+            await asyncio.to_thread(worker.join, 10)
+        return sentences, sent_at_first_batch
+
+    sentences, sent_at_first_batch = asyncio.run(scenario())
+    assert sent_at_first_batch <= 4 < len(chunks)
+    assert sentences == splitter.split(text)
+
+
+def test_sentence_stream_reports_splitter_errors():
+    def failing(chunks):
+        for chunk in chunks:
+            yield chunk
+            raise RuntimeError("splitter failed")
+
+    async def scenario():
+        async def body():
+            yield "One."
+            yield "Two."
+
+        stream = SentenceStream(failing)
+        worker = threading.Thread(target=stream.run)
+        worker.start()
+        try:
+            return [batch async for batch in stream.sentences(body())]
+        finally:
+            await asyncio.to_thread(worker.join, 10)
+
+    with pytest.raises(RuntimeError, match="splitter failed"):
+        asyncio.run(scenario())